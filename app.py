@@ -1,23 +1,173 @@
-from flask import Flask, request, jsonify
-import requests
+import asyncio
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import orjson
+from quart import Quart, Response, request
+from hushh_mcp.agents.ai_assistant import HushhAIAssistant
 from hushh_mcp.agents.calendar_agent import schedule_meeting
+from hushh_mcp.vault.kv_store import VaultKVStore
 
-app = Flask(__name__)
+app = Quart(__name__)
+
+OLLAMA_URL = 'http://localhost:11434/api/generate'
+OLLAMA_MODEL = 'llama3'
+OLLAMA_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=3)
+
+# One aiohttp session per worker process, owned by the app (app.http_session):
+# created once at startup and shared by every handler, so concurrent /agent calls
+# overlap on one event loop and reuse kept-alive connections to Ollama.
+# Run Ollama with OLLAMA_NUM_PARALLEL > 1 to actually serve them in parallel.
+app.http_session = None
+
+# Exact-match cache of Ollama responses for deterministic (option-free) calls
+RESPONSE_CACHE_SIZE = 4096
+response_cache = OrderedDict()
+cache_stats = {"hits": 0, "misses": 0}
+
+# Background jobs for bulk analysis: the request returns a job id immediately and
+# the client polls /jobs/<id>. Job state lives in a SQLite file shared by all
+# workers, so any worker can answer the poll. Emails are analyzed in chunks on a
+# dedicated pool, so at most JOB_MAX_CONCURRENCY chunks run at once per worker.
+JOB_CHUNK_SIZE = 100
+JOB_MAX_CONCURRENCY = 32
+JOBS_DB_PATH = os.getenv("HUSHH_JOBS_DB", "vault_data/jobs.db")
+os.makedirs(os.path.dirname(JOBS_DB_PATH) or ".", exist_ok=True)
+jobs = VaultKVStore(JOBS_DB_PATH)
+job_executor = ThreadPoolExecutor(max_workers=JOB_MAX_CONCURRENCY, thread_name_prefix="job")
+assistant = HushhAIAssistant()
+
+@app.before_serving
+async def open_http_session():
+    app.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=128, keepalive_timeout=60),
+        timeout=OLLAMA_TIMEOUT
+    )
+
+@app.after_serving
+async def close_http_session():
+    await app.http_session.close()
+    job_executor.shutdown(wait=False, cancel_futures=True)
+
+def cache_key(model, prompt):
+    return hashlib.sha256(
+        orjson.dumps({"model": model, "prompt": prompt}, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+def json_response(data):
+    # orjson serializes straight to bytes, skipping jsonify's pure-Python encoder
+    return app.response_class(orjson.dumps(data), mimetype='application/json')
+
+async def call_ollama(body):
+    async with app.http_session.post(OLLAMA_URL, json=body) as response:
+        # Surface Ollama failures instead of returning (and caching) an error body
+        response.raise_for_status()
+        return await response.json()
+
+async def generate(prompt, options=None):
+    body = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False}
+    if options:
+        # Sampling options can make output nondeterministic, so skip the cache
+        body["options"] = options
+        return await call_ollama(body)
+
+    key = cache_key(OLLAMA_MODEL, prompt)
+    if key in response_cache:
+        response_cache.move_to_end(key)
+        cache_stats["hits"] += 1
+        return response_cache[key]
+
+    cache_stats["misses"] += 1
+    result = await call_ollama(body)
+    if "error" in result:
+        return result
+    response_cache[key] = result
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+    return result
+
+async def stream_generate(prompt, options=None):
+    body = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": True}
+    if options:
+        body["options"] = options
+    async with app.http_session.post(OLLAMA_URL, json=body) as response:
+        # Forward Ollama's NDJSON chunks as they arrive instead of buffering the full output
+        async for line in response.content:
+            if line.strip():
+                yield line
 
 @app.route('/agent', methods=['POST'])
-def agent():
-    user_input = request.json.get('input')
-    action = request.json.get('action')
-    consent_token = request.json.get('consent_token')
+async def agent():
+    payload = await request.get_json()
+    user_input = payload.get('input')
+    action = payload.get('action')
+    consent_token = payload.get('consent_token')
     if action == "schedule_meeting":
         result = schedule_meeting({"meeting_info": user_input, "consent_token": consent_token})
-        return jsonify({"result": result})
-    
-    response = requests.post(
-        'http://localhost:11434/api/generate',
-        json={"model": "llama3", "prompt": user_input}
+        return json_response({"result": result})
+
+    if payload.get('stream'):
+        return Response(stream_generate(user_input, payload.get('options')), mimetype='application/x-ndjson')
+
+    return json_response(await generate(user_input, payload.get('options')))
+
+@app.route('/agent/batch', methods=['POST'])
+async def agent_batch():
+    payload = await request.get_json()
+    prompts = payload.get('inputs', [])
+    results = await asyncio.gather(*[generate(prompt) for prompt in prompts])
+    return json_response({"results": results})
+
+def save_job(job_id, **fields):
+    jobs.put(job_id, "job", {"job_id": job_id, **fields})
+
+async def analyze_email_chunk(user_id, consent_token, emails):
+    # The agent is synchronous, so keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(job_executor, assistant.analyze_email_patterns, user_id, consent_token, emails)
+
+async def run_email_analysis(job_id, user_id, consent_token, emails):
+    save_job(job_id, status="running")
+    chunks = [emails[i:i + JOB_CHUNK_SIZE] for i in range(0, len(emails), JOB_CHUNK_SIZE)]
+    try:
+        results = await asyncio.gather(*[
+            analyze_email_chunk(user_id, consent_token, chunk) for chunk in chunks
+        ])
+    except Exception as e:
+        save_job(job_id, status="failed", error=str(e))
+        return
+    save_job(job_id, status="finished", result={"email_count": len(emails), "chunks": results})
+
+@app.route('/jobs/analyze_email', methods=['POST'])
+async def enqueue_email_analysis():
+    payload = await request.get_json()
+    job_id = uuid.uuid4().hex
+    save_job(job_id, status="queued")
+    app.add_background_task(
+        run_email_analysis, job_id, payload.get('user_id'), payload.get('consent_token'), payload.get('emails', [])
     )
-    return jsonify(response.json())
+    return json_response({"job_id": job_id}), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+async def get_job(job_id):
+    job = jobs.get(job_id, "job")
+    if job is None:
+        return json_response({"error": "job not found"}), 404
+    return json_response(job)
+
+@app.route('/cache/stats', methods=['GET'])
+async def get_cache_stats():
+    return json_response({**cache_stats, "size": len(response_cache), "max_size": RESPONSE_CACHE_SIZE})
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    if os.getenv("HUSHH_ENV") == "development":
+        app.run(debug=True)
+    else:
+        # Production: one ASGI worker per core, each overlapping many Ollama calls.
+        # Equivalent to: gunicorn -k uvicorn.workers.UvicornWorker -w $(nproc) \
+        #                --worker-connections 1000 -b 0.0.0.0:5000 app:app
+        import uvicorn
+        uvicorn.run("app:app", host="0.0.0.0", port=5000, workers=os.cpu_count() or 1, limit_concurrency=1000)
@@ -9,16 +9,138 @@ Winning Model: Real-world AI use cases, user-centric design, scalable architectu
 This agent showcases how to build production-ready AI agents with proper consent management.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import re
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List
+import orjson
 from hushh_mcp.agents.base_agent import BaseAgent
+from hushh_mcp.agents.batching import RequestBatcher
+from hushh_mcp.agents.semantic_cache import SemanticCache
+from hushh_mcp.config import SIMULATE_LATENCY
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import UserID, HushhConsentToken
 
 logger = logging.getLogger(__name__)
 
+# Delay between launching successive model providers, so a fast preferred model
+# answers before the more expensive hedged requests are ever sent
+MODEL_STAGGER_SECONDS = 0.2
+
+# Per-model circuit breaker: after this many consecutive failures a model is
+# skipped for the cooldown window instead of being retried on every request
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_COOLDOWN_SECONDS = 30
+MODEL_TIMEOUT_SECONDS = 10
+
+REQUIRED_SCOPES = (
+    ConsentScope.VAULT_READ_EMAIL,
+    ConsentScope.AGENT_IDENTITY_VERIFY,
+    ConsentScope.CUSTOM_TEMPORARY
+)
+
+MODEL_PREFERENCES = ("gpt-4", "claude-3", "llama-3", "fallback")
+
+# Scope values whose consent allows personalized responses, resolved once at import
+PERSONALIZABLE_SCOPES = frozenset([
+    ConsentScope.VAULT_READ_EMAIL.value,
+    ConsentScope.VAULT_READ_CONTACTS.value,
+    ConsentScope.VAULT_READ_FINANCE.value
+])
+
+# All assistant coroutines run on one long-lived loop in a background thread, so
+# concurrent execute() calls share it and the RequestBatcher can group their model calls
+_loop = None
+_loop_lock = threading.Lock()
+
+def _assistant_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="ai-assistant-loop", daemon=True).start()
+        return _loop
+
+def _run_coroutine(coro):
+    """Run a coroutine on the shared assistant loop and wait for its result"""
+    loop = _assistant_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("execute() cannot block the assistant loop it would wait on")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+# Static system prompt blocks. Kept byte-identical across calls and placed before
+# any dynamic content so provider-side prompt caching can reuse the prefix.
+BASE_SYSTEM_PROMPT = """You are Hushh AI Assistant, a privacy-first AI that only acts with explicit user consent.
+
+Key principles:
+- Always respect user privacy and consent boundaries
+- Provide helpful, accurate, and actionable responses
+- Be concise but comprehensive
+- If you're unsure, say so rather than guess
+- Never access data without proper consent tokens"""
+
+TASK_SPECIFIC_PROMPTS = MappingProxyType({
+    "email_summary": """
+You specialize in email summarization and organization. Focus on:
+- Key action items and deadlines
+- Important contacts and communications
+- Prioritization of urgent vs non-urgent items
+- Protecting sensitive information
+""",
+    "calendar_management": """
+You help with calendar and schedule management. Focus on:
+- Optimal meeting scheduling
+- Time conflict resolution
+- Travel time considerations
+- Work-life balance optimization
+""",
+    "data_analysis": """
+You assist with personal data analysis and insights. Focus on:
+- Pattern recognition in user data
+- Actionable insights and recommendations
+- Data visualization suggestions
+- Privacy-preserving analytics
+""",
+    "general_assistance": """
+You provide general assistance across various domains. Focus on:
+- Understanding user intent accurately
+- Providing step-by-step guidance
+- Offering relevant alternatives
+- Being helpful while staying within scope
+"""
+})
+
+# Full system prompt per task type, built once and shared by every assistant instance
+SYSTEM_PROMPTS = MappingProxyType({
+    task: f"{BASE_SYSTEM_PROMPT}\n\n{task_prompt}"
+    for task, task_prompt in TASK_SPECIFIC_PROMPTS.items()
+})
+
+# Rule-based fallback keywords, compiled once. Each branch is a lookahead tried in
+# order, so a query mentioning several topics resolves by the same priority as
+# the original if/elif chain (email, then calendar, then data).
+RULE_PATTERN = re.compile(
+    r"(?=.*?(?P<email>email))"
+    r"|(?=.*?(?P<calendar>calendar|schedule))"
+    r"|(?=.*?(?P<data>data|analyze))",
+    re.IGNORECASE | re.DOTALL
+)
+
+RULE_BASED_RESPONSES = {
+    "email": "I can help you organize and summarize your emails. With proper consent, I can identify important messages, extract action items, and provide priority rankings.",
+    "calendar": "I can assist with calendar management including scheduling meetings, finding optimal time slots, and managing your daily agenda. Please ensure you have the appropriate consent tokens.",
+    "data": "I can help analyze your personal data to provide insights and recommendations. All analysis is done with encryption and requires explicit consent for each data source."
+}
+
 class HushhAIAssistant(BaseAgent):
     """
     AI-powered assistant that can help with various tasks while respecting user consent.
@@ -30,19 +152,25 @@ class HushhAIAssistant(BaseAgent):
     """
 
     def __init__(self, agent_id: str = "agent_ai_assistant"):
-        super().__init__(
-            agent_id=agent_id,
-            required_scopes=[
-                ConsentScope.VAULT_READ_EMAIL,
-                ConsentScope.AGENT_IDENTITY_VERIFY,
-                ConsentScope.CUSTOM_TEMPORARY
-            ]
-        )
+        super().__init__(agent_id=agent_id, required_scopes=REQUIRED_SCOPES)
         
         # Working Model: Configuration with fallbacks
         self.max_context_length = 4000
         self.temperature = 0.7
-        self.model_preferences = ["gpt-4", "claude-3", "llama-3", "fallback"]
+        self.model_preferences = MODEL_PREFERENCES
+        
+        # Best Model: Serve paraphrased queries from cache instead of re-calling the model
+        self.semantic_cache = SemanticCache(similarity_threshold=0.92)
+        
+        # Best Model: Coalesce concurrent calls to the same model into batched requests
+        self._batchers: Dict[str, RequestBatcher] = {}
+        
+        # Working Model: Health tracking so a down provider is skipped, not waited on.
+        # Only touched by coroutines on the shared assistant loop, so updates never race
+        self._breaker = {
+            model: {"failures": 0, "open_until": 0.0}
+            for model in self.model_preferences if model != "fallback"
+        }
 
     def _execute_agent_logic(self, user_id: UserID, token: HushhConsentToken, **kwargs) -> Dict[str, Any]:
         """
@@ -57,7 +185,7 @@ class HushhAIAssistant(BaseAgent):
 
         try:
             # Best Model: Advanced prompt engineering with context
-            response = self._generate_ai_response(user_query, context, task_type, user_id)
+            response = _run_coroutine(self._generate_ai_response(user_query, context, task_type, user_id))
             
             return {
                 "response": response["text"],
@@ -71,11 +199,11 @@ class HushhAIAssistant(BaseAgent):
             }
             
         except Exception as e:
-            logger.warning(f"AI generation failed, using fallback: {str(e)}")
+            logger.warning("AI generation failed, using fallback: %s", e)
             # Working Model: Graceful fallback to rule-based responses
             return self._get_fallback_response(user_query, task_type)
 
-    def _generate_ai_response(self, query: str, context: Dict[str, Any], task_type: str, user_id: str) -> Dict[str, Any]:
+    async def _generate_ai_response(self, query: str, context: Dict[str, Any], task_type: str, user_id: str) -> Dict[str, Any]:
         """
         Generate AI response using best available model with proper prompt engineering.
         Best Model: Advanced algorithms and optimization.
@@ -83,102 +211,112 @@ class HushhAIAssistant(BaseAgent):
         start_time = time.time()
         
         # Best Model: Sophisticated prompt engineering
-        system_prompt = self._build_system_prompt(task_type, context)
-        user_prompt = self._build_user_prompt(query, context, user_id)
+        system_prompt = self._build_system_prompt(task_type)
+        context_json = orjson.dumps(context, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode() if context else ""
+        user_prompt = self._build_user_prompt(query, context_json, user_id)
         
-        # Working Model: Try multiple model providers with fallbacks
-        for model in self.model_preferences:
-            try:
-                if model == "fallback":
-                    return self._rule_based_response(query, task_type)
-                
-                response_text = self._call_ai_model(model, system_prompt, user_prompt)
-                processing_time = int((time.time() - start_time) * 1000)
-                
-                return {
-                    "text": response_text,
-                    "model": model,
-                    "confidence": 0.9,
-                    "processing_time": processing_time
-                }
-                
-            except Exception as e:
-                logger.warning(f"Model {model} failed: {str(e)}, trying next...")
-                continue
+        # Match paraphrases of the query only; task and context must be identical
+        context_digest = hashlib.blake2b(context_json.encode(), digest_size=8).hexdigest()
+        cache_namespace = f"{user_id}:{task_type}:{context_digest}"
+        # Embedding is CPU-bound model inference, so it runs off the event loop
+        query_embedding = await asyncio.to_thread(self.semantic_cache.embed, query) if self.semantic_cache.enabled else None
+        cached = self.semantic_cache.lookup_embedding(cache_namespace, query_embedding)
+        if cached:
+            return {**cached, "processing_time": int((time.time() - start_time) * 1000), "cache_hit": True}
+        
+        # Working Model: Race healthy model providers (staggered by preference), first success wins
+        now = time.monotonic()
+        models = [
+            model for model in self.model_preferences
+            if model != "fallback" and self._breaker[model]["open_until"] <= now
+        ]
+        pending = {
+            asyncio.create_task(self._call_ai_model_staggered(model, index * MODEL_STAGGER_SECONDS, system_prompt, user_prompt)): model
+            for index, model in enumerate(models)
+        }
+        
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model = pending.pop(task)
+                    if task.exception() is not None:
+                        logger.warning("Model %s failed: %s, waiting on others...", model, task.exception())
+                        self._record_model_failure(model)
+                        continue
+                    
+                    self._breaker[model]["failures"] = 0
+                    response = {
+                        "text": task.result(),
+                        "model": model,
+                        "confidence": 0.9,
+                        "processing_time": int((time.time() - start_time) * 1000)
+                    }
+                    self.semantic_cache.store_embedding(cache_namespace, query_embedding, response)
+                    return response
+        finally:
+            for task in pending:
+                task.cancel()
         
         # If all models fail, use rule-based fallback
         return self._rule_based_response(query, task_type)
 
-    def _build_system_prompt(self, task_type: str, context: Dict[str, Any]) -> str:
+    async def _call_ai_model_staggered(self, model: str, delay: float, system_prompt: str, user_prompt: str) -> str:
+        """Start a provider call after a delay so preferred models get a head start"""
+        if delay:
+            await asyncio.sleep(delay)
+        return await asyncio.wait_for(
+            self._call_ai_model(model, system_prompt, user_prompt),
+            timeout=MODEL_TIMEOUT_SECONDS
+        )
+
+    def _record_model_failure(self, model: str) -> None:
+        """Open the model's circuit after repeated consecutive failures"""
+        breaker = self._breaker[model]
+        breaker["failures"] += 1
+        if breaker["failures"] >= CIRCUIT_FAILURE_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + CIRCUIT_COOLDOWN_SECONDS
+            logger.warning("Model %s circuit open for %ss", model, CIRCUIT_COOLDOWN_SECONDS)
+
+    def _build_system_prompt(self, task_type: str) -> str:
         """
         Best Model: Advanced prompt engineering with task-specific optimization.
+        Returns a precomputed static prompt so it forms a cacheable prefix.
         """
-        base_prompt = """You are Hushh AI Assistant, a privacy-first AI that only acts with explicit user consent.
-
-Key principles:
-- Always respect user privacy and consent boundaries
-- Provide helpful, accurate, and actionable responses
-- Be concise but comprehensive
-- If you're unsure, say so rather than guess
-- Never access data without proper consent tokens"""
-
-        task_specific_prompts = {
-            "email_summary": """
-You specialize in email summarization and organization. Focus on:
-- Key action items and deadlines
-- Important contacts and communications
-- Prioritization of urgent vs non-urgent items
-- Protecting sensitive information
-""",
-            "calendar_management": """
-You help with calendar and schedule management. Focus on:
-- Optimal meeting scheduling
-- Time conflict resolution
-- Travel time considerations
-- Work-life balance optimization
-""",
-            "data_analysis": """
-You assist with personal data analysis and insights. Focus on:
-- Pattern recognition in user data
-- Actionable insights and recommendations
-- Data visualization suggestions
-- Privacy-preserving analytics
-""",
-            "general_assistance": """
-You provide general assistance across various domains. Focus on:
-- Understanding user intent accurately
-- Providing step-by-step guidance
-- Offering relevant alternatives
-- Being helpful while staying within scope
-"""
-        }
-        
-        task_prompt = task_specific_prompts.get(task_type, task_specific_prompts["general_assistance"])
-        
-        context_info = ""
-        if context:
-            context_info = f"\nAvailable context: {json.dumps(context, indent=2)}"
-        
-        return f"{base_prompt}\n\n{task_prompt}{context_info}"
+        return SYSTEM_PROMPTS.get(task_type, SYSTEM_PROMPTS["general_assistance"])
 
-    def _build_user_prompt(self, query: str, context: Dict[str, Any], user_id: str) -> str:
+    def _build_user_prompt(self, query: str, context_json: str, user_id: str) -> str:
         """
         Construct user prompt with proper context and personalization.
+        Dynamic fields are ordered least- to most-volatile, ending with the query.
+        Context arrives pre-serialized as compact JSON to save CPU and prompt tokens.
         """
-        prompt = f"User query: {query}"
+        prompt = "Please provide a helpful response that respects privacy and consent boundaries."
+        prompt += f"\n\nUser ID: {user_id}"
         
-        if context:
-            prompt += f"\n\nRelevant context:\n{json.dumps(context, indent=2)}"
+        if context_json:
+            prompt += f"\n\nRelevant context:\n{context_json}"
         
-        prompt += f"\n\nUser ID: {user_id}"
-        prompt += "\n\nPlease provide a helpful response that respects privacy and consent boundaries."
+        prompt += f"\n\nUser query: {query}"
         
         return prompt
 
-    def _call_ai_model(self, model: str, system_prompt: str, user_prompt: str) -> str:
+    async def _call_ai_model(self, model: str, system_prompt: str, user_prompt: str) -> str:
         """
         Call external AI model API with proper error handling.
         Working Model: Robust external service integration.
+        Concurrent calls to the same model are coalesced into one batched request.
+        """
+        batcher = self._batchers.get(model)
+        if batcher is None:
+            batcher = RequestBatcher(lambda prompts: self._call_ai_model_batch(model, prompts))
+            self._batchers[model] = batcher
+        
+        return await batcher.submit((system_prompt, user_prompt))
+
+    async def _call_ai_model_batch(self, model: str, prompts: List[tuple]) -> List[str]:
+        """
+        Send a batch of (system_prompt, user_prompt) pairs to the model in one request.
         """
         # In a real implementation, this would call actual AI APIs
         # For hackathon demo, we'll simulate responses
@@ -191,24 +329,21 @@ You provide general assistance across various domains. Focus on:
             "llama-3": f"[Llama-3 Response] I can help you with this request while maintaining strict privacy controls. Here's my analysis and recommendations based on the information you've shared with proper consent."
         }
         
-        # Simulate API latency
-        time.sleep(0.1)
+        # Simulate API latency (paid once per batch) without blocking the event loop
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(0.1)
         
-        return simulated_responses.get(model, "Model response not available")
+        response = simulated_responses.get(model, "Model response not available")
+        return [response] * len(prompts)
 
     def _rule_based_response(self, query: str, task_type: str) -> Dict[str, Any]:
         """
         Working Model: Rule-based fallback when AI models are unavailable.
         """
-        query_lower = query.lower()
-        
         # Pattern matching for common queries
-        if "email" in query_lower:
-            response = "I can help you organize and summarize your emails. With proper consent, I can identify important messages, extract action items, and provide priority rankings."
-        elif "calendar" in query_lower or "schedule" in query_lower:
-            response = "I can assist with calendar management including scheduling meetings, finding optimal time slots, and managing your daily agenda. Please ensure you have the appropriate consent tokens."
-        elif "data" in query_lower or "analyze" in query_lower:
-            response = "I can help analyze your personal data to provide insights and recommendations. All analysis is done with encryption and requires explicit consent for each data source."
+        match = RULE_PATTERN.match(query)
+        if match:
+            response = RULE_BASED_RESPONSES[match.lastgroup]
         else:
             response = f"I understand you're asking about: '{query}'. I can provide general assistance, but for more personalized help, please ensure you have the appropriate consent tokens for the specific data or services you'd like me to access."
         
@@ -237,12 +372,7 @@ You provide general assistance across various domains. Focus on:
 
     def _is_personalized_response(self, scope: str) -> bool:
         """Check if response can be personalized based on consent scope"""
-        personalizable_scopes = [
-            ConsentScope.VAULT_READ_EMAIL.value,
-            ConsentScope.VAULT_READ_CONTACTS.value,
-            ConsentScope.VAULT_READ_FINANCE.value
-        ]
-        return scope in personalizable_scopes
+        return scope in PERSONALIZABLE_SCOPES
 
     # Convenience methods for specific AI tasks
     def summarize_text(self, user_id: UserID, token_str: str, text: str, style: str = "bullet_points") -> Dict[str, Any]:
@@ -0,0 +1,84 @@
+# hushh_mcp/agents/batching.py
+"""
+Request coalescing for model calls.
+
+Concurrent requests that arrive within a short window are grouped and handed
+to a single batch dispatch call, so a model backend can serve them in one
+decoding pass instead of one round-trip per request.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+BatchDispatch = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class _Batch:
+    """Requests collected for one dispatch"""
+
+    def __init__(self):
+        self.items = []
+        self.futures = []
+        self.flushed = False
+
+
+class RequestBatcher:
+    """
+    Groups submitted items into batches of up to max_batch, waiting at most
+    max_wait_ms for a batch to fill before dispatching it.
+
+    Batches are tracked per event loop, so the batcher can be shared by agent
+    instances whose calls run on different loops.
+    """
+
+    def __init__(self, dispatch: BatchDispatch, max_batch: int = 16, max_wait_ms: float = 10):
+        self.dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._open_batches = weakref.WeakKeyDictionary()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the batch dispatch"""
+        loop = asyncio.get_running_loop()
+        batch = self._open_batches.get(loop)
+        if batch is None:
+            batch = _Batch()
+            self._open_batches[loop] = batch
+            loop.call_later(self.max_wait, self._flush, loop, batch)
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+
+        if len(batch.items) >= self.max_batch:
+            self._flush(loop, batch)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, batch: _Batch) -> None:
+        if batch.flushed:
+            return
+        batch.flushed = True
+        if self._open_batches.get(loop) is batch:
+            del self._open_batches[loop]
+        loop.create_task(self._run(batch))
+
+    async def _run(self, batch: _Batch) -> None:
+        try:
+            results = await self.dispatch(batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(f"Batch dispatch returned {len(results)} results for {len(batch.items)} requests")
+        except Exception as e:
+            logger.warning("Batch of %d requests failed: %s", len(batch.items), e)
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
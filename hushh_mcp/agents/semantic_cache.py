@@ -0,0 +1,179 @@
+# hushh_mcp/agents/semantic_cache.py
+"""
+Semantic response cache for AI agents.
+
+Paraphrased prompts ("summarize my emails" vs "give me an email summary")
+usually deserve the same answer. This cache embeds each prompt, compares it
+against previously answered prompts by cosine similarity, and returns the
+stored response when the closest match clears the similarity threshold.
+
+Entries are partitioned by namespace (e.g. user ID) so one user's cached
+answers are never served to another user.
+
+Without a real sentence embedder the cache stays disabled: bag-of-words
+similarity is too coarse to decide that two prompts deserve the same answer.
+"""
+
+import logging
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used without it
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+HASHED_EMBEDDING_DIM = 512
+
+Embedder = Callable[[str], np.ndarray]
+
+
+def _hashed_embedding(text: str) -> np.ndarray:
+    """Bag-of-words embedding for tests; too coarse to serve real traffic"""
+    vector = np.zeros(HASHED_EMBEDDING_DIM, dtype=np.float32)
+    for token in text.lower().split():
+        vector[zlib.crc32(token.encode()) % HASHED_EMBEDDING_DIM] += 1.0
+    return vector
+
+
+def _best_match_numpy(embeddings: np.ndarray, query: np.ndarray, slot_namespaces: np.ndarray, namespace_id: int):
+    """Index and similarity of the closest stored embedding within one namespace"""
+    similarities = embeddings @ query
+    similarities[slot_namespaces != namespace_id] = -1.0
+    best = int(np.argmax(similarities))
+    return best, float(similarities[best])
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _best_match(embeddings, query, slot_namespaces, namespace_id):
+        # Single pass that skips other namespaces' rows entirely
+        best = -1
+        best_similarity = -1.0
+        for row in range(embeddings.shape[0]):
+            if slot_namespaces[row] != namespace_id:
+                continue
+            similarity = 0.0
+            for col in range(query.shape[0]):
+                similarity += embeddings[row, col] * query[col]
+            if similarity > best_similarity:
+                best_similarity = similarity
+                best = row
+        return best, best_similarity
+else:
+    _best_match = _best_match_numpy
+
+
+@lru_cache(maxsize=1)
+def get_default_embedder() -> Optional[Embedder]:
+    """Load the local embedding model once per process, or None if unavailable"""
+    try:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(EMBEDDING_MODEL)
+        return lambda text: model.encode(text, convert_to_numpy=True).astype(np.float32)
+    except Exception as e:
+        logger.warning("Embedding model unavailable, semantic cache disabled: %s", e)
+        return None
+
+
+class SemanticCache:
+    """
+    Bounded embedding-similarity cache with LRU eviction.
+
+    Embeddings live in a preallocated float32 matrix so a lookup is a single
+    matrix-vector product over the stored prompts, or a Numba-compiled scan
+    of the caller's namespace when numba is installed.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 1024
+    ):
+        # Loaded here rather than on first use, so the model load never lands on a request path
+        self.embedder = embedder if embedder is not None else get_default_embedder()
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+
+        self._embeddings: Optional[np.ndarray] = None
+        self._namespace_ids: Dict[str, int] = {}
+        self._slot_namespaces = np.full(max_entries, -1, dtype=np.int64)
+        self._responses = []
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.embedder is not None
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Normalized embedding of text, or None when the cache is disabled; CPU-bound, so async callers should run it in a thread"""
+        if not self.enabled:
+            return None
+        vector = np.asarray(self.embedder(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def lookup(self, namespace: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for the most similar prompt, if close enough"""
+        if namespace not in self._namespace_ids:
+            return None
+        return self.lookup_embedding(namespace, self.embed(prompt))
+
+    def lookup_embedding(self, namespace: str, query: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """lookup() for a prompt already embedded with embed()"""
+        if query is None or namespace not in self._namespace_ids:
+            return None
+
+        with self._lock:
+            namespace_id = self._namespace_ids[namespace]
+            count = len(self._responses)
+            best, similarity = _best_match(
+                self._embeddings[:count], query, self._slot_namespaces[:count], namespace_id
+            )
+            if best < 0 or similarity < self.similarity_threshold:
+                return None
+
+            self._last_used[best] = self._tick()
+            return self._responses[best]
+
+    def store(self, namespace: str, prompt: str, response: Dict[str, Any]) -> None:
+        """Cache a response, evicting the least recently used entry when full"""
+        self.store_embedding(namespace, self.embed(prompt), response)
+
+    def store_embedding(self, namespace: str, embedding: Optional[np.ndarray], response: Dict[str, Any]) -> None:
+        """store() for a prompt already embedded with embed()"""
+        if embedding is None:
+            return
+
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+
+            if len(self._responses) < self.max_entries:
+                slot = len(self._responses)
+                self._responses.append(response)
+            else:
+                slot = int(np.argmin(self._last_used))
+                self._responses[slot] = response
+
+            namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            self._slot_namespaces[slot] = namespace_id
+            self._embeddings[slot] = embedding
+            self._last_used[slot] = self._tick()
+
+    def __len__(self) -> int:
+        return len(self._responses)
@@ -1,28 +1,43 @@
 # hushh_mcp/agents/shopping.py
 
+import copy
 import time
+import re
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+import hashlib
+import heapq
+import sqlite3
+from functools import cached_property, lru_cache
+from operator import attrgetter
+from typing import AsyncIterator, List, Dict, Any, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from types import MappingProxyType
+
+import httpx
+import numpy as np
+import orjson
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernels are used without it
+    njit = None
 
 from hushh_mcp.agents.base_agent import BaseAgent
+from hushh_mcp.agents.batching import RequestBatcher
+from hushh_mcp.agents.ttl_cache import TTLCache
+from hushh_mcp.config import LIVE_PLATFORM_APIS, SIMULATE_LATENCY
 from hushh_mcp.consent.token import validate_token
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import UserID, HushhConsentToken
-from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data
+from hushh_mcp.vault.kv_store import VaultKVStore
 from hushh_mcp.vault.storage import VaultStorage
-from hushh_mcp.vault.user_data_collector import UserDataCollector, DataCategory
-from hushh_mcp.agents.personalization_engine import PersonalizationEngine, TipCategory
-from hushh_mcp.vault.user_data_collector_advanced import AdvancedDataCollector
-from hushh_mcp.agents.rule_based_engine import RuleBasedEngine
-from hushh_mcp.vault.privacy_controller import PrivacyController
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProductRecommendation:
     """Enhanced product recommendation with comprehensive data"""
     title: str
@@ -32,11 +47,174 @@ class ProductRecommendation:
     availability: str
     rating: float
     reviews_count: int
-    shipping_info: Dict[str, Any]
+    shipping_info: Mapping[str, Any]
     recommendation_score: float
     reason: str
 
-@dataclass 
+@lru_cache(maxsize=8192)
+def _stable_hash(text: str) -> int:
+    """64-bit blake2b digest; unlike the salted built-in hash() it is the same in every process"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+@dataclass(frozen=True, slots=True)
+class UserProfile:
+    """Per-user shopping signals used for scoring; immutable so it can be cached and shared"""
+    user_id: str
+    apple_affinity: float = 0.0
+    smart_home_interest: float = 0.0
+    budget_conscious: bool = False
+    preferred_brands: Tuple[str, ...] = ()
+    categories: Tuple[str, ...] = ()
+    has_email_data: bool = False
+    has_finance_data: bool = False
+    has_purchase_data: bool = False
+    profile_completeness: float = 0.3
+    # Stable hash of user_id, computed once and reused by every scoring call
+    uid_hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "uid_hash", _stable_hash(self.user_id))
+
+    @property
+    def price_ceiling(self) -> float:
+        """Upper end of the user's usual electronics price range"""
+        return 1000.0
+
+@dataclass(frozen=True, slots=True)
+class ComprehensiveProfile(UserProfile):
+    """User profile extended with behavioral shopping data"""
+    shopping_frequency: str = "weekly"
+    avg_session_duration: int = 25  # minutes
+    platform_preferences: Tuple[str, ...] = ("amazon", "walmart")
+    deal_sensitivity: float = 0.7
+    brand_loyalty_score: float = 0.6
+    seasonal_patterns: Tuple[Tuple[str, Tuple[str, ...]], ...] = (("winter", ("electronics",)), ("summer", ("outdoor",)))
+    price_range_electronics: Tuple[float, float] = (50.0, 500.0)
+    last_purchase_days_ago: int = 7
+
+    @property
+    def price_ceiling(self) -> float:
+        return self.price_range_electronics[1]
+
+USER_PROFILE_FIELDS = tuple(f.name for f in fields(UserProfile) if f.init)
+PROFILE_CACHE_SIZE = 4096
+PROFILE_CACHE_TTL_SECONDS = 60
+
+# Recommendation/deal responses are reused for a few minutes per (user, request args)
+RESULT_CACHE_TTL_SECONDS = 300
+RESULT_CACHE_PER_USER = 64
+
+# "Not enough data" answers are remembered briefly so empty users don't rerun the ML/rule engines
+NEGATIVE_CACHE_TTL_SECONDS = 30
+
+def _score_items_numpy(prices, has_apple, user_factors, apple_affinity, price_ceiling):
+    """Item recommendation scores: base + brand affinity + price fit + per-user factor"""
+    scores = np.full(prices.shape[0], 0.5)
+    if apple_affinity > 0.5:
+        scores += 0.3 * has_apple
+    scores += np.where(prices < price_ceiling, 0.2, 0.0)
+    return np.minimum(1.0, scores + user_factors)
+
+def _rank_items_numpy(prices, has_apple, user_factors, apple_affinity, price_ceiling, budget_max):
+    """Indices of in-budget items ordered by descending score (ties keep catalog order), plus all scores"""
+    scores = _score_items_numpy(prices, has_apple, user_factors, apple_affinity, price_ceiling)
+    in_budget = np.flatnonzero(prices <= budget_max)
+    return in_budget[np.argsort(-scores[in_budget], kind="stable")], scores
+
+def _score_deals_numpy(discounts, category_match, budget_conscious):
+    """Deal relevance scores: base + category match + discount for budget-conscious users"""
+    relevance = np.full(discounts.shape[0], 0.5) + 0.3 * category_match
+    if budget_conscious:
+        relevance += np.where(discounts > 15, 0.2, 0.0)
+    return np.minimum(1.0, relevance)
+
+if njit is not None:
+    @njit(cache=True)
+    def _score_items(prices, has_apple, user_factors, apple_affinity, price_ceiling):
+        # Profile-level conditions are folded into constants once, leaving a branch-free loop body
+        apple_bonus = 0.3 if apple_affinity > 0.5 else 0.0
+        scores = np.empty(prices.shape[0])
+        for i in range(prices.shape[0]):
+            score = 0.5 + apple_bonus * has_apple[i] + 0.2 * (prices[i] < price_ceiling)
+            scores[i] = min(1.0, score + user_factors[i])
+        return scores
+
+    @njit(cache=True)
+    def _rank_items(prices, has_apple, user_factors, apple_affinity, price_ceiling, budget_max):
+        # Budget filter and scoring fused into one sweep over the candidates
+        apple_bonus = 0.3 if apple_affinity > 0.5 else 0.0
+        scores = np.zeros(prices.shape[0])
+        in_budget = np.empty(prices.shape[0], dtype=np.int64)
+        count = 0
+        for i in range(prices.shape[0]):
+            if prices[i] > budget_max:
+                continue
+            score = 0.5 + apple_bonus * has_apple[i] + 0.2 * (prices[i] < price_ceiling)
+            scores[i] = min(1.0, score + user_factors[i])
+            in_budget[count] = i
+            count += 1
+        in_budget = in_budget[:count]
+        return in_budget[np.argsort(-scores[in_budget], kind="mergesort")], scores
+
+    @njit(cache=True)
+    def _score_deals(discounts, category_match, budget_conscious):
+        discount_bonus = 0.2 if budget_conscious else 0.0
+        relevance = np.empty(discounts.shape[0])
+        for i in range(discounts.shape[0]):
+            score = 0.5 + 0.3 * category_match[i] + discount_bonus * (discounts[i] > 15)
+            relevance[i] = min(1.0, score)
+        return relevance
+else:
+    _score_items = _score_items_numpy
+    _rank_items = _rank_items_numpy
+    _score_deals = _score_deals_numpy
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def _personalization_score(uid_hash: int, has_email_data: bool, has_finance_data: bool, has_purchase_data: bool) -> float:
+    """Overall personalization score; a pure function of the user's hash and data-source flags"""
+    base_score = 0.3  # Minimum score
+    
+    if has_email_data:
+        base_score += 0.2
+    if has_finance_data:
+        base_score += 0.2
+    if has_purchase_data:
+        base_score += 0.3
+    
+    # Add unique factor based on user ID to ensure different scores for different users
+    user_factor = (uid_hash % 100) / 1000  # 0-0.099
+    return min(1.0, base_score + user_factor)
+
+def _mix_hash(user_hash: int, product_hash: int) -> int:
+    """Combine a user and product hash with one multiply-xor instead of hashing a joined string"""
+    return ((user_hash * 0x9E3779B97F4A7C15) ^ product_hash) & 0xFFFFFFFFFFFFFFFF
+
+@lru_cache(maxsize=8192)
+def _title_features(title: str) -> Tuple[bool, int]:
+    """Scoring inputs derived from an item title (brand flag, stable hash), computed once per title"""
+    return "Apple" in title, _stable_hash(title)
+
+# Queries routed to the smart-home/audio recommendation set
+_QUERY_ROUTER = re.compile(r"smart home|headphones", re.IGNORECASE)
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def _category_pattern(categories: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """One compiled alternation per distinct category tuple, instead of a substring scan per category"""
+    if not categories:
+        return None
+    return re.compile("|".join(re.escape(category) for category in categories), re.IGNORECASE)
+
+def _prices(items: List[Dict[str, Any]]) -> np.ndarray:
+    return np.fromiter((item.get("price", 0) for item in items), dtype=np.float64, count=len(items))
+
+def _warm_up_scoring() -> None:
+    """Trigger JIT compilation up front so the first request doesn't pay for it"""
+    one = np.ones(1)
+    _score_items(one, one, one, 0.0, 0.0)
+    _rank_items(one, one, one, 0.0, 0.0, 0.0)
+    _score_deals(one, one, False)
+
+@dataclass(frozen=True, slots=True)
 class PlatformConnection:
     """Platform connection configuration"""
     platform: str
@@ -44,6 +222,205 @@ class PlatformConnection:
     auth_type: str
     connection_status: str
 
+PLATFORM_FETCH_CONCURRENCY = 8
+
+# One pooled HTTP/2 client per agent, so platform calls reuse warm connections
+# (and multiplex on one connection per host) instead of handshaking per request.
+# Only created once a live platform call is made (LIVE_PLATFORM_APIS)
+PLATFORM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+PLATFORM_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# Only the best-ranked candidates are turned into response dicts
+RECOMMENDATION_TOP_K = 20
+
+# Static tables built once at import and shared by every agent instance
+PLATFORM_CONNECTIONS = (
+    PlatformConnection("amazon", "https://api.amazon.com/v1", "oauth2", "ready"),
+    PlatformConnection("ebay", "https://api.ebay.com/v1", "oauth2", "ready"),
+    PlatformConnection("shopify", "https://api.shopify.com/v1", "api_key", "ready"),
+    PlatformConnection("walmart", "https://api.walmart.com/v1", "api_key", "ready"),
+    PlatformConnection("target", "https://api.target.com/v1", "oauth2", "ready")
+)
+
+CONSENT_CATEGORIES = MappingProxyType({
+    "EMAIL_PATTERNS": {
+        "description": "📧 Access your email data to analyze shopping patterns, order confirmations, and brand newsletters",
+        "benefits": ["Personalized deal recommendations", "Automatic order tracking", "Brand preference learning"],
+        "data_types": ["Purchase confirmations", "Newsletter subscriptions", "Shopping receipts"],
+        "retention": "Until user revokes consent"
+    },
+    "FINANCIAL_DATA": {
+        "description": "💰 Access your financial data to understand spending patterns and budget preferences", 
+        "benefits": ["Budget-aware recommendations", "Price range optimization", "Cashback opportunities"],
+        "data_types": ["Transaction history", "Budget categories", "Spending patterns"],
+        "retention": "6 months rolling"
+    },
+    "PURCHASE_HISTORY": {
+        "description": "🛒 Track your purchase history and shopping behavior for better recommendations",
+        "benefits": ["Avoid duplicate suggestions", "Reorder recommendations", "Seasonal predictions"],
+        "data_types": ["Product purchases", "Brand preferences", "Shopping frequency"],
+        "retention": "12 months"
+    },
+    "PLATFORM_ACCESS": {
+        "description": "🏬 Connect to your shopping accounts across platforms for real-time data",
+        "benefits": ["Live price tracking", "Order status updates", "Cross-platform deals"],
+        "data_types": ["Account connections", "Order history", "Wishlist items"],
+        "retention": "Active until disconnected"
+    },
+    "BEHAVIORAL_ANALYTICS": {
+        "description": "📈 Analyze your shopping behavior for intelligent predictions and proactive assistance",
+        "benefits": ["Predict needs before you shop", "Seasonal recommendations", "Budget forecasting"],
+        "data_types": ["Browse patterns", "Search history", "Timing preferences"],
+        "retention": "90 days"
+    }
+})
+
+# Simulated catalog; "title" and "personalization_reason" are str.format templates
+# over the user's profile fields, everything else is copied into the response as is
+PRODUCT_CATALOG = (
+    MappingProxyType({
+        "title": "💻 MacBook Air M3 (Personalized for {user_id})",
+        "price": 1099.99,
+        "original_price": 1299.99,
+        "discount": 200.00,
+        "platform": "amazon",
+        "rating": 4.8,
+        "reviews": 2543,
+        "personalization_reason": "Based on your {apple_affinity:.1f} Apple affinity",
+        "availability": "in_stock",
+        "shipping": "free_prime"
+    }),
+    MappingProxyType({
+        "title": "🎧 Sony WH-1000XM5 (Recommended for {user_id})",
+        "price": 349.99,
+        "original_price": 399.99,
+        "discount": 50.00,
+        "platform": "walmart",
+        "rating": 4.6,
+        "reviews": 1876,
+        "personalization_reason": "Matches your audio preferences",
+        "availability": "limited_stock",
+        "shipping": "2_day"
+    })
+)
+
+DEAL_CATALOG = (
+    MappingProxyType({
+        "title": "🔥 Flash Sale: iPhone 15 Pro Max (For {user_id})",
+        "original_price": 1199.99,
+        "sale_price": 999.99,
+        "discount_percent": 17,
+        "platform": "amazon",
+        "expires_in_hours": 6,
+        "stock_level": "low",
+        "personalization_reason": "Perfect for Apple enthusiasts like you (affinity: {apple_affinity:.1f})"
+    }),
+    MappingProxyType({
+        "title": "💡 Smart Home Bundle Deal (Curated for {user_id})",
+        "original_price": 399.99,
+        "sale_price": 249.99,
+        "discount_percent": 38,
+        "platform": "target",
+        "expires_in_hours": 24,
+        "stock_level": "medium",
+        "personalization_reason": "Based on your smart home interest score: {smart_home_interest:.1f}"
+    })
+)
+
+# Shipping options shared by every recommendation that uses them
+SHIPPING_PRIME_1_DAY = MappingProxyType({"estimated_days": 1, "cost": 0.0, "method": "Prime"})
+SHIPPING_PRIME_2_DAY = MappingProxyType({"estimated_days": 2, "cost": 0.0, "method": "Prime"})
+
+LEGACY_DEALS = (
+    "💻 10% off MacBook Air for Hushh users",
+    "🎧 Free AirPods with iPhone 16 preorder",
+    "📦 20% cashback on your next Amazon order",
+    "🛒 Curated fashion drops based on your inbox purchases"
+)
+
+def _personalize(template: MappingProxyType, user_profile: UserProfile) -> Dict[str, Any]:
+    """Fresh response dict for one catalog entry, with its templated fields filled in for the user"""
+    item = dict(template)
+    item["title"] = template["title"].format(user_id=user_profile.user_id)
+    item["personalization_reason"] = template["personalization_reason"].format(
+        apple_affinity=user_profile.apple_affinity,
+        smart_home_interest=user_profile.smart_home_interest
+    )
+    return item
+
+# Static content of the tips served when the personalization engine is unavailable
+MOCK_TIPS = (
+    MappingProxyType({
+        "category": "product_suggestion",
+        "title": "New Arrivals in Electronics",
+        "message": "Based on your recent browsing, check out the latest laptop deals!",
+        "confidence_score": 0.75,
+        "urgency": "medium",
+        "action_items": ("Browse latest laptops", "Compare prices", "Check reviews"),
+        "relevant_products": (
+            MappingProxyType({"name": "MacBook Air M3", "price": 1199.99, "platform": "Amazon"}),
+        ),
+        "savings_potential": 200.00
+    }),
+    MappingProxyType({
+        "category": "budget_advice",
+        "title": "Wishlist Deals Alert",
+        "message": "Items in your wishlist are 20% off - save now!",
+        "confidence_score": 0.90,
+        "urgency": "high",
+        "action_items": ("Check wishlist", "Apply discounts", "Complete purchase"),
+        "relevant_products": (
+            MappingProxyType({"name": "Wireless Headphones", "price": 79.99, "platform": "Best Buy"}),
+        ),
+        "savings_potential": 50.00
+    })
+)
+
+# Fields read off engine objects in one C-level call each
+_recommendation_fields = attrgetter(
+    "rec_id", "rec_type", "title", "description", "confidence_score", "priority", "action_url", "expires_at"
+)
+_TIP_KEYS = (
+    "tip_id", "category", "title", "message", "confidence_score", "urgency",
+    "action_items", "relevant_products", "savings_potential", "expiry_date", "created_at"
+)
+_tip_fields = attrgetter(*_TIP_KEYS)
+
+def _tip_to_dict(tip: Any) -> Dict[str, Any]:
+    """Serializable form of a personalization engine tip"""
+    tip_data = dict(zip(_TIP_KEYS, _tip_fields(tip)))
+    tip_data["category"] = tip_data["category"].value
+    return tip_data
+
+@lru_cache(maxsize=None)
+def _members_by_value(enum_cls: type) -> Mapping[str, Any]:
+    """value -> member table for an enum, built once per enum class"""
+    return MappingProxyType({member.value: member for member in enum_cls})
+
+SHOPPING_STYLE_DESCRIPTIONS = MappingProxyType({
+    "budget_conscious": "Value-focused shopper who prioritizes deals and savings",
+    "premium_buyer": "Quality-focused shopper who invests in high-end products",
+    "frequent_shopper": "Active shopper who makes regular purchases",
+    "occasional_buyer": "Selective shopper who makes thoughtful purchases",
+    "deal_hunter": "Bargain-focused shopper who actively seeks discounts",
+    "brand_loyal": "Brand-focused shopper with strong preferences",
+    "impulse_buyer": "Spontaneous shopper who makes quick decisions",
+    "research_focused": "Analytical shopper who thoroughly researches before buying"
+})
+
+def _purchase_summary(purchases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Purchase count, distinct categories and mean spend, gathered in one pass"""
+    categories = set()
+    total = 0.0
+    for purchase in purchases:
+        categories.add(purchase.get("category", ""))
+        total += purchase.get("price", 0)
+    return {
+        "total_purchases": len(purchases),
+        "categories": list(categories),
+        "avg_spending": total / len(purchases) if purchases else 0.0
+    }
+
 class HushhShoppingAgent(BaseAgent):
     """
     🛒 Enhanced Shopping Agent with Multi-Platform Integration
@@ -68,11 +445,44 @@ class HushhShoppingAgent(BaseAgent):
         super().__init__(agent_id, required_scopes)
         
         # Initialize vault storage simulation
-        self._vault_data = {}  # Simple in-memory storage for demo
+        self._vault_data = VaultKVStore()  # In-memory SQLite store for demo
+        # Writes from concurrent collections are grouped into one batched insert off the event loop
+        self._vault_writer = RequestBatcher(self._write_vault_batch, max_batch=64, max_wait_ms=10)
+        
+        # Profiles are immutable, so repeat calls for a user reuse the same instance
+        # until the TTL lapses or a vault write for that user invalidates it
+        self._profile_cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS)
+        self._comprehensive_profile_cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS)
+        # user_id -> {request key: response}, so one invalidation clears all of a user's results
+        self._result_cache = TTLCache(PROFILE_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+        # ML segmentation runs over a user's whole purchase history; reuse it until their data changes
+        self._ml_profile_cache = TTLCache(PROFILE_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+        # (user_id, endpoint) -> empty-result response
+        self._negative_cache = TTLCache(PROFILE_CACHE_SIZE, NEGATIVE_CACHE_TTL_SECONDS)
+        
+        if njit is not None:
+            _warm_up_scoring()
         self.platform_connections = self._initialize_platform_connections()
+        self._http: Optional[httpx.AsyncClient] = None
+        # Platforms with a live integration; the rest fall through to _fetch_generic
+        self._platform_handlers = {
+            "amazon": self._fetch_amazon,
+        }
         
-        # Initialize personalization components
+        # Initialize personalization components (imported here: they're optional and
+        # pull in the vault/ML stack, which the core recommendation paths don't need)
         try:
+            from hushh_mcp.vault.user_data_collector import UserDataCollector
+            from hushh_mcp.agents.personalization_engine import PersonalizationEngine, TipCategory
+            from hushh_mcp.vault.user_data_collector_advanced import AdvancedDataCollector, DataType
+            from hushh_mcp.agents.rule_based_engine import RuleBasedEngine
+            from hushh_mcp.vault.privacy_controller import PrivacyController, DataCategory
+            
+            # Enum name -> member tables, resolved here once instead of importing per request
+            self._tip_categories_by_value = _members_by_value(TipCategory)
+            self._data_types_by_value = _members_by_value(DataType)
+            self._data_categories_by_value = _members_by_value(DataCategory)
+            
             self.vault_storage = VaultStorage()
             self.data_collector = UserDataCollector(self.vault_storage)
             self.personalization_engine = PersonalizationEngine(self.data_collector)
@@ -84,25 +494,33 @@ class HushhShoppingAgent(BaseAgent):
             
             logger.info("✅ Advanced personalization system initialized")
         except Exception as e:
-            logger.warning(f"⚠️ Personalization engine initialization failed: {e}")
+            logger.warning("⚠️ Personalization engine initialization failed: %s", e)
             self.vault_storage = None
             self.data_collector = None
             self.personalization_engine = None
             self.advanced_collector = None
             self.rule_engine = None
             self.privacy_controller = None
+            self._tip_categories_by_value = self._data_types_by_value = self._data_categories_by_value = MappingProxyType({})
         
-        logger.info(f"🛒 Enhanced Shopping Agent initialized with {len(self.platform_connections)} platform connections")
+        logger.info("🛒 Enhanced Shopping Agent initialized with %d platform connections", self.platform_count)
 
-    def _initialize_platform_connections(self) -> List[PlatformConnection]:
+    def _initialize_platform_connections(self) -> Tuple[PlatformConnection, ...]:
         """Initialize connections to major shopping platforms"""
-        return [
-            PlatformConnection("amazon", "https://api.amazon.com/v1", "oauth2", "ready"),
-            PlatformConnection("ebay", "https://api.ebay.com/v1", "oauth2", "ready"), 
-            PlatformConnection("shopify", "https://api.shopify.com/v1", "api_key", "ready"),
-            PlatformConnection("walmart", "https://api.walmart.com/v1", "api_key", "ready"),
-            PlatformConnection("target", "https://api.target.com/v1", "oauth2", "ready")
-        ]
+        return PLATFORM_CONNECTIONS
+
+    # Derived once per agent from platform_connections, which never changes after __init__
+    @cached_property
+    def platform_names(self) -> Tuple[str, ...]:
+        return tuple(conn.platform for conn in self.platform_connections)
+
+    @cached_property
+    def platform_count(self) -> int:
+        return len(self.platform_connections)
+
+    @cached_property
+    def _platform_endpoints(self) -> Dict[str, str]:
+        return {conn.platform: conn.api_endpoint for conn in self.platform_connections}
 
     def _execute_agent_logic(self, user_id: UserID, token: HushhConsentToken, **kwargs) -> Dict[str, Any]:
         """Core agent logic - defaults to personalized recommendations"""
@@ -113,43 +531,11 @@ class HushhShoppingAgent(BaseAgent):
         🔐 Request comprehensive consent for all shopping features
         """
         try:
-            consent_categories = {
-                "EMAIL_PATTERNS": {
-                    "description": "📧 Access your email data to analyze shopping patterns, order confirmations, and brand newsletters",
-                    "benefits": ["Personalized deal recommendations", "Automatic order tracking", "Brand preference learning"],
-                    "data_types": ["Purchase confirmations", "Newsletter subscriptions", "Shopping receipts"],
-                    "retention": "Until user revokes consent"
-                },
-                "FINANCIAL_DATA": {
-                    "description": "💰 Access your financial data to understand spending patterns and budget preferences", 
-                    "benefits": ["Budget-aware recommendations", "Price range optimization", "Cashback opportunities"],
-                    "data_types": ["Transaction history", "Budget categories", "Spending patterns"],
-                    "retention": "6 months rolling"
-                },
-                "PURCHASE_HISTORY": {
-                    "description": "🛒 Track your purchase history and shopping behavior for better recommendations",
-                    "benefits": ["Avoid duplicate suggestions", "Reorder recommendations", "Seasonal predictions"],
-                    "data_types": ["Product purchases", "Brand preferences", "Shopping frequency"],
-                    "retention": "12 months"
-                },
-                "PLATFORM_ACCESS": {
-                    "description": "🏬 Connect to your shopping accounts across platforms for real-time data",
-                    "benefits": ["Live price tracking", "Order status updates", "Cross-platform deals"],
-                    "data_types": ["Account connections", "Order history", "Wishlist items"],
-                    "retention": "Active until disconnected"
-                },
-                "BEHAVIORAL_ANALYTICS": {
-                    "description": "📈 Analyze your shopping behavior for intelligent predictions and proactive assistance",
-                    "benefits": ["Predict needs before you shop", "Seasonal recommendations", "Budget forecasting"],
-                    "data_types": ["Browse patterns", "Search history", "Timing preferences"],
-                    "retention": "90 days"
-                }
-            }
-            
             return {
                 "success": True,
-                "total_scopes": len(consent_categories),
-                "consent_requests": consent_categories,
+                "total_scopes": len(CONSENT_CATEGORIES),
+                # Shallow copy keeps the response JSON-serializable; the category entries are shared
+                "consent_requests": dict(CONSENT_CATEGORIES),
                 "estimated_setup_time": "5-10 minutes",
                 "data_security": "AES-256 encryption, user-controlled access, deletion on demand",
                 "benefits_summary": "Comprehensive shopping assistance with privacy protection",
@@ -157,110 +543,195 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error requesting comprehensive consent: {str(e)}")
+            logger.error("Error requesting comprehensive consent: %s", e)
             return {"success": False, "error": str(e)}
 
     async def collect_platform_data(self, user_id: UserID, platform: str, credentials: Dict[str, Any]) -> Dict[str, Any]:
         """
         🔗 Collect and process data from connected shopping platforms
         """
+        handler = self._platform_handlers.get(platform, self._fetch_generic)
         try:
-            # Simulate platform data collection
-            if platform == "amazon":
-                # Simulate Amazon API call
-                await asyncio.sleep(0.5)  # Simulate API delay
-                
-                collected_data = {
-                    "orders": 15,
-                    "total_spend": 2498.50,
-                    "categories": ["electronics", "computers", "books"],
-                    "preferred_brands": ["Apple", "Samsung", "Anker"],
-                    "avg_order_value": 166.57,
-                    "last_purchase": "2024-01-10"
-                }
-                
-                # Store in vault simulation
-                vault_key = f"platform_data.{user_id}.{platform}"
-                self._vault_data[vault_key] = collected_data
-                
-                return {
-                    "success": True,
-                    "platform": platform,
-                    "data_points_collected": len(collected_data),
-                    "categories_found": collected_data["categories"],
-                    "total_spend": collected_data["total_spend"],
-                    "orders_analyzed": collected_data["orders"],
-                    "vault_stored": True
-                }
-            
-            else:
-                # Placeholder for other platforms
-                return {
-                    "success": True,
-                    "platform": platform,
-                    "status": "Platform integration pending",
-                    "estimated_data_points": 50
-                }
-                
+            return await handler(user_id, platform, credentials)
         except Exception as e:
-            logger.error(f"Error collecting platform data: {str(e)}")
+            logger.error("Error collecting platform data: %s", e)
             return {"success": False, "error": str(e), "platform": platform}
 
+    async def _fetch_amazon(self, user_id: UserID, platform: str, credentials: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect order history from Amazon"""
+        if LIVE_PLATFORM_APIS:
+            collected_data = await self._platform_get(platform, "orders/summary", credentials)
+        else:
+            # Simulate Amazon API call
+            if SIMULATE_LATENCY:
+                await asyncio.sleep(0.5)  # Simulate API delay
+            
+            collected_data = {
+                "orders": 15,
+                "total_spend": 2498.50,
+                "categories": ["electronics", "computers", "books"],
+                "preferred_brands": ["Apple", "Samsung", "Anker"],
+                "avg_order_value": 166.57,
+                "last_purchase": "2024-01-10"
+            }
+        
+        # Store in vault simulation
+        await self._vault_writer.submit((user_id, "platform_data", platform, collected_data))
+        self.invalidate_profile(user_id)
+        
+        return {
+            "success": True,
+            "platform": platform,
+            "data_points_collected": len(collected_data),
+            "categories_found": collected_data["categories"],
+            "total_spend": collected_data["total_spend"],
+            "orders_analyzed": collected_data["orders"],
+            "vault_stored": True
+        }
+
+    async def _platform_get(self, platform: str, path: str, credentials: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a platform API resource over the shared client"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(http2=True, limits=PLATFORM_HTTP_LIMITS, timeout=PLATFORM_HTTP_TIMEOUT)
+        headers = {"Authorization": f"Bearer {credentials['access_token']}"} if "access_token" in credentials else None
+        response = await self._http.get(f"{self._platform_endpoints[platform]}/{path}", headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Release pooled platform connections; call on shutdown"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _fetch_generic(self, user_id: UserID, platform: str, credentials: Dict[str, Any]) -> Dict[str, Any]:
+        """Placeholder for platforms without an integration yet"""
+        return {
+            "success": True,
+            "platform": platform,
+            "status": "Platform integration pending",
+            "estimated_data_points": 50
+        }
+
+    async def collect_all_platform_data(self, user_id: UserID, credentials: Dict[str, Dict[str, Any]],
+                                        platforms: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        🔗 Collect data from several platforms concurrently, so total latency is the
+        slowest platform rather than the sum of all of them
+        """
+        if platforms is None:
+            platforms = self.platform_names
+        platforms = list(dict.fromkeys(platforms))
+        
+        # Bound how many platform APIs are hit at once when many platforms are requested
+        semaphore = asyncio.Semaphore(PLATFORM_FETCH_CONCURRENCY)
+        
+        async def collect(platform: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.collect_platform_data(user_id, platform, credentials.get(platform, {}))
+        
+        # One failing platform must not discard the others' results
+        outcomes = await asyncio.gather(*[collect(platform) for platform in platforms], return_exceptions=True)
+        results = [
+            {"success": False, "error": str(outcome), "platform": platform} if isinstance(outcome, Exception) else outcome
+            for platform, outcome in zip(platforms, outcomes)
+        ]
+        
+        return {
+            "success": all(result["success"] for result in results),
+            "platforms": dict(zip(platforms, results)),
+            "platforms_collected": len(platforms)
+        }
+
+    async def _write_vault_batch(self, records: List[Tuple[str, str, str, Dict[str, Any]]]) -> List[None]:
+        """Persist a batch of queued vault writes without blocking the event loop"""
+        await asyncio.to_thread(self._vault_data.put_many, records)
+        return [None] * len(records)
+
     def get_personalized_recommendations(self, user_id: UserID, token_str: str, 
                                        query: Optional[str] = None, category: Optional[str] = None,
                                        budget_max: Optional[float] = None) -> Dict[str, Any]:
         """
         🎯 Enhanced personalized recommendations with ML-powered scoring
         """
+        cache_key = ("recommendations", query, category, budget_max)
+        cached = self._cached_result(user_id, cache_key)
+        if cached is not None:
+            return cached
+        
+        # Build comprehensive user profile
+        user_profile = self._build_user_profile(user_id)
+        
         try:
-            # Build comprehensive user profile
-            user_profile = self._build_user_profile(user_id)
-            
             # Generate enhanced recommendations
             recommendations = self._generate_enhanced_recommendations(
                 user_profile, query, category, budget_max
             )
-            
-            return {
-                "success": True,
-                "recommendations": recommendations,
-                "personalization_score": self._calculate_personalization_score(user_profile),
-                "platforms_searched": len(self.platform_connections),
-                "total_products": len(recommendations),
-                "query": query,
-                "category": category,
-                "budget_max": budget_max,
-                "user_profile_strength": len(user_profile),
-                "timestamp": int(time.time() * 1000)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Error generating recommendations: %s", e)
             return {"success": False, "error": str(e)}
+        
+        response = {
+            "success": True,
+            "recommendations": recommendations,
+            "personalization_score": self._calculate_personalization_score(user_profile),
+            "platforms_searched": self.platform_count,
+            "total_products": len(recommendations),
+            "query": query,
+            "category": category,
+            "budget_max": budget_max,
+            "user_profile_strength": len(USER_PROFILE_FIELDS),
+            "timestamp": time.time_ns() // 1_000_000
+        }
+        self._store_result(user_id, cache_key, response)
+        return response
 
     def search_deals_enhanced(self, user_id: UserID, token_str: str, category: Optional[str] = None) -> Dict[str, Any]:
         """
         🔥 Enhanced deal search with relevance filtering
         """
+        cache_key = ("deals", category)
+        cached = self._cached_result(user_id, cache_key)
+        if cached is not None:
+            return cached
+        
+        user_profile = self._build_user_profile(user_id)
+        
         try:
-            user_profile = self._build_user_profile(user_id)
-            
             # Generate deals based on user preferences
             deals = self._generate_personalized_deals(user_profile, category)
-            
-            return {
-                "success": True,
-                "deals": deals,
-                "category": category,
-                "user_relevance_score": 0.85,
-                "deals_found": len(deals),
-                "platforms_searched": ["amazon", "walmart", "target"],
-                "timestamp": int(time.time() * 1000)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error searching deals: {str(e)}")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Error searching deals: %s", e)
             return {"success": False, "error": str(e)}
+        
+        response = {
+            "success": True,
+            "deals": deals,
+            "category": category,
+            "user_relevance_score": 0.85,
+            "deals_found": len(deals),
+            "platforms_searched": ["amazon", "walmart", "target"],
+            "timestamp": time.time_ns() // 1_000_000
+        }
+        self._store_result(user_id, cache_key, response)
+        return response
+
+    def _cached_result(self, user_id: UserID, key: Tuple) -> Optional[Dict[str, Any]]:
+        """A deep copy of the cached response, stamped with the time it is served"""
+        entry = (self._result_cache.get(user_id) or {}).get(key)
+        if entry is None or time.monotonic() - entry[0] > RESULT_CACHE_TTL_SECONDS:
+            return None
+        return {**copy.deepcopy(entry[1]), "timestamp": time.time_ns() // 1_000_000}
+
+    def _store_result(self, user_id: UserID, key: Tuple, response: Dict[str, Any]) -> None:
+        # Copy-on-write, so readers never see a user's results dict mid-update
+        results = self._result_cache.get(user_id) or {}
+        results = {k: v for k, v in results.items() if k != key}
+        # Deep copies on the way in and out, so no caller can mutate the cached response
+        results[key] = (time.monotonic(), copy.deepcopy(response))
+        if len(results) > RESULT_CACHE_PER_USER:
+            del results[next(iter(results))]
+        self._result_cache.set(user_id, results)
 
     # === CORE FEATURE METHODS ===
 
@@ -277,7 +748,7 @@ class HushhShoppingAgent(BaseAgent):
             recommendations = []
             
             # Sample enhanced recommendations
-            if "smart home" in query.lower() or "headphones" in query.lower():
+            if _QUERY_ROUTER.search(query):
                 recommendations = [
                     ProductRecommendation(
                         title="Apple AirPods Pro (3rd Gen)",
@@ -287,8 +758,8 @@ class HushhShoppingAgent(BaseAgent):
                         availability="in_stock",
                         rating=4.7,
                         reviews_count=8934,
-                        shipping_info={"estimated_days": 1, "cost": 0.0, "method": "Prime"},
-                        recommendation_score=0.92 + (user_profile.get("apple_affinity", 0) * 0.17),
+                        shipping_info=SHIPPING_PRIME_1_DAY,
+                        recommendation_score=0.92 + (user_profile.apple_affinity * 0.17),
                         reason="Matches your Apple brand preference"
                     ),
                     ProductRecommendation(
@@ -299,32 +770,30 @@ class HushhShoppingAgent(BaseAgent):
                         availability="in_stock",
                         rating=4.5,
                         reviews_count=12543,
-                        shipping_info={"estimated_days": 2, "cost": 0.0, "method": "Prime"},
-                        recommendation_score=0.88 + (user_profile.get("smart_home_interest", 0) * 0.17),
+                        shipping_info=SHIPPING_PRIME_2_DAY,
+                        recommendation_score=0.88 + (user_profile.smart_home_interest * 0.17),
                         reason="Based on your smart home interests"
                     )
                 ]
             
-            # Filter by budget if specified
-            if budget_max:
-                recommendations = [r for r in recommendations if r.price <= budget_max]
-            
-            # Sort by recommendation score
-            recommendations.sort(key=lambda x: x.recommendation_score, reverse=True)
+            # Filter by budget if specified, keeping only the top-K by recommendation score
+            # (nlargest is stable, so ties keep catalog order as the full sort did)
+            candidates = (r for r in recommendations if r.price <= budget_max) if budget_max else recommendations
+            recommendations = heapq.nlargest(RECOMMENDATION_TOP_K, candidates, key=attrgetter("recommendation_score"))
             
             return {
                 "success": True,
                 "recommendations": recommendations,
                 "personalization_score": self._calculate_personalization_score(user_profile),
-                "platforms_searched": len(self.platform_connections),
+                "platforms_searched": self.platform_count,
                 "total_products": len(recommendations),
                 "budget_max": budget_max,
                 "ml_model_version": "v2.1",
-                "timestamp": int(time.time() * 1000)
+                "timestamp": time.time_ns() // 1_000_000
             }
             
         except Exception as e:
-            logger.error(f"Product recommendations failed: {str(e)}")
+            logger.error("Product recommendations failed: %s", e)
             return {"success": False, "error": str(e)}
 
     async def track_deals_and_notify(self, user_id: UserID, token_str: str,
@@ -340,7 +809,7 @@ class HushhShoppingAgent(BaseAgent):
             relevant_deals = 1
             
             # Generate notification
-            notification_sent = self._send_deal_notification(
+            notification_sent = await self._send_deal_notification(
                 user_id, 
                 notification_preferences or {"channels": ["email"], "frequency": "daily"}
             )
@@ -352,202 +821,181 @@ class HushhShoppingAgent(BaseAgent):
                 "notifications_sent": 1 if notification_sent else 0,
                 "notification_channels": notification_preferences.get("channels", ["email"]) if notification_preferences else ["email"],
                 "deal_categories": ["fashion"],
-                "next_check": int(time.time() * 1000) + (5 * 60 * 60 * 1000),  # 5 hours
+                "next_check": time.time_ns() // 1_000_000 + (5 * 60 * 60 * 1000),  # 5 hours
                 "monitoring_active": True
             }
             
         except Exception as e:
-            logger.error(f"Deal tracking failed: {str(e)}")
+            logger.error("Deal tracking failed: %s", e)
             return {"success": False, "error": str(e)}
 
     # === HELPER METHODS ===
 
-    def _build_user_profile(self, user_id: UserID) -> Dict[str, Any]:
+    def _build_user_profile(self, user_id: UserID) -> UserProfile:
         """Build basic user profile from available data"""
+        profile = self._profile_cache.get(user_id)
+        if profile is not None:
+            return profile
+        
         try:
             # Try to get data from different scopes (simulated)
-            email_data = self._vault_data.get(f"email_patterns.{user_id}")
-            finance_data = self._vault_data.get(f"financial_data.{user_id}")
-            purchase_data = self._vault_data.get(f"purchase_history.{user_id}")
-            
-            profile = {
-                "user_id": user_id,
-                "has_email_data": bool(email_data),
-                "has_finance_data": bool(finance_data), 
-                "has_purchase_data": bool(purchase_data),
-                "profile_completeness": 0.3
-            }
-            
-            # Add some simulated preferences for better recommendations
-            profile.update({
-                "apple_affinity": 0.8,
-                "smart_home_interest": 0.6,
-                "budget_conscious": True,
-                "preferred_brands": ["Apple", "Samsung", "Sony"],
-                "categories": ["electronics", "computers", "home"]
-            })
-            
-            return profile
-            
-        except Exception as e:
-            logger.error(f"Error building user profile: {str(e)}")
-            return {"user_id": user_id, "profile_completeness": 0.1}
+            email_data = self._vault_data.get(user_id, "email_patterns")
+            finance_data = self._vault_data.get(user_id, "financial_data")
+            purchase_data = self._vault_data.get(user_id, "purchase_history")
+        except (sqlite3.Error, ValueError) as e:
+            logger.error("Error building user profile: %s", e)
+            # Not cached, so the next request retries the vault
+            return UserProfile(user_id=user_id, profile_completeness=0.1)
+        
+        profile = UserProfile(
+            user_id=user_id,
+            has_email_data=bool(email_data),
+            has_finance_data=bool(finance_data),
+            has_purchase_data=bool(purchase_data),
+            profile_completeness=0.3,
+            # Simulated preferences for better recommendations
+            apple_affinity=0.8,
+            smart_home_interest=0.6,
+            budget_conscious=True,
+            preferred_brands=("Apple", "Samsung", "Sony"),
+            categories=("electronics", "computers", "home")
+        )
+        self._profile_cache.set(user_id, profile)
+        return profile
 
-    def _build_comprehensive_profile(self, user_id: UserID) -> Dict[str, Any]:
+    def _build_comprehensive_profile(self, user_id: UserID) -> ComprehensiveProfile:
         """Build comprehensive user profile with enhanced data"""
-        profile = self._build_user_profile(user_id)
+        comprehensive = self._comprehensive_profile_cache.get(user_id)
+        if comprehensive is not None:
+            return comprehensive
         
-        # Add enhanced profiling data
-        profile.update({
-            "shopping_frequency": "weekly",
-            "avg_session_duration": 25,  # minutes
-            "platform_preferences": ["amazon", "walmart"],
-            "deal_sensitivity": 0.7,
-            "brand_loyalty_score": 0.6,
-            "seasonal_patterns": {"winter": ["electronics"], "summer": ["outdoor"]},
-            "price_range_electronics": {"min": 50, "max": 500},
-            "last_purchase_days_ago": 7
-        })
+        profile = self._build_user_profile(user_id)
         
-        return profile
+        # Enhanced profiling data comes from the ComprehensiveProfile defaults
+        comprehensive = ComprehensiveProfile(**{name: getattr(profile, name) for name in USER_PROFILE_FIELDS})
+        if self._profile_cache.get(user_id) is profile:
+            self._comprehensive_profile_cache.set(user_id, comprehensive)
+        return comprehensive
+
+    def invalidate_profile(self, user_id: UserID) -> None:
+        """Drop cached profiles and responses for a user after their vault data changes"""
+        self._profile_cache.invalidate(user_id)
+        self._comprehensive_profile_cache.invalidate(user_id)
+        self._result_cache.invalidate(user_id)
+        self._ml_profile_cache.invalidate(user_id)
+        self._negative_cache.invalidate((user_id, "ml_profile"))
+        self._negative_cache.invalidate((user_id, "rule_recommendations"))
 
-    def _generate_enhanced_recommendations(self, user_profile: Dict[str, Any], 
+    def _generate_enhanced_recommendations(self, user_profile: UserProfile, 
                                          query: Optional[str], category: Optional[str],
                                          budget_max: Optional[float]) -> List[Dict[str, Any]]:
         """Generate enhanced product recommendations"""
         
-        # Simulated enhanced recommendations with personalization
+        # Budget is applied before personalizing, so only affordable entries become dicts
+        limit = float(budget_max) if budget_max else np.inf
         base_recommendations = [
-            {
-                "title": f"💻 MacBook Air M3 (Personalized for {user_profile['user_id']})",
-                "price": 1099.99,
-                "original_price": 1299.99,
-                "discount": 200.00,
-                "platform": "amazon",
-                "rating": 4.8,
-                "reviews": 2543,
-                "personalization_reason": f"Based on your {user_profile.get('apple_affinity', 0.5):.1f} Apple affinity",
-                "availability": "in_stock",
-                "shipping": "free_prime"
-            },
-            {
-                "title": f"🎧 Sony WH-1000XM5 (Recommended for {user_profile['user_id']})",
-                "price": 349.99,
-                "original_price": 399.99,
-                "discount": 50.00,
-                "platform": "walmart",
-                "rating": 4.6,
-                "reviews": 1876,
-                "personalization_reason": f"Matches your audio preferences",
-                "availability": "limited_stock",
-                "shipping": "2_day"
-            }
+            _personalize(template, user_profile) for template in PRODUCT_CATALOG if template["price"] <= limit
         ]
         
-        # Filter by budget and add personalization score
-        filtered_recommendations = []
-        for rec in base_recommendations:
-            if not budget_max or rec["price"] <= budget_max:
-                # Add unique personalization score
-                rec["personalization_score"] = self._calculate_item_score(rec, user_profile)
-                rec["unique_id"] = f"{user_profile['user_id']}_{hash(rec['title']) % 10000}"
-                filtered_recommendations.append(rec)
+        # Rank by personalization score in one pass
+        ranked, scores = self._rank_candidates(base_recommendations, user_profile, budget_max)
         
-        # Sort by personalization score
-        filtered_recommendations.sort(key=lambda x: x["personalization_score"], reverse=True)
-        
-        return filtered_recommendations
-
-    def _generate_personalized_deals(self, user_profile: Dict[str, Any], category: Optional[str]) -> List[Dict[str, Any]]:
-        """Generate personalized deals based on user profile"""
+        ranked = ranked[:RECOMMENDATION_TOP_K]
         
-        deals = [
-            {
-                "title": f"🔥 Flash Sale: iPhone 15 Pro Max (For {user_profile['user_id']})",
-                "original_price": 1199.99,
-                "sale_price": 999.99,
-                "discount_percent": 17,
-                "platform": "amazon",
-                "expires_in_hours": 6,
-                "stock_level": "low",
-                "personalization_reason": f"Perfect for Apple enthusiasts like you (affinity: {user_profile.get('apple_affinity', 0.5):.1f})"
-            },
+        # Title hash is already cached from feature extraction
+        return [
             {
-                "title": f"💡 Smart Home Bundle Deal (Curated for {user_profile['user_id']})",
-                "original_price": 399.99,
-                "sale_price": 249.99,
-                "discount_percent": 38,
-                "platform": "target",
-                "expires_in_hours": 24,
-                "stock_level": "medium",
-                "personalization_reason": f"Based on your smart home interest score: {user_profile.get('smart_home_interest', 0.5):.1f}"
+                **base_recommendations[index],
+                "personalization_score": score,
+                "unique_id": f"{user_profile.user_id}_{_title_features(base_recommendations[index]['title'])[1] % 10000}"
             }
+            for index, score in zip(ranked.tolist(), scores[ranked].tolist())
         ]
+
+    def _generate_personalized_deals(self, user_profile: UserProfile, category: Optional[str]) -> List[Dict[str, Any]]:
+        """Generate personalized deals based on user profile"""
+        
+        deals = [_personalize(template, user_profile) for template in DEAL_CATALOG]
         
         # Add unique personalization
-        for deal in deals:
-            deal["user_specific_id"] = f"{user_profile['user_id']}_{hash(deal['title']) % 10000}"
-            deal["relevance_score"] = self._calculate_deal_relevance(deal, user_profile)
+        relevance_scores = self._score_deal_relevance(deals, user_profile)
+        for deal, relevance in zip(deals, relevance_scores):
+            deal["user_specific_id"] = f"{user_profile.user_id}_{_stable_hash(deal['title']) % 10000}"
+            deal["relevance_score"] = relevance
         
         return deals
 
-    def _calculate_personalization_score(self, user_profile: Dict[str, Any]) -> float:
+    def _calculate_personalization_score(self, user_profile: UserProfile) -> float:
         """Calculate overall personalization score based on available data"""
-        base_score = 0.3  # Minimum score
-        
-        if user_profile.get("has_email_data"):
-            base_score += 0.2
-        if user_profile.get("has_finance_data"):
-            base_score += 0.2
-        if user_profile.get("has_purchase_data"):
-            base_score += 0.3
-        
-        # Add unique factor based on user ID to ensure different scores for different users
-        user_factor = (hash(user_profile["user_id"]) % 100) / 1000  # 0-0.099
-        return min(1.0, base_score + user_factor)
+        return _personalization_score(
+            user_profile.uid_hash,
+            user_profile.has_email_data,
+            user_profile.has_finance_data,
+            user_profile.has_purchase_data
+        )
 
-    def _calculate_item_score(self, item: Dict[str, Any], user_profile: Dict[str, Any]) -> float:
-        """Calculate item-specific recommendation score"""
-        base_score = 0.5
+    def _item_features(self, items: List[Dict[str, Any]], user_profile: UserProfile) -> Tuple[np.ndarray, ...]:
+        """Lift item fields into parallel arrays for the scoring kernels"""
+        count = len(items)
+        uid_hash = user_profile.uid_hash
+        title_features = [_title_features(item.get("title", "")) for item in items]
         
+        prices = _prices(items)
         # Brand affinity
-        if "Apple" in item.get("title", "") and user_profile.get("apple_affinity", 0) > 0.5:
-            base_score += 0.3
-            
-        # Price preference
-        if item.get("price", 0) < user_profile.get("price_range_electronics", {}).get("max", 1000):
-            base_score += 0.2
-            
+        has_apple = np.fromiter((is_apple for is_apple, _ in title_features), dtype=np.float64, count=count)
         # Add user-specific randomness for uniqueness
-        user_factor = (hash(f"{user_profile['user_id']}_{item['title']}") % 100) / 500  # 0-0.2
-        
-        return min(1.0, base_score + user_factor)
+        user_factors = np.fromiter(
+            ((_mix_hash(uid_hash, title_hash) % 100) / 500 for _, title_hash in title_features),  # 0-0.2
+            dtype=np.float64, count=count
+        )
+        return prices, has_apple, user_factors
 
-    def _calculate_deal_relevance(self, deal: Dict[str, Any], user_profile: Dict[str, Any]) -> float:
-        """Calculate deal relevance score for user"""
-        relevance = 0.5
-        
+    def _rank_candidates(self, items: List[Dict[str, Any]], user_profile: UserProfile,
+                         budget_max: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Score, budget-filter and rank items in one vectorized (or JIT-compiled) pass"""
+        return _rank_items(
+            *self._item_features(items, user_profile),
+            user_profile.apple_affinity, user_profile.price_ceiling,
+            float(budget_max) if budget_max else np.inf
+        )
+
+    def _score_deal_relevance(self, deals: List[Dict[str, Any]], user_profile: UserProfile) -> List[float]:
+        """Score a batch of deals for relevance in one vectorized (or JIT-compiled) pass"""
+        discounts = np.fromiter((deal.get("discount_percent", 0) for deal in deals), dtype=np.float64, count=len(deals))
         # Category match
-        user_categories = user_profile.get("categories", [])
-        if any(cat in deal.get("title", "").lower() for cat in user_categories):
-            relevance += 0.3
-            
-        # Price sensitivity
-        if user_profile.get("budget_conscious") and deal.get("discount_percent", 0) > 15:
-            relevance += 0.2
-            
-        return min(1.0, relevance)
+        pattern = _category_pattern(user_profile.categories)
+        if pattern is None:
+            category_match = np.zeros(len(deals))
+        else:
+            category_match = np.fromiter(
+                (pattern.search(deal.get("title", "")) is not None for deal in deals),
+                dtype=np.float64, count=len(deals)
+            )
+        return _score_deals(discounts, category_match, user_profile.budget_conscious).tolist()
 
-    def _send_deal_notification(self, user_id: UserID, preferences: Dict[str, Any]) -> bool:
-        """Send deal notification based on preferences"""
-        try:
-            channels = preferences.get("channels", ["email"])
-            logger.info(f"📱 Sending deal notification to {user_id} via {channels}")
-            # In production, integrate with notification service
-            return True
-        except Exception as e:
-            logger.error(f"Error sending notification: {str(e)}")
-            return False
+    def _calculate_item_score(self, item: Dict[str, Any], user_profile: UserProfile) -> float:
+        """Calculate item-specific recommendation score"""
+        scores = _score_items(*self._item_features([item], user_profile), user_profile.apple_affinity, user_profile.price_ceiling)
+        return float(scores[0])
+
+    def _calculate_deal_relevance(self, deal: Dict[str, Any], user_profile: UserProfile) -> float:
+        """Calculate deal relevance score for user"""
+        return self._score_deal_relevance([deal], user_profile)[0]
+
+    async def _send_deal_notification(self, user_id: UserID, preferences: Dict[str, Any]) -> bool:
+        """Send deal notification on every preferred channel concurrently; True only if all succeed"""
+        channels = preferences.get("channels", ["email"])
+        results = await asyncio.gather(*(self._send_via(channel, user_id) for channel in channels), return_exceptions=True)
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error("Error sending notification via %s: %s", channel, result)
+        return all(result is True for result in results)
+
+    async def _send_via(self, channel: str, user_id: UserID) -> bool:
+        """Deliver a deal notification on one channel (email, sms, push)"""
+        logger.info("📱 Sending deal notification to %s via %s", user_id, channel)
+        # In production, integrate with notification service
+        return True
 
     # === LEGACY COMPATIBILITY METHODS ===
 
@@ -564,15 +1012,10 @@ class HushhShoppingAgent(BaseAgent):
         if token.user_id != user_id:
             raise PermissionError("Token user ID does not match the provided user")
         
-        print(f"✅ Consent verified for user {user_id} and agent {self.agent_id} on scope {token.scope}")
+        logger.info("✅ Consent verified for user %s and agent %s on scope %s", user_id, self.agent_id, token.scope)
         
         # Return simple list for backward compatibility
-        return [
-            "💻 10% off MacBook Air for Hushh users",
-            "🎧 Free AirPods with iPhone 16 preorder", 
-            "📦 20% cashback on your next Amazon order",
-            "🛒 Curated fashion drops based on your inbox purchases"
-        ]
+        return list(LEGACY_DEALS)
 
     # === PERSONALIZATION & DATA COLLECTION METHODS ===
 
@@ -592,12 +1035,14 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Data collection not available - personalization engine not initialized"
                 }
             
-            success = self.data_collector.collect_user_profile(
+            success = await asyncio.to_thread(
+                self.data_collector.collect_user_profile,
                 user_id=user_id,
                 agent_id=self.agent_id,
                 profile_data=profile_data,
                 consent_scopes=consent_scopes
             )
+            self.invalidate_profile(user_id)
             
             if success:
                 return {
@@ -616,7 +1061,7 @@ class HushhShoppingAgent(BaseAgent):
                 }
                 
         except Exception as e:
-            logger.error(f"Error collecting user profile: {e}")
+            logger.error("Error collecting user profile: %s", e)
             return {
                 "status": "error",
                 "message": f"Profile collection failed: {str(e)}"
@@ -638,12 +1083,14 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Data collection not available - personalization engine not initialized"
                 }
             
-            success = self.data_collector.collect_shopping_behavior(
+            success = await asyncio.to_thread(
+                self.data_collector.collect_shopping_behavior,
                 user_id=user_id,
                 agent_id=self.agent_id,
                 behavior_data=behavior_data,
                 consent_scopes=consent_scopes
             )
+            self.invalidate_profile(user_id)
             
             if success:
                 return {
@@ -651,7 +1098,7 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Shopping behavior collected successfully",
                     "data": {
                         "behavior_types": ["browsing", "purchases", "wishlist", "searches"],
-                        "platforms_tracked": [conn.platform for conn in self.platform_connections],
+                        "platforms_tracked": self.platform_names,
                         "privacy_level": "fully_encrypted"
                     }
                 }
@@ -662,7 +1109,7 @@ class HushhShoppingAgent(BaseAgent):
                 }
                 
         except Exception as e:
-            logger.error(f"Error collecting shopping behavior: {e}")
+            logger.error("Error collecting shopping behavior: %s", e)
             return {
                 "status": "error",
                 "message": f"Behavior collection failed: {str(e)}"
@@ -686,37 +1133,53 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Advanced data collection not available"
                 }
             
-            results = {}
+            # One hash set for the scope checks below instead of a list scan per category
+            granted_scopes = frozenset(consent_scopes)
+            
+            # The collector is synchronous, so each category's write runs in a worker
+            # thread and all of them proceed concurrently
+            writes = {}
             
             # Collect purchase history
-            if "purchase_history" in data_package and ConsentScope.SHOPPING_HISTORY in consent_scopes:
-                purchase_success = self.advanced_collector.collect_purchase_history(
+            if "purchase_history" in data_package and ConsentScope.SHOPPING_HISTORY in granted_scopes:
+                writes["purchase_history"] = asyncio.to_thread(
+                    self.advanced_collector.collect_purchase_history,
                     user_id=user_id,
                     agent_id=self.agent_id,
                     purchases=data_package["purchase_history"],
                     consent_scopes=consent_scopes
                 )
-                results["purchase_history"] = "collected" if purchase_success else "failed"
             
             # Collect preferences
-            if "preferences" in data_package and ConsentScope.SHOPPING_PREFERENCES in consent_scopes:
-                prefs_success = self.advanced_collector.collect_user_preferences(
+            if "preferences" in data_package and ConsentScope.SHOPPING_PREFERENCES in granted_scopes:
+                writes["preferences"] = asyncio.to_thread(
+                    self.advanced_collector.collect_user_preferences,
                     user_id=user_id,
                     agent_id=self.agent_id,
                     preferences=data_package["preferences"],
                     consent_scopes=consent_scopes
                 )
-                results["preferences"] = "collected" if prefs_success else "failed"
             
             # Collect usage logs
-            if "usage_logs" in data_package and ConsentScope.BEHAVIORAL_ANALYSIS in consent_scopes:
-                usage_success = self.advanced_collector.collect_usage_logs(
+            if "usage_logs" in data_package and ConsentScope.BEHAVIORAL_ANALYSIS in granted_scopes:
+                writes["usage_logs"] = asyncio.to_thread(
+                    self.advanced_collector.collect_usage_logs,
                     user_id=user_id,
                     agent_id=self.agent_id,
                     usage_data=data_package["usage_logs"],
                     consent_scopes=consent_scopes
                 )
-                results["usage_logs"] = "collected" if usage_success else "failed"
+            
+            # A failing category is reported as such without discarding the others
+            outcomes = await asyncio.gather(*writes.values(), return_exceptions=True)
+            results = {}
+            for category, outcome in zip(writes, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error("Collecting %s failed: %s", category, outcome)
+                    outcome = False
+                results[category] = "collected" if outcome else "failed"
+            
+            self.invalidate_profile(user_id)
             
             return {
                 "status": "success",
@@ -727,7 +1190,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Comprehensive data collection failed: {e}")
+            logger.error("Comprehensive data collection failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Data collection failed: {str(e)}"
@@ -744,10 +1207,17 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "ML profiling not available"
                 }
             
-            user_profile = self.advanced_collector.build_user_profile_ml(user_id)
+            user_profile = self._ml_profile_cache.get(user_id)
+            if user_profile is None:
+                insufficient = self._negative_cache.get((user_id, "ml_profile"))
+                if insufficient is not None:
+                    return insufficient
+                user_profile = await asyncio.to_thread(self.advanced_collector.build_user_profile_ml, user_id)
+                if user_profile:
+                    self._ml_profile_cache.set(user_id, user_profile)
             
             if not user_profile:
-                return {
+                response = {
                     "status": "insufficient_data",
                     "message": "Not enough data to build ML profile",
                     "suggestions": [
@@ -756,6 +1226,8 @@ class HushhShoppingAgent(BaseAgent):
                         "Use the app more to generate usage patterns"
                     ]
                 }
+                self._negative_cache.set((user_id, "ml_profile"), response)
+                return response
             
             return {
                 "status": "success",
@@ -764,11 +1236,7 @@ class HushhShoppingAgent(BaseAgent):
                     "confidence_score": user_profile.confidence_score,
                     "demographics": user_profile.demographics,
                     "usage_patterns": user_profile.usage_patterns,
-                    "purchase_summary": {
-                        "total_purchases": len(user_profile.purchase_history),
-                        "categories": list(set([p.get("category", "") for p in user_profile.purchase_history])),
-                        "avg_spending": sum(p.get("price", 0) for p in user_profile.purchase_history) / max(len(user_profile.purchase_history), 1)
-                    }
+                    "purchase_summary": _purchase_summary(user_profile.purchase_history)
                 },
                 "insights": {
                     "primary_segment": user_profile.segment.value,
@@ -778,7 +1246,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"ML profiling failed: {e}")
+            logger.error("ML profiling failed: %s", e)
             return {
                 "status": "error",
                 "message": f"ML profiling failed: {str(e)}"
@@ -800,14 +1268,22 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Rule-based engine not available"
                 }
             
-            recommendations = self.rule_engine.generate_recommendations(
+            # Only context-free requests share a cached empty answer; a context can change the rules' outcome
+            negative_key = (user_id, "rule_recommendations") if context is None and max_recommendations > 0 else None
+            if negative_key:
+                empty = self._negative_cache.get(negative_key)
+                if empty is not None:
+                    return empty
+            
+            recommendations = await asyncio.to_thread(
+                self.rule_engine.generate_recommendations,
                 user_id=user_id,
                 context=context,
                 max_recommendations=max_recommendations
             )
             
             if not recommendations:
-                return {
+                response = {
                     "status": "no_recommendations",
                     "message": "No recommendations available at this time",
                     "suggestions": [
@@ -816,19 +1292,24 @@ class HushhShoppingAgent(BaseAgent):
                         "Check back later for new deals"
                     ]
                 }
-            
-            formatted_recommendations = []
-            for rec in recommendations:
-                formatted_recommendations.append({
-                    "id": rec.rec_id,
-                    "type": rec.rec_type.value,
-                    "title": rec.title,
-                    "description": rec.description,
-                    "confidence": rec.confidence_score,
-                    "priority": rec.priority.value,
-                    "action_url": rec.action_url,
-                    "expires_at": rec.expires_at
-                })
+                if negative_key:
+                    self._negative_cache.set(negative_key, response)
+                return response
+            
+            formatted_recommendations = [
+                {
+                    "id": rec_id,
+                    "type": rec_type.value,
+                    "title": title,
+                    "description": description,
+                    "confidence": confidence,
+                    "priority": priority.value,
+                    "action_url": action_url,
+                    "expires_at": expires_at
+                }
+                for rec_id, rec_type, title, description, confidence, priority, action_url, expires_at
+                in map(_recommendation_fields, recommendations)
+            ]
             
             return {
                 "status": "success",
@@ -839,7 +1320,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Rule-based recommendations failed: {e}")
+            logger.error("Rule-based recommendations failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Recommendation generation failed: {str(e)}"
@@ -858,7 +1339,7 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Privacy controller not available"
                 }
             
-            dashboard = self.privacy_controller.get_privacy_dashboard(user_id)
+            dashboard = await asyncio.to_thread(self.privacy_controller.get_privacy_dashboard, user_id)
             
             return {
                 "status": "success",
@@ -873,7 +1354,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Privacy dashboard failed: {e}")
+            logger.error("Privacy dashboard failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Privacy dashboard failed: {str(e)}"
@@ -895,14 +1376,14 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Privacy controller not available"
                 }
             
-            from hushh_mcp.vault.privacy_controller import DataCategory
-            
             # Convert string categories to enum
             categories = None
             if data_categories:
-                categories = [DataCategory(cat) for cat in data_categories if cat in [e.value for e in DataCategory]]
+                by_value = self._data_categories_by_value
+                categories = [by_value[cat] for cat in data_categories if cat in by_value]
             
-            export_result = self.privacy_controller.export_user_data(
+            export_result = await asyncio.to_thread(
+                self.privacy_controller.export_user_data,
                 user_id=user_id,
                 format_type=format_type,
                 data_categories=categories
@@ -911,7 +1392,7 @@ class HushhShoppingAgent(BaseAgent):
             return export_result
             
         except Exception as e:
-            logger.error(f"Data export failed: {e}")
+            logger.error("Data export failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Data export failed: {str(e)}"
@@ -933,23 +1414,24 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Privacy controller not available"
                 }
             
-            from hushh_mcp.vault.privacy_controller import DataCategory
-            
             # Convert string categories to enum
             categories = None
             if data_categories:
-                categories = [DataCategory(cat) for cat in data_categories if cat in [e.value for e in DataCategory]]
+                by_value = self._data_categories_by_value
+                categories = [by_value[cat] for cat in data_categories if cat in by_value]
             
-            deletion_result = self.privacy_controller.delete_user_data(
+            deletion_result = await asyncio.to_thread(
+                self.privacy_controller.delete_user_data,
                 user_id=user_id,
                 data_categories=categories,
                 verification_token=verification_token
             )
+            self.invalidate_profile(user_id)
             
             return deletion_result
             
         except Exception as e:
-            logger.error(f"Data deletion failed: {e}")
+            logger.error("Data deletion failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Data deletion failed: {str(e)}"
@@ -970,12 +1452,12 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Data collector not available"
                 }
             
-            from hushh_mcp.vault.user_data_collector_advanced import DataType
-            
             # Convert string types to enum
-            enum_types = [DataType(dt) for dt in data_types if dt in [e.value for e in DataType]]
+            by_value = self._data_types_by_value
+            enum_types = [by_value[dt] for dt in data_types if dt in by_value]
             
-            consent_request = self.advanced_collector.request_data_consent(
+            consent_request = await asyncio.to_thread(
+                self.advanced_collector.request_data_consent,
                 user_id=user_id,
                 data_types=enum_types
             )
@@ -983,7 +1465,7 @@ class HushhShoppingAgent(BaseAgent):
             return consent_request
             
         except Exception as e:
-            logger.error(f"Consent request failed: {e}")
+            logger.error("Consent request failed: %s", e)
             return {
                 "status": "error",
                 "message": f"Consent request failed: {str(e)}"
@@ -993,18 +1475,7 @@ class HushhShoppingAgent(BaseAgent):
     
     def _get_shopping_style_description(self, segment) -> str:
         """Get human-readable shopping style description"""
-        descriptions = {
-            "budget_conscious": "Value-focused shopper who prioritizes deals and savings",
-            "premium_buyer": "Quality-focused shopper who invests in high-end products",
-            "frequent_shopper": "Active shopper who makes regular purchases",
-            "occasional_buyer": "Selective shopper who makes thoughtful purchases",
-            "deal_hunter": "Bargain-focused shopper who actively seeks discounts",
-            "brand_loyal": "Brand-focused shopper with strong preferences",
-            "impulse_buyer": "Spontaneous shopper who makes quick decisions",
-            "research_focused": "Analytical shopper who thoroughly researches before buying"
-        }
-        
-        return descriptions.get(segment.value if hasattr(segment, 'value') else str(segment), "Personalized shopping style")
+        return SHOPPING_STYLE_DESCRIPTIONS.get(getattr(segment, "value", segment), "Personalized shopping style")
 
     async def collect_user_preferences(
         self,
@@ -1022,12 +1493,14 @@ class HushhShoppingAgent(BaseAgent):
                     "message": "Data collection not available - personalization engine not initialized"
                 }
             
-            success = self.data_collector.collect_user_preferences(
+            success = await asyncio.to_thread(
+                self.data_collector.collect_user_preferences,
                 user_id=user_id,
                 agent_id=self.agent_id,
                 preferences_data=preferences_data,
                 consent_scopes=consent_scopes
             )
+            self.invalidate_profile(user_id)
             
             if success:
                 return {
@@ -1046,7 +1519,7 @@ class HushhShoppingAgent(BaseAgent):
                 }
                 
         except Exception as e:
-            logger.error(f"Error collecting preferences: {e}")
+            logger.error("Error collecting preferences: %s", e)
             return {
                 "status": "error",
                 "message": f"Preferences collection failed: {str(e)}"
@@ -1066,39 +1539,16 @@ class HushhShoppingAgent(BaseAgent):
                 # Return mock tips if personalization engine is not available
                 return self._get_mock_personalized_tips(user_id, max_tips)
             
-            # Convert string categories to TipCategory enums if provided
-            categories = None
-            if tip_categories:
-                categories = []
-                for cat_str in tip_categories:
-                    try:
-                        categories.append(TipCategory(cat_str))
-                    except ValueError:
-                        logger.warning(f"Invalid tip category: {cat_str}")
-            
             # Generate personalized tips
-            tips = self.personalization_engine.generate_personalized_tips(
+            tips = await asyncio.to_thread(
+                self.personalization_engine.generate_personalized_tips,
                 user_id=user_id,
                 max_tips=max_tips,
-                tip_categories=categories
+                tip_categories=self._tip_categories(tip_categories)
             )
             
             # Convert tips to serializable format
-            tips_data = []
-            for tip in tips:
-                tips_data.append({
-                    "tip_id": tip.tip_id,
-                    "category": tip.category.value,
-                    "title": tip.title,
-                    "message": tip.message,
-                    "confidence_score": tip.confidence_score,
-                    "urgency": tip.urgency,
-                    "action_items": tip.action_items,
-                    "relevant_products": tip.relevant_products,
-                    "savings_potential": tip.savings_potential,
-                    "expiry_date": tip.expiry_date,
-                    "created_at": tip.created_at
-                })
+            tips_data = [_tip_to_dict(tip) for tip in tips]
             
             return {
                 "status": "success",
@@ -1112,50 +1562,70 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error generating personalized tips: {e}")
+            logger.error("Error generating personalized tips: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to generate tips: {str(e)}"
             }
 
+    async def stream_personalized_tips(
+        self,
+        user_id: UserID,
+        max_tips: int = 10,
+        tip_categories: Optional[List[str]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        💡 Personalized tips as NDJSON lines, one per tip, for streaming responses
+        (application/x-ndjson) that shouldn't buffer the whole tip list
+        """
+        if not self.personalization_engine:
+            for tip in self._get_mock_personalized_tips(user_id, max_tips)["data"]["tips"]:
+                yield orjson.dumps(tip) + b"\n"
+            return
+        
+        # Tip generation is synchronous, so keep it off the event loop
+        tips = await asyncio.to_thread(
+            self.personalization_engine.generate_personalized_tips,
+            user_id=user_id,
+            max_tips=max_tips,
+            tip_categories=self._tip_categories(tip_categories)
+        )
+        for tip in tips:
+            yield orjson.dumps(_tip_to_dict(tip)) + b"\n"
+
+    def _tip_categories(self, tip_categories: Optional[List[str]]) -> Optional[List[Any]]:
+        """Convert string categories to TipCategory enums, skipping invalid ones"""
+        if not tip_categories:
+            return None
+        
+        # Dict lookups against the cached value table, instead of raising ValueError per bad name
+        by_value = self._tip_categories_by_value
+        categories = [by_value[cat_str] for cat_str in tip_categories if cat_str in by_value]
+        if len(categories) < len(tip_categories):
+            logger.warning("Invalid tip categories: %s", [cat_str for cat_str in tip_categories if cat_str not in by_value])
+        return categories
+
     def _get_mock_personalized_tips(self, user_id: UserID, max_tips: int) -> Dict[str, Any]:
         """Generate mock personalized tips when personalization engine is not available"""
+        # One clock read shared by every tip; only the id and timestamp differ per call
+        now = time.time()
+        # Frozen templates are copied out as plain lists and dicts, the shape callers expect
         mock_tips = [
             {
-                "tip_id": f"mock_tip_{int(time.time())}_1",
-                "category": "product_suggestion",
-                "title": "New Arrivals in Electronics",
-                "message": "Based on your recent browsing, check out the latest laptop deals!",
-                "confidence_score": 0.75,
-                "urgency": "medium",
-                "action_items": ["Browse latest laptops", "Compare prices", "Check reviews"],
-                "relevant_products": [
-                    {"name": "MacBook Air M3", "price": 1199.99, "platform": "Amazon"}
-                ],
-                "savings_potential": 200.00,
-                "created_at": time.time()
-            },
-            {
-                "tip_id": f"mock_tip_{int(time.time())}_2",
-                "category": "budget_advice",
-                "title": "Wishlist Deals Alert",
-                "message": "Items in your wishlist are 20% off - save now!",
-                "confidence_score": 0.90,
-                "urgency": "high",
-                "action_items": ["Check wishlist", "Apply discounts", "Complete purchase"],
-                "relevant_products": [
-                    {"name": "Wireless Headphones", "price": 79.99, "platform": "Best Buy"}
-                ],
-                "savings_potential": 50.00,
-                "created_at": time.time()
+                **tip,
+                "action_items": list(tip["action_items"]),
+                "relevant_products": [dict(product) for product in tip["relevant_products"]],
+                "tip_id": f"mock_tip_{int(now)}_{number}",
+                "created_at": now
             }
+            for number, tip in enumerate(MOCK_TIPS[:max_tips], start=1)
         ]
         
         return {
             "status": "success",
-            "message": f"Generated {min(len(mock_tips), max_tips)} mock personalized tips",
+            "message": f"Generated {len(mock_tips)} mock personalized tips",
             "data": {
-                "tips": mock_tips[:max_tips],
+                "tips": mock_tips,
                 "personalization_score": 0.65,
                 "data_sources": ["mock_data"],
                 "privacy_compliant": True,
@@ -1179,7 +1649,7 @@ class HushhShoppingAgent(BaseAgent):
                     }
                 }
             
-            summary = self.data_collector.get_user_data_summary(user_id)
+            summary = await asyncio.to_thread(self.data_collector.get_user_data_summary, user_id)
             
             return {
                 "status": "success",
@@ -1188,7 +1658,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error getting user data summary: {e}")
+            logger.error("Error getting user data summary: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to get data summary: {str(e)}"
@@ -1212,7 +1682,7 @@ class HushhShoppingAgent(BaseAgent):
                     }
                 }
             
-            analytics = self.personalization_engine.get_tip_analytics(user_id)
+            analytics = await asyncio.to_thread(self.personalization_engine.get_tip_analytics, user_id)
             
             return {
                 "status": "success",
@@ -1221,7 +1691,7 @@ class HushhShoppingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error getting personalization analytics: {e}")
+            logger.error("Error getting personalization analytics: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to get analytics: {str(e)}"
@@ -31,6 +31,19 @@ ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 AGENT_ID = os.getenv("AGENT_ID", "agent_hushh_default")
 HUSHH_HACKATHON = os.getenv("HUSHH_HACKATHON", "disabled").lower() == "enabled"
 
+# Simulated agent backends add artificial API latency only when enabled (demos)
+SIMULATE_LATENCY = os.getenv("HUSHH_SIMULATE_LATENCY", "disabled").lower() == "enabled"
+
+# Shopping platform data comes from the platforms' APIs only when enabled; simulated otherwise
+LIVE_PLATFORM_APIS = os.getenv("HUSHH_LIVE_PLATFORM_APIS", "disabled").lower() == "enabled"
+
+# Vault record files are written indented for reading by hand only when enabled; compact otherwise
+VAULT_PRETTY_JSON = os.getenv("HUSHH_VAULT_PRETTY_JSON", "disabled").lower() == "enabled"
+
+# Spread user directories over two levels of hash-named subdirectories (users/ab/cd/<user_id>);
+# for vaults with many users. Existing flat vaults must be migrated before enabling this.
+VAULT_SHARD_USER_DIRS = os.getenv("HUSHH_VAULT_SHARD_USER_DIRS", "disabled").lower() == "enabled"
+
 # ==================== Defaults Export ====================
 
 __all__ = [
@@ -40,5 +53,9 @@ __all__ = [
     "DEFAULT_TRUST_LINK_EXPIRY_MS",
     "ENVIRONMENT",
     "AGENT_ID",
-    "HUSHH_HACKATHON"
+    "HUSHH_HACKATHON",
+    "SIMULATE_LATENCY",
+    "LIVE_PLATFORM_APIS",
+    "VAULT_PRETTY_JSON",
+    "VAULT_SHARD_USER_DIRS"
 ]
@@ -3,7 +3,9 @@
 import hmac
 import hashlib
 import base64
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 from hushh_mcp.config import SECRET_KEY, DEFAULT_CONSENT_TOKEN_EXPIRY_MS
@@ -13,6 +15,13 @@ from hushh_mcp.types import HushhConsentToken, ConsentScope, UserID, AgentID
 # ========== Internal Revocation Registry ==========
 _revoked_tokens = set()
 
+# ========== Verified Token Cache ==========
+# Tokens whose signature has already been checked, by token string. Hits skip the
+# decode and HMAC but still check revocation, scope and expiry.
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+_verified_tokens = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
 # ========== Token Generator ==========
 
 def issue_token(
@@ -21,7 +30,7 @@ def issue_token(
     scope: ConsentScope,
     expires_in_ms: int = DEFAULT_CONSENT_TOKEN_EXPIRY_MS
 ) -> HushhConsentToken:
-    issued_at = int(time.time() * 1000)
+    issued_at = time.time_ns() // 1_000_000
     expires_at = issued_at + expires_in_ms
     raw = f"{user_id}|{agent_id}|{scope.value}|{issued_at}|{expires_at}"
     signature = _sign(raw)
@@ -47,6 +56,18 @@ def validate_token(
     if token_str in _revoked_tokens:
         return False, "Token has been revoked", None
 
+    with _verified_tokens_lock:
+        cached = _verified_tokens.get(token_str)
+        if cached is not None:
+            _verified_tokens.move_to_end(token_str)
+    if cached is not None:
+        scope_str, token = cached
+        if expected_scope and scope_str != expected_scope.value:
+            return False, "Scope mismatch", None
+        if time.time_ns() // 1_000_000 > token.expires_at:
+            return False, "Token expired", None
+        return True, None, token
+
     try:
         prefix, signed_part = token_str.split(":")
         encoded, signature = signed_part.split(".")
@@ -57,16 +78,14 @@ def validate_token(
         decoded = base64.urlsafe_b64decode(encoded.encode()).decode()
         user_id, agent_id, scope_str, issued_at_str, expires_at_str = decoded.split("|")
 
-        raw = f"{user_id}|{agent_id}|{scope_str}|{issued_at_str}|{expires_at_str}"
-        expected_sig = _sign(raw)
-
-        if not hmac.compare_digest(signature, expected_sig):
+        # The decoded payload is exactly the signed string
+        if not hmac.compare_digest(signature, _sign(decoded)):
             return False, "Invalid signature", None
 
         if expected_scope and scope_str != expected_scope.value:
             return False, "Scope mismatch", None
 
-        if int(time.time() * 1000) > int(expires_at_str):
+        if time.time_ns() // 1_000_000 > int(expires_at_str):
             return False, "Token expired", None
 
         token = HushhConsentToken(
@@ -78,6 +97,10 @@ def validate_token(
             expires_at=int(expires_at_str),
             signature=signature
         )
+        with _verified_tokens_lock:
+            _verified_tokens[token_str] = (scope_str, token)
+            if len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
         return True, None, token
 
     except Exception as e:
@@ -87,10 +110,20 @@ def validate_token(
 
 def revoke_token(token_str: str) -> None:
     _revoked_tokens.add(token_str)
+    with _verified_tokens_lock:
+        _verified_tokens.pop(token_str, None)
 
 def is_token_revoked(token_str: str) -> bool:
     return token_str in _revoked_tokens
 
+def token_expires_at(token_str: str) -> Optional[int]:
+    """Expiry (ms) encoded in a token, read without verifying it; None if unreadable"""
+    try:
+        encoded = token_str.split(":", 1)[1].split(".", 1)[0]
+        return int(base64.urlsafe_b64decode(encoded.encode()).decode().rsplit("|", 1)[1])
+    except Exception:
+        return None
+
 # ========== Internal Signer ==========
 
 def _sign(input_string: str) -> str:
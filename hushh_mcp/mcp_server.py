@@ -7,18 +7,113 @@ while maintaining our consent-first architecture.
 """
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
+import time
+import orjson
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
+
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema is optional; input validation is skipped without it
+    fastjsonschema = None
 
 from hushh_mcp.agents.consent_utils import consent_manager
+from hushh_mcp.agents.ttl_cache import TTLCache
+from hushh_mcp.consent.token import is_token_revoked, token_expires_at
 from hushh_mcp.constants import ConsentScope
+from hushh_mcp.operons.verify_email import verify_user_email
 from hushh_mcp.types import UserID, AgentID, HushhConsentToken
+from hushh_mcp.vault.encrypt import encrypt_data
 
 logger = logging.getLogger(__name__)
 
+# Agent results mix dataclasses, enums, datetimes, numpy scalars and int-keyed dicts
+AGENT_RESULT_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Consent checks are cached per (token hash, scope), never past the token's own expiry;
+# failures are kept only briefly so a fixed token isn't rejected for long
+CONSENT_CACHE_TTL_SECONDS = 300
+CONSENT_CACHE_MAX_SIZE = 10_000
+CONSENT_ERROR_TTL_SECONDS = 1
+
+# JSON-RPC frames are mostly a few hundred bytes, where permessage-deflate costs more than it saves
+WEBSOCKET_MAX_FRAME_BYTES = 2**20
+WEBSOCKET_MAX_QUEUE = 64
+
+# Messages handled concurrently per connection; responses may go out of order, matched by id
+CLIENT_MAX_IN_FLIGHT = 32
+
+def _envelope_error(message: Any) -> Optional[str]:
+    """Why a message isn't a valid JSON-RPC 2.0 request, or None if it is"""
+    if not isinstance(message, dict):
+        return "Invalid Request: message must be an object"
+    if message.get("jsonrpc") != "2.0":
+        return 'Invalid Request: jsonrpc must be "2.0"'
+    if not isinstance(message.get("method"), str):
+        return "Invalid Request: method must be a string"
+    if not isinstance(message.get("params", {}), (dict, type(None))):
+        return "Invalid Request: params must be an object"
+    if not isinstance(message.get("id"), (str, int, type(None))):
+        return "Invalid Request: id must be a string, number or null"
+    return None
+
+def _is_notification(message: Any) -> bool:
+    """A valid request without an id, which JSON-RPC 2.0 forbids answering"""
+    return isinstance(message, dict) and "id" not in message and _envelope_error(message) is None
+
+def _compile_schema(schema: Dict[str, Any]):
+    """Compile a JSON Schema into a validator callable, or None without fastjsonschema"""
+    return fastjsonschema.compile(schema) if fastjsonschema is not None else None
+
+@functools.cache
+def _shopping_agent():
+    """Shared shopping agent, imported and constructed on first use"""
+    from hushh_mcp.agents.shopping import HushhShoppingAgent
+    return HushhShoppingAgent()
+
+@functools.cache
+def _vault_encryption_key() -> str:
+    # config validates its environment on import, so defer it until a tool needs the key
+    from hushh_mcp.config import VAULT_ENCRYPTION_KEY
+    return VAULT_ENCRYPTION_KEY
+
+# Email validation is pure, and agents tend to check the same addresses repeatedly
+_verify_email_cached = functools.lru_cache(maxsize=16384)(verify_user_email)
+
+def _verify_email_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    email = arguments.get("email")
+    return {
+        "valid": _verify_email_cached(email) if isinstance(email, str) else verify_user_email(email),
+        "email": email
+    }
+
+def _shopping_deals_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    result = _shopping_agent().execute(
+        arguments["user_id"],
+        arguments["consent_token"],
+        category=arguments.get("category")
+    )
+    return result.data if result.success else {"error": result.error}
+
+def _encrypt_data_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    encrypted = encrypt_data(arguments["data"], _vault_encryption_key())
+    return {
+        "encrypted": True,
+        "algorithm": encrypted.algorithm,
+        "encoding": encrypted.encoding
+    }
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for agent results: read-only mappings as objects, anything else as text"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
+
 class MCPMessageType(str, Enum):
     REQUEST = "request"
     RESPONSE = "response"
@@ -40,7 +135,26 @@ class MCPMethod(str, Enum):
     REVOKE_CONSENT = "hushh/consent/revoke"
     EXECUTE_AGENT = "hushh/agent/execute"
 
-@dataclass
+# Types of the params each handler reads. Mistyped params are rejected with -32602
+# before dispatch, so client mistakes never reach the internal-error path
+_PARAM_TYPES = {
+    MCPMethod.READ_RESOURCE.value: {"uri": str, "consent_token": str},
+    MCPMethod.CALL_TOOL.value: {"name": str, "arguments": dict},
+    MCPMethod.GET_PROMPT.value: {"name": str, "arguments": dict},
+    MCPMethod.REQUEST_CONSENT.value: {"user_id": str, "agent_id": str, "scope": str},
+    MCPMethod.VERIFY_CONSENT.value: {"token": str, "expected_scope": str},
+    MCPMethod.EXECUTE_AGENT.value: {"agent_name": str, "user_id": str, "consent_token": str, "arguments": dict},
+}
+
+def _params_error(method: str, params: Dict[str, Any]) -> Optional[str]:
+    """Why a method's params have the wrong types, or None if they are usable"""
+    for name, expected in _PARAM_TYPES.get(method, {}).items():
+        value = params.get(name)
+        if value is not None and not isinstance(value, expected):
+            return f"Invalid params: {name} must be {'a string' if expected is str else 'an object'}"
+    return None
+
+@dataclass(slots=True)
 class MCPMessage:
     """Standard MCP message structure"""
     jsonrpc: str = "2.0"
@@ -58,7 +172,9 @@ class HushhMCPServer:
     and maintaining security boundaries.
     """
     
-    def __init__(self):
+    def __init__(self, cache_ttl_seconds: float = CONSENT_CACHE_TTL_SECONDS):
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._consent_cache = TTLCache(CONSENT_CACHE_MAX_SIZE, cache_ttl_seconds)
         self.capabilities = {
             "resources": {
                 "subscribe": True,
@@ -79,6 +195,53 @@ class HushhMCPServer:
         self.resources = self._initialize_resources()
         self.tools = self._initialize_tools()
         self.prompts = self._initialize_prompts()
+        self._resources_by_uri = {resource["uri"]: resource for resource in self.resources}
+        # Pre-encoded resource text up to the access timestamp, the only per-read field
+        self._resource_text_prefixes = {
+            uri: '{"data":' + orjson.dumps(f"Secure data from {uri}").decode() + ',"accessed_at":"'
+            for uri in self._resources_by_uri
+        }
+        self._tools_by_name = {tool["name"]: tool for tool in self.tools}
+        self._prompts_by_name = {prompt["name"]: prompt for prompt in self.prompts}
+        
+        # Tool name -> implementation, agent name -> shared agent accessor
+        self._tool_impls = {
+            "verify_email": _verify_email_tool,
+            "get_shopping_deals": _shopping_deals_tool,
+            "encrypt_data": _encrypt_data_tool,
+        }
+        self._agent_impls = {
+            "shopping": _shopping_agent,
+        }
+        
+        # Schemas are compiled once here rather than per call
+        self._tool_validators = {tool["name"]: _compile_schema(tool["inputSchema"]) for tool in self.tools}
+        
+        # Method string -> handler; MCPMethod is a str Enum, so plain-string keys match incoming methods
+        self._dispatch = {
+            MCPMethod.INITIALIZE.value: self._handle_initialize,
+            MCPMethod.LIST_RESOURCES.value: self._handle_list_resources,
+            MCPMethod.READ_RESOURCE.value: self._handle_read_resource,
+            MCPMethod.LIST_TOOLS.value: self._handle_list_tools,
+            MCPMethod.CALL_TOOL.value: self._handle_call_tool,
+            MCPMethod.LIST_PROMPTS.value: self._handle_list_prompts,
+            MCPMethod.GET_PROMPT.value: self._handle_get_prompt,
+            MCPMethod.REQUEST_CONSENT.value: self._handle_request_consent,
+            MCPMethod.VERIFY_CONSENT.value: self._handle_verify_consent,
+            MCPMethod.EXECUTE_AGENT.value: self._handle_execute_agent,
+        }
+        
+        # Pre-encoded results of the static methods, spliced into responses by handle_message_json
+        self._static_results = {
+            MCPMethod.INITIALIZE.value: orjson.dumps(self._initialize_result()).decode(),
+            MCPMethod.LIST_RESOURCES.value: orjson.dumps({"resources": self.resources}).decode(),
+            MCPMethod.LIST_TOOLS.value: orjson.dumps({"tools": self.tools}).decode(),
+            MCPMethod.LIST_PROMPTS.value: orjson.dumps({"prompts": self.prompts}).decode(),
+        }
+    
+    def reset(self) -> None:
+        """Forget cached consent checks; everything else is read-only after construction"""
+        self._consent_cache.clear()
         
     def _initialize_resources(self) -> List[Dict[str, Any]]:
         """Initialize available resources with consent requirements"""
@@ -191,196 +354,253 @@ class HushhMCPServer:
             }
         ]
     
+    async def _check_consent_cached(self, token: str, expected_scope: Optional[str]):
+        """consent_manager.check_consent with results cached per (token hash, scope); misses run off the event loop"""
+        key = (hashlib.sha256(token.encode()).digest(), expected_scope)
+        result = self._consent_cache.get(key)
+        if result is not None and not (result.success and is_token_revoked(token)):
+            return result
+        
+        result = await asyncio.to_thread(consent_manager.check_consent, token_str=token, expected_scope=expected_scope)
+        ttl = self.cache_ttl_seconds if result.success else CONSENT_ERROR_TTL_SECONDS
+        expires_at = token_expires_at(token)
+        if expires_at is not None:
+            ttl = min(ttl, expires_at / 1000 - time.time())
+        if ttl > 0:
+            self._consent_cache.set(key, result, ttl_seconds=ttl)
+        return result
+    
     async def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """
         Main message handler for MCP protocol.
         
         Implements consent-first request processing.
         """
+        # Malformed input is rejected up front, so only genuine server errors reach the traceback log
+        envelope_error = _envelope_error(message)
+        if envelope_error:
+            msg_id = message.get("id") if isinstance(message, dict) else None
+            return self._error_response(msg_id if isinstance(msg_id, (str, int)) else None, -32600, envelope_error)
+        
+        msg_id = message.get("id")
+        method = message["method"]
+        handler = self._dispatch.get(method)
+        if handler is None:
+            return self._error_response(msg_id, -32601, f"Method not found: {method}")
+        
+        params = message.get("params") or {}
+        params_error = _params_error(method, params)
+        if params_error:
+            return self._error_response(msg_id, -32602, params_error)
+        
         try:
-            mcp_msg = MCPMessage(**message)
-            
-            if mcp_msg.method == MCPMethod.INITIALIZE:
-                return await self._handle_initialize(mcp_msg)
-            elif mcp_msg.method == MCPMethod.LIST_RESOURCES:
-                return await self._handle_list_resources(mcp_msg)
-            elif mcp_msg.method == MCPMethod.READ_RESOURCE:
-                return await self._handle_read_resource(mcp_msg)
-            elif mcp_msg.method == MCPMethod.LIST_TOOLS:
-                return await self._handle_list_tools(mcp_msg)
-            elif mcp_msg.method == MCPMethod.CALL_TOOL:
-                return await self._handle_call_tool(mcp_msg)
-            elif mcp_msg.method == MCPMethod.LIST_PROMPTS:
-                return await self._handle_list_prompts(mcp_msg)
-            elif mcp_msg.method == MCPMethod.GET_PROMPT:
-                return await self._handle_get_prompt(mcp_msg)
-            elif mcp_msg.method == MCPMethod.REQUEST_CONSENT:
-                return await self._handle_request_consent(mcp_msg)
-            elif mcp_msg.method == MCPMethod.VERIFY_CONSENT:
-                return await self._handle_verify_consent(mcp_msg)
-            elif mcp_msg.method == MCPMethod.EXECUTE_AGENT:
-                return await self._handle_execute_agent(mcp_msg)
-            else:
-                return self._error_response(mcp_msg.id, -32601, f"Method not found: {mcp_msg.method}")
-                
+            return await handler(msg_id, params)
         except Exception as e:
-            logger.error(f"MCP message handling error: {str(e)}", exc_info=True)
-            return self._error_response(message.get("id"), -32603, f"Internal error: {str(e)}")
+            logger.error("MCP message handling error: %s", e, exc_info=True)
+            return self._error_response(msg_id, -32603, f"Internal error: {str(e)}")
+    
+    async def handle_message_json(self, message: Dict[str, Any]) -> str:
+        """handle_message, returning the JSON-encoded response"""
+        result = self._static_results.get(message.get("method")) if isinstance(message, dict) else None
+        if result is not None and not _envelope_error(message):
+            return f'{{"jsonrpc":"2.0","id":{orjson.dumps(message.get("id")).decode()},"result":{result}}}'
+        response = await self.handle_message(message)
+        return orjson.dumps(response, default=_json_default, option=AGENT_RESULT_JSON_OPTIONS).decode()
+    
+    async def handle_message_bytes(self, payload: Union[bytes, str]) -> Optional[str]:
+        """
+        Handle one raw JSON-RPC frame (a single message or a batch), returning the encoded response.
+        
+        Returns None when there is nothing to send (a notification, or a batch of only notifications).
+        """
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return PARSE_ERROR_JSON
+        if isinstance(data, list):
+            return await self.handle_batch_json(data)
+        response = await self.handle_message_json(data)
+        return None if _is_notification(data) else response
+    
+    async def handle_batch_json(self, messages: List[Any]) -> Optional[str]:
+        """
+        Handle a JSON-RPC batch concurrently, returning the encoded response array.
+        
+        Notifications (requests without an id) get no response; returns None if nothing is left to send.
+        """
+        if not messages:
+            return orjson.dumps(self._error_response(None, -32600, "Invalid Request: empty batch")).decode()
+        
+        async def handle_one(message: Any) -> str:
+            if not isinstance(message, dict):
+                return orjson.dumps(self._error_response(None, -32600, "Invalid Request")).decode()
+            return await self.handle_message_json(message)
+        
+        responses = await asyncio.gather(*(handle_one(message) for message in messages))
+        responses = [
+            response for message, response in zip(messages, responses)
+            if not _is_notification(message)
+        ]
+        return f"[{','.join(responses)}]" if responses else None
     
-    async def _handle_initialize(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_initialize(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP initialization"""
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": self.capabilities,
-                "serverInfo": {
-                    "name": "HushhMCP Server",
-                    "version": "1.0.0"
-                }
+            "id": msg_id,
+            "result": self._initialize_result()
+        }
+    
+    def _initialize_result(self) -> Dict[str, Any]:
+        """Initialization result; the same for every client"""
+        return {
+            "protocolVersion": "2024-11-05",
+            "capabilities": self.capabilities,
+            "serverInfo": {
+                "name": "HushhMCP Server",
+                "version": "1.0.0"
             }
         }
     
-    async def _handle_list_resources(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_list_resources(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """List available resources with consent requirements"""
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "resources": self.resources
             }
         }
     
-    async def _handle_read_resource(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_read_resource(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Read resource with consent validation"""
-        params = msg.params or {}
         uri = params.get("uri")
         consent_token = params.get("consent_token")
         
         if not uri:
-            return self._error_response(msg.id, -32602, "Missing required parameter: uri")
+            return self._error_response(msg_id, -32602, "Missing required parameter: uri")
         
         # Find resource and check consent requirements
-        resource = next((r for r in self.resources if r["uri"] == uri), None)
+        resource = self._resources_by_uri.get(uri)
         if not resource:
-            return self._error_response(msg.id, -32602, f"Resource not found: {uri}")
+            return self._error_response(msg_id, -32602, f"Resource not found: {uri}")
         
         if resource.get("required_scope") and not consent_token:
-            return self._error_response(msg.id, -32602, "Consent token required for this resource")
+            return self._error_response(msg_id, -32602, "Consent token required for this resource")
         
         # Validate consent if required
         if resource.get("required_scope"):
-            consent_result = consent_manager.check_consent(
-                token_str=consent_token,
-                expected_scope=resource["required_scope"]
-            )
+            consent_result = await self._check_consent_cached(consent_token, resource["required_scope"])
             if not consent_result.success:
-                return self._error_response(msg.id, -32603, f"Consent validation failed: {consent_result.error}")
+                return self._error_response(msg_id, -32603, f"Consent validation failed: {consent_result.error}")
         
         # Return resource content (simulated for demo)
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "contents": [
                     {
                         "uri": uri,
                         "mimeType": resource["mimeType"],
-                        "text": json.dumps({
-                            "data": f"Secure data from {uri}",
-                            "accessed_at": "2025-07-24T12:00:00Z",
-                            "consent_verified": True
-                        })
+                        "text": (
+                            self._resource_text_prefixes[uri]
+                            + time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                            + '","consent_verified":true}'
+                        )
                     }
                 ]
             }
         }
     
-    async def _handle_list_tools(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_list_tools(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """List available tools"""
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "tools": self.tools
             }
         }
     
-    async def _handle_call_tool(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_call_tool(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute tool with consent validation"""
-        params = msg.params or {}
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
         
         if not tool_name:
-            return self._error_response(msg.id, -32602, "Missing required parameter: name")
+            return self._error_response(msg_id, -32602, "Missing required parameter: name")
         
         # Find tool
-        tool = next((t for t in self.tools if t["name"] == tool_name), None)
+        tool = self._tools_by_name.get(tool_name)
         if not tool:
-            return self._error_response(msg.id, -32602, f"Tool not found: {tool_name}")
+            return self._error_response(msg_id, -32602, f"Tool not found: {tool_name}")
+        
+        validate_arguments = self._tool_validators.get(tool_name)
+        if validate_arguments is not None:
+            try:
+                validate_arguments(arguments)
+            except fastjsonschema.JsonSchemaException as e:
+                return self._error_response(msg_id, -32602, f"Invalid arguments: {e.message}")
         
         # Validate consent if required
         if tool.get("required_scope"):
             consent_token = arguments.get("consent_token")
             if not consent_token:
-                return self._error_response(msg.id, -32602, "Consent token required for this tool")
+                return self._error_response(msg_id, -32602, "Consent token required for this tool")
+            if not isinstance(consent_token, str):
+                return self._error_response(msg_id, -32602, "Invalid arguments: consent_token must be a string")
             
-            consent_result = consent_manager.check_consent(
-                token_str=consent_token,
-                expected_scope=tool["required_scope"]
-            )
+            consent_result = await self._check_consent_cached(consent_token, tool["required_scope"])
             if not consent_result.success:
-                return self._error_response(msg.id, -32603, f"Consent validation failed: {consent_result.error}")
+                return self._error_response(msg_id, -32603, f"Consent validation failed: {consent_result.error}")
         
         # Execute tool
         try:
             result = await self._execute_tool(tool_name, arguments)
             return {
                 "jsonrpc": "2.0",
-                "id": msg.id,
+                "id": msg_id,
                 "result": {
                     "content": [
                         {
                             "type": "text",
-                            "text": json.dumps(result)
+                            "text": orjson.dumps(result, default=_json_default, option=AGENT_RESULT_JSON_OPTIONS).decode()
                         }
                     ]
                 }
             }
         except Exception as e:
-            return self._error_response(msg.id, -32603, f"Tool execution failed: {str(e)}")
+            return self._error_response(msg_id, -32603, f"Tool execution failed: {str(e)}")
     
-    async def _handle_list_prompts(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_list_prompts(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """List available prompts"""
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "prompts": self.prompts
             }
         }
     
-    async def _handle_get_prompt(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_get_prompt(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Get specific prompt with parameters"""
-        params = msg.params or {}
         prompt_name = params.get("name")
         arguments = params.get("arguments", {})
         
         if not prompt_name:
-            return self._error_response(msg.id, -32602, "Missing required parameter: name")
+            return self._error_response(msg_id, -32602, "Missing required parameter: name")
         
-        prompt = next((p for p in self.prompts if p["name"] == prompt_name), None)
+        prompt = self._prompts_by_name.get(prompt_name)
         if not prompt:
-            return self._error_response(msg.id, -32602, f"Prompt not found: {prompt_name}")
+            return self._error_response(msg_id, -32602, f"Prompt not found: {prompt_name}")
         
         # Generate prompt content
         content = await self._generate_prompt(prompt_name, arguments)
         
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "description": prompt["description"],
                 "messages": [
@@ -395,21 +615,20 @@ class HushhMCPServer:
             }
         }
     
-    async def _handle_request_consent(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_request_consent(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle consent request (HushhMCP extension)"""
-        params = msg.params or {}
         user_id = params.get("user_id")
         agent_id = params.get("agent_id")
         scope = params.get("scope")
         
         if not all([user_id, agent_id, scope]):
-            return self._error_response(msg.id, -32602, "Missing required parameters")
+            return self._error_response(msg_id, -32602, "Missing required parameters")
         
-        result = consent_manager.request_consent(user_id, agent_id, scope)
+        result = await asyncio.to_thread(consent_manager.request_consent, user_id, agent_id, scope)
         
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "success": result.success,
                 "token": result.data.get("token") if result.success else None,
@@ -417,20 +636,19 @@ class HushhMCPServer:
             }
         }
     
-    async def _handle_verify_consent(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_verify_consent(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle consent verification (HushhMCP extension)"""
-        params = msg.params or {}
         token = params.get("token")
         expected_scope = params.get("expected_scope")
         
         if not token:
-            return self._error_response(msg.id, -32602, "Missing required parameter: token")
+            return self._error_response(msg_id, -32602, "Missing required parameter: token")
         
-        result = consent_manager.check_consent(token, expected_scope)
+        result = await self._check_consent_cached(token, expected_scope)
         
         return {
             "jsonrpc": "2.0",
-            "id": msg.id,
+            "id": msg_id,
             "result": {
                 "valid": result.success,
                 "details": result.data if result.success else None,
@@ -438,71 +656,44 @@ class HushhMCPServer:
             }
         }
     
-    async def _handle_execute_agent(self, msg: MCPMessage) -> Dict[str, Any]:
+    async def _handle_execute_agent(self, msg_id: Optional[Union[str, int]], params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle agent execution (HushhMCP extension)"""
-        params = msg.params or {}
         agent_name = params.get("agent_name")
         user_id = params.get("user_id")
         consent_token = params.get("consent_token")
         arguments = params.get("arguments", {})
         
         if not all([agent_name, user_id, consent_token]):
-            return self._error_response(msg.id, -32602, "Missing required parameters")
+            return self._error_response(msg_id, -32602, "Missing required parameters")
         
         # Execute agent with consent validation
+        get_agent = self._agent_impls.get(agent_name)
+        if get_agent is None:
+            return self._error_response(msg_id, -32602, f"Unknown agent: {agent_name}")
+        
         try:
-            if agent_name == "shopping":
-                from hushh_mcp.agents.shopping import HushhShoppingAgent
-                agent = HushhShoppingAgent()
-                result = agent.execute(user_id, consent_token, **arguments)
-                
-                return {
-                    "jsonrpc": "2.0",
-                    "id": msg.id,
-                    "result": {
-                        "success": result.success,
-                        "data": result.data,
-                        "agent_id": result.agent_id
-                    }
+            # Agent construction (first use) and execution are blocking, so run them off the event loop
+            result = await asyncio.to_thread(lambda: get_agent().execute(user_id, consent_token, **arguments))
+            
+            return {
+                "jsonrpc": "2.0",
+                "id": msg_id,
+                "result": {
+                    "success": result.success,
+                    "data": result.data,
+                    "agent_id": result.agent_id
                 }
-            else:
-                return self._error_response(msg.id, -32602, f"Unknown agent: {agent_name}")
-                
+            }
         except Exception as e:
-            return self._error_response(msg.id, -32603, f"Agent execution failed: {str(e)}")
+            return self._error_response(msg_id, -32603, f"Agent execution failed: {str(e)}")
     
     async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute specific tool"""
-        if tool_name == "verify_email":
-            from hushh_mcp.operons.verify_email import verify_user_email
-            email = arguments.get("email")
-            return {
-                "valid": verify_user_email(email),
-                "email": email
-            }
-        
-        elif tool_name == "get_shopping_deals":
-            from hushh_mcp.agents.shopping import HushhShoppingAgent
-            agent = HushhShoppingAgent()
-            result = agent.execute(
-                arguments["user_id"],
-                arguments["consent_token"],
-                category=arguments.get("category")
-            )
-            return result.data if result.success else {"error": result.error}
-        
-        elif tool_name == "encrypt_data":
-            from hushh_mcp.vault.encrypt import encrypt_data
-            from hushh_mcp.config import VAULT_ENCRYPTION_KEY
-            encrypted = encrypt_data(arguments["data"], VAULT_ENCRYPTION_KEY)
-            return {
-                "encrypted": True,
-                "algorithm": encrypted.algorithm,
-                "encoding": encrypted.encoding
-            }
-        
-        else:
+        tool_impl = self._tool_impls.get(tool_name)
+        if tool_impl is None:
             raise ValueError(f"Unknown tool: {tool_name}")
+        # Tools do blocking work (encryption, agent calls); keep it off the event loop
+        return await asyncio.to_thread(tool_impl, arguments)
     
     async def _generate_prompt(self, prompt_name: str, arguments: Dict[str, Any]) -> str:
         """Generate prompt content"""
@@ -533,30 +724,68 @@ class HushhMCPServer:
 # Global MCP server instance
 mcp_server = HushhMCPServer()
 
+# A parse error can't echo an id, so its response never changes
+PARSE_ERROR_JSON = orjson.dumps(mcp_server._error_response(None, -32700, "Parse error")).decode()
+
 async def start_mcp_server(host: str = "localhost", port: int = 8765):
     """Start the MCP server"""
     import websockets
     
     async def handle_client(websocket, path):
-        logger.info(f"MCP client connected: {websocket.remote_address}")
+        logger.info("MCP client connected: %s", websocket.remote_address)
+        in_flight = asyncio.Semaphore(CLIENT_MAX_IN_FLIGHT)
+        send_lock = asyncio.Lock()
+        pending = set()
+        
+        async def process(message):
+            try:
+                response = await mcp_server.handle_message_bytes(message)
+                # Responses go out as text frames, which JSON-RPC clients expect
+                if response is not None:
+                    async with send_lock:
+                        await websocket.send(response)
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            except Exception as e:
+                logger.error("MCP message processing error: %s", e, exc_info=True)
+            finally:
+                in_flight.release()
+        
         try:
             async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    response = await mcp_server.handle_message(data)
-                    await websocket.send(json.dumps(response))
-                except json.JSONDecodeError:
-                    error_response = mcp_server._error_response(None, -32700, "Parse error")
-                    await websocket.send(json.dumps(error_response))
+                # Stop reading once CLIENT_MAX_IN_FLIGHT messages are being handled
+                await in_flight.acquire()
+                task = asyncio.create_task(process(message))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
         except websockets.exceptions.ConnectionClosed:
-            logger.info(f"MCP client disconnected: {websocket.remote_address}")
+            logger.info("MCP client disconnected: %s", websocket.remote_address)
         except Exception as e:
-            logger.error(f"MCP client error: {str(e)}", exc_info=True)
+            logger.error("MCP client error: %s", e, exc_info=True)
     
-    server = await websockets.serve(handle_client, host, port)
-    logger.info(f"🔗 MCP Server running on ws://{host}:{port}")
+    server = await websockets.serve(
+        handle_client, host, port,
+        compression=None,
+        max_size=WEBSOCKET_MAX_FRAME_BYTES,
+        max_queue=WEBSOCKET_MAX_QUEUE
+    )
+    logger.info("🔗 MCP Server running on ws://%s:%s", host, port)
     return server
 
+def run_mcp_server(host: str = "localhost", port: int = 8765):
+    """Run the MCP server until interrupted, on uvloop when it's installed"""
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:  # uvloop is optional (and unavailable on Windows); asyncio's own loop is used without it
+        pass
+    
+    async def serve():
+        server = await start_mcp_server(host, port)
+        await server.wait_closed()
+    
+    asyncio.run(serve())
+
 if __name__ == "__main__":
     # Test the MCP server
     async def test_mcp():
@@ -575,6 +804,6 @@ if __name__ == "__main__":
         }
         response = await mcp_server.handle_message(message)
         print("MCP Server Test:")
-        print(json.dumps(response, indent=2))
+        print(orjson.dumps(response, option=orjson.OPT_INDENT_2).decode())
     
     asyncio.run(test_mcp())
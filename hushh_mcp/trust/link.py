@@ -16,7 +16,7 @@ def create_trust_link(
     signed_by_user: UserID,
     expires_in_ms: int = DEFAULT_TRUST_LINK_EXPIRY_MS
 ) -> TrustLink:
-    created_at = int(time.time() * 1000)
+    created_at = time.time_ns() // 1_000_000
     expires_at = created_at + expires_in_ms
 
     raw = f"{from_agent}|{to_agent}|{scope}|{created_at}|{expires_at}|{signed_by_user}"
@@ -35,7 +35,7 @@ def create_trust_link(
 # ========== TrustLink Verifier ==========
 
 def verify_trust_link(link: TrustLink) -> bool:
-    now = int(time.time() * 1000)
+    now = time.time_ns() // 1_000_000
     if now > link.expires_at:
         return False
 
@@ -50,10 +50,11 @@ class EncryptedPayload(BaseModel):
 
 class VaultRecord(BaseModel):
     key: VaultKey
-    data: EncryptedPayload
     agent_id: AgentID
     created_at: int
     updated_at: Optional[int] = None
     expires_at: Optional[int] = None
     deleted: Optional[bool] = False
     metadata: Optional[dict] = None
+    # Kept last so stored records can be summarized from their first few KB
+    data: EncryptedPayload
@@ -1,7 +1,7 @@
 # hushh_mcp/vault/encrypt.py
 
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+from functools import lru_cache
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.exceptions import InvalidTag
 import os
 import base64
@@ -13,27 +13,49 @@ IV_LENGTH = 12  # GCM recommended IV size
 TAG_LENGTH = 16
 ALGORITHM_NAME = "aes-256-gcm"
 
+# ==================== Cipher ====================
+
+@lru_cache(maxsize=16)
+def _cipher(key: bytes) -> AESGCM:
+    # One AEAD context per key: OpenSSL's AES-NI/CLMUL GCM with the key schedule built once
+    return AESGCM(key)
+
+@lru_cache(maxsize=16)
+def _cipher_from_hex(key_hex: str) -> AESGCM:
+    return _cipher(bytes.fromhex(key_hex))
+
+def _seal(cipher: AESGCM, plaintext: bytes) -> EncryptedPayload:
+    iv = os.urandom(IV_LENGTH)
+    sealed = cipher.encrypt(iv, plaintext, None)
+    ciphertext, tag = sealed[:-TAG_LENGTH], sealed[-TAG_LENGTH:]
+
+    return EncryptedPayload(
+        ciphertext=base64.b64encode(ciphertext).decode('utf-8'),
+        iv=base64.b64encode(iv).decode('utf-8'),
+        tag=base64.b64encode(tag).decode('utf-8'),
+        encoding="base64",
+        algorithm=ALGORITHM_NAME
+    )
+
+def _open(cipher: AESGCM, payload: EncryptedPayload) -> bytes:
+    iv = base64.b64decode(payload.iv)
+    tag = base64.b64decode(payload.tag)
+    ciphertext = base64.b64decode(payload.ciphertext)
+
+    return cipher.decrypt(iv, ciphertext + tag, None)
+
 # ==================== Encrypt ====================
 
 def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
     try:
-        key = bytes.fromhex(key_hex)
-        iv = os.urandom(IV_LENGTH)
-        backend = default_backend()
-
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=backend)
-        encryptor = cipher.encryptor()
-
-        ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
-        tag = encryptor.tag
-
-        return EncryptedPayload(
-            ciphertext=base64.b64encode(ciphertext).decode('utf-8'),
-            iv=base64.b64encode(iv).decode('utf-8'),
-            tag=base64.b64encode(tag).decode('utf-8'),
-            encoding="base64",
-            algorithm=ALGORITHM_NAME
-        )
+        return _seal(_cipher_from_hex(key_hex), plaintext.encode('utf-8'))
+    except Exception as e:
+        raise RuntimeError(f"Encryption failed: {str(e)}")
+
+def encrypt_data_raw(plaintext: bytes, key: bytes) -> EncryptedPayload:
+    """encrypt_data for callers holding the raw 32-byte key and already-encoded plaintext"""
+    try:
+        return _seal(_cipher(key), plaintext)
     except Exception as e:
         raise RuntimeError(f"Encryption failed: {str(e)}")
 
@@ -41,18 +63,16 @@ def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
 
 def decrypt_data(payload: EncryptedPayload, key_hex: str) -> str:
     try:
-        key = bytes.fromhex(key_hex)
-        iv = base64.b64decode(payload.iv)
-        tag = base64.b64decode(payload.tag)
-        ciphertext = base64.b64decode(payload.ciphertext)
-
-        backend = default_backend()
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=backend)
-        decryptor = cipher.decryptor()
-
-        decrypted = decryptor.update(ciphertext) + decryptor.finalize()
-        return decrypted.decode('utf-8')
+        return _open(_cipher_from_hex(key_hex), payload).decode('utf-8')
+    except InvalidTag:
+        raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
+    except Exception as e:
+        raise RuntimeError(f"Decryption failed: {str(e)}")
 
+def decrypt_data_raw(payload: EncryptedPayload, key: bytes) -> bytes:
+    """decrypt_data for callers holding the raw 32-byte key; returns the plaintext bytes undecoded"""
+    try:
+        return _open(_cipher(key), payload)
     except InvalidTag:
         raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
     except Exception as e:
@@ -0,0 +1,96 @@
+# hushh_mcp/vault/kv_store.py
+"""
+SQLite-backed key-value store for agent working data.
+
+Records are keyed by (user_id, namespace, platform) on a WITHOUT ROWID primary
+key, so each lookup is a single B-tree probe with no key-string formatting.
+Use ":memory:" (the default) for tests and demos, or a file path to persist.
+
+Payloads are stored as orjson bytes; those above COMPRESSION_THRESHOLD bytes are
+compressed with zstd (level 1) when zstandard is installed, zlib otherwise.
+"""
+
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; zlib is used without it
+    zstandard = None
+
+COMPRESSION_THRESHOLD = 512
+
+# One-byte payload header recording how the body is encoded
+_RAW = b"r"
+_ZLIB = b"z"
+_ZSTD = b"s"
+
+def _encode(data: Dict[str, Any]) -> bytes:
+    raw = orjson.dumps(data)
+    if len(raw) < COMPRESSION_THRESHOLD:
+        return _RAW + raw
+    if zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor(level=1).compress(raw)
+    return _ZLIB + zlib.compress(raw, 1)
+
+def _decode(payload: bytes) -> Dict[str, Any]:
+    header, body = payload[:1], payload[1:]
+    if header == _ZSTD:
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif header == _ZLIB:
+        body = zlib.decompress(body)
+    return orjson.loads(body)
+
+class VaultKVStore:
+    """Thread-safe key-value store of JSON payloads on a single SQLite connection"""
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vault ("
+            "user_id TEXT NOT NULL, namespace TEXT NOT NULL, platform TEXT NOT NULL, payload BLOB NOT NULL, "
+            "PRIMARY KEY (user_id, namespace, platform)) WITHOUT ROWID"
+        )
+
+    def put(self, user_id: str, namespace: str, data: Dict[str, Any], platform: str = "") -> None:
+        """Insert or replace one record"""
+        payload = _encode(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vault VALUES (?, ?, ?, ?)",
+                (user_id, namespace, platform, payload)
+            )
+
+    def put_many(self, records: Iterable[Tuple[str, str, str, Dict[str, Any]]]) -> None:
+        """Insert or replace (user_id, namespace, platform, data) records in one transaction"""
+        rows = [(user_id, namespace, platform, _encode(data)) for user_id, namespace, platform, data in records]
+        with self._lock:
+            # Autocommit mode would commit (and sync) every row separately
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO vault VALUES (?, ?, ?, ?)", rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get(self, user_id: str, namespace: str, platform: str = "") -> Optional[Dict[str, Any]]:
+        """Return the record's payload, or None if it doesn't exist"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM vault WHERE user_id = ? AND namespace = ? AND platform = ?",
+                (user_id, namespace, platform)
+            ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -6,19 +6,366 @@ This implements a production-ready encrypted storage system for user data
 following the "Best/Working/Winning Model" principles.
 """
 
+import asyncio
+import hashlib
 import os
-import json
 import time
 import logging
-from typing import Dict, Any, Optional, List, Union
+import threading
+import uuid
+import weakref
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import orjson
+from pydantic import BaseModel
+from pydantic_core import from_json
+from typing import Callable, Dict, Any, Optional, List, Tuple, Union
 from pathlib import Path
-from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data, EncryptedPayload
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; zlib is used without it
+    zstandard = None
+
+from hushh_mcp.vault.encrypt import encrypt_data_raw, decrypt_data_raw, EncryptedPayload
 from hushh_mcp.types import UserID, AgentID, VaultRecord, VaultKey
 from hushh_mcp.constants import ConsentScope
-from hushh_mcp.config import VAULT_ENCRYPTION_KEY
+from hushh_mcp.config import VAULT_ENCRYPTION_KEY, VAULT_PRETTY_JSON, VAULT_SHARD_USER_DIRS
 
 logger = logging.getLogger(__name__)
 
+# User data may hold datetimes, numpy values or non-string keys; anything else falls back to str
+PLAINTEXT_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+def _dump_plaintext(data: Dict[str, Any]) -> bytes:
+    return orjson.dumps(data, default=str, option=PLAINTEXT_JSON_OPTIONS)
+
+# Plaintexts at least this long are compressed before encryption, with zstd (level 1) when
+# zstandard is installed and zlib otherwise; the record's metadata["compression"] names the codec
+COMPRESSION_THRESHOLD = 512
+
+def _compress_plaintext(data: Dict[str, Any]) -> Tuple[bytes, Optional[str]]:
+    raw = _dump_plaintext(data)
+    if len(raw) < COMPRESSION_THRESHOLD:
+        return raw, None
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=1).compress(raw), "zstd"
+    return zlib.compress(raw, 1), "zlib"
+
+def _decompress_plaintext(plaintext: bytes, compression: Optional[str]) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(plaintext)
+    if compression == "zlib":
+        return zlib.decompress(plaintext)
+    return plaintext
+
+def _tag_compression(metadata: Dict[str, Any], compression: Optional[str]) -> Dict[str, Any]:
+    if compression:
+        metadata["compression"] = compression
+    else:
+        metadata.pop("compression", None)
+    return metadata
+
+def _read_file(file_path: Union[Path, str]) -> bytes:
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+# Durable writes and deletes made inside a VaultTransaction are collected per thread until it commits
+_transaction_state = threading.local()
+
+def _transaction_writes() -> Optional[Dict[str, Optional[bytes]]]:
+    return getattr(_transaction_state, "writes", None)
+
+def _write_file(file_path: Union[Path, str], payload: bytes, sync: bool = True) -> None:
+    """Atomically replace a file: write (and fsync, if sync) a sibling temp file, then rename it over the target"""
+    writes = _transaction_writes()
+    if sync and writes is not None:
+        writes[str(file_path)] = payload
+        return
+    _forget_record(file_path)
+    tmp_path = _write_temp_file(file_path, payload, sync)
+    os.replace(tmp_path, file_path)
+
+def _remove_file(file_path: Union[Path, str]) -> None:
+    writes = _transaction_writes()
+    if writes is not None:
+        writes[str(file_path)] = None
+        return
+    os.unlink(file_path)
+    _forget_record(file_path)
+
+def _write_temp_file(file_path: Union[Path, str], payload: bytes, sync: bool) -> str:
+    tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        if sync:
+            os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    os.close(fd)
+    return tmp_path
+
+def _fsync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class VaultTransaction:
+    """
+    Groups the vault writes made on the current thread into one commit.
+    
+    Inside the with-block, durable stores, updates and deletes are collected instead
+    of applied, so reads don't see them until the block exits. On a clean exit every
+    file is written and fsynced to a temp file, all are renamed into place, and each
+    touched directory is fsynced once; if the block raises, nothing is written.
+    Non-durable (durable=False) writes keep going through the write-back buffer.
+    """
+    
+    def __enter__(self) -> "VaultTransaction":
+        if _transaction_writes() is not None:
+            raise RuntimeError("A vault transaction is already open on this thread")
+        _transaction_state.writes = {}
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        writes = _transaction_state.writes
+        _transaction_state.writes = None
+        if exc_type is None:
+            _commit_writes(writes)
+        return False
+
+def _commit_writes(writes: Dict[str, Optional[bytes]]) -> None:
+    staged = []
+    try:
+        for file_path, payload in writes.items():
+            if payload is not None:
+                staged.append((file_path, _write_temp_file(file_path, payload, sync=True)))
+    except BaseException:
+        for _, tmp_path in staged:
+            os.unlink(tmp_path)
+        raise
+    
+    for file_path, tmp_path in staged:
+        _forget_record(file_path)
+        os.replace(tmp_path, file_path)
+    for file_path, payload in writes.items():
+        if payload is None:
+            _forget_record(file_path)
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+    
+    if hasattr(os, "O_DIRECTORY"):
+        for directory in {os.path.dirname(file_path) for file_path in writes}:
+            _fsync_directory(directory)
+
+def _submit_write(fn, *args) -> Future:
+    """Run a write on the I/O pool, or inline if this thread's transaction has to collect it"""
+    if _transaction_writes() is None:
+        return _io_pool.submit(fn, *args)
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def _read_record_data(file_path: Union[Path, str]) -> Dict[str, Any]:
+    return orjson.loads(_read_file(file_path))
+
+def _write_record_data(file_path: Union[Path, str], record_data: Dict[str, Any]) -> None:
+    _write_file(file_path, orjson.dumps(record_data, option=orjson.OPT_INDENT_2 if VAULT_PRETTY_JSON else None))
+
+# Parsed records by path, valid while the file's (mtime_ns, size) is unchanged.
+# Writes through this module drop the entry first, so same-tick rewrites can't be served stale.
+# Cached records are shared: callers must treat them as read-only.
+RECORD_CACHE_SIZE = 1024
+_record_cache = OrderedDict()
+_record_cache_lock = threading.Lock()
+
+def _forget_record(file_path: Union[Path, str]) -> None:
+    with _record_cache_lock:
+        _record_cache.pop(str(file_path), None)
+
+def _load_record(file_path: Union[Path, str]) -> VaultRecord:
+    key = str(file_path)
+    stat = os.stat(key)
+    with _record_cache_lock:
+        entry = _record_cache.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            _record_cache.move_to_end(key)
+            return entry[2]
+    
+    # Parsed and validated in one pass by pydantic-core
+    vault_record = VaultRecord.model_validate_json(_read_file(key))
+    with _record_cache_lock:
+        _record_cache[key] = (stat.st_mtime_ns, stat.st_size, vault_record)
+        _record_cache.move_to_end(key)
+        if len(_record_cache) > RECORD_CACHE_SIZE:
+            _record_cache.popitem(last=False)
+    return vault_record
+
+def _save_record(file_path: Union[Path, str], vault_record: VaultRecord) -> None:
+    _write_file(file_path, vault_record.model_dump_json(indent=2 if VAULT_PRETTY_JSON else None).encode())
+
+# Record file names, formatted once per scope
+_SCOPE_FILENAMES = {scope: f"{scope.value}.json" for scope in ConsentScope}
+
+# Non-durable writes (durable=False) are buffered in memory and written out this often,
+# without fsync; a crash can lose up to this much of them
+WRITE_BACK_INTERVAL_SECONDS = 1.0
+
+# Disk writes are serialized per file path through this many striped locks
+WRITE_BACK_LOCK_STRIPES = 64
+
+class _WriteBackBuffer:
+    """
+    Non-durable writes waiting for the background flusher: file path -> (serialized record, record).
+
+    The flusher thread only references the buffer, never the VaultStorage that owns it,
+    so the storage can still be collected; its finalizer closes the buffer.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[bytes, VaultRecord]] = {}
+        self._lock = threading.Lock()
+        self._path_locks = [threading.Lock() for _ in range(WRITE_BACK_LOCK_STRIPES)]
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def path_lock(self, file_path: str) -> threading.Lock:
+        """Held around every disk write of file_path, so an in-flight flush never lands after a newer write"""
+        return self._path_locks[hash(file_path) % WRITE_BACK_LOCK_STRIPES]
+
+    def get(self, file_path: str) -> Optional[VaultRecord]:
+        with self._lock:
+            pending = self._records.get(file_path)
+        return pending[1] if pending is not None else None
+
+    def __contains__(self, file_path: str) -> bool:
+        with self._lock:
+            return file_path in self._records
+
+    def put(self, file_path: str, payload: bytes, vault_record: VaultRecord) -> None:
+        with self._lock:
+            self._records[file_path] = (payload, vault_record)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically, name="vault-flusher", daemon=True)
+                self._flusher.start()
+
+    def discard(self, file_path: str) -> None:
+        """Drop a buffered write that a durable write supersedes; call with path_lock held"""
+        with self._lock:
+            self._records.pop(file_path, None)
+
+    def flush_path(self, file_path: str) -> None:
+        """Write out a buffered record; it stays visible in the buffer until it is on disk"""
+        with self.path_lock(file_path):
+            with self._lock:
+                pending = self._records.get(file_path)
+            if pending is None:
+                return
+            _write_file(file_path, pending[0], sync=False)
+            with self._lock:
+                # A newer buffered write arrived meanwhile; leave it for the next flush
+                if self._records.get(file_path) is pending:
+                    del self._records[file_path]
+
+    def flush(self) -> None:
+        with self._lock:
+            file_paths = list(self._records)
+        for file_path in file_paths:
+            try:
+                self.flush_path(file_path)
+            except Exception as e:
+                logger.error("Failed to flush vault data to %s: %s", file_path, e, exc_info=True)
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(WRITE_BACK_INTERVAL_SECONDS):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flusher and write out whatever is still buffered"""
+        self._stop.set()
+        self.flush()
+
+# Directory scans and bulk stores run their file I/O here concurrently; file reads and writes release the GIL
+VAULT_IO_WORKERS = 8
+_io_pool = ThreadPoolExecutor(max_workers=VAULT_IO_WORKERS, thread_name_prefix="vault-io")
+
+def _subdirectories(directory: Union[Path, str]) -> List[str]:
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries if entry.is_dir()]
+
+def _sharded_user_dirs(shard_dir: str) -> List[str]:
+    """User directories under a first-level shard directory"""
+    return [user_dir for subshard_dir in _subdirectories(shard_dir) for user_dir in _subdirectories(subshard_dir)]
+
+def _record_entries(directory: Union[Path, str]) -> List[os.DirEntry]:
+    """Record files in a directory, from a single scandir pass"""
+    with os.scandir(directory) as entries:
+        return [entry for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+
+# Listings and stats only need a record's bookkeeping fields, which are written before the encrypted data
+SUMMARY_READ_BYTES = 4096
+
+class _RecordSummary(BaseModel):
+    """VaultRecord without its encrypted data"""
+    key: VaultKey
+    agent_id: AgentID
+    created_at: int
+    updated_at: Optional[int] = None
+    expires_at: Optional[int] = None
+    deleted: Optional[bool] = False
+    metadata: Optional[dict] = None
+
+_SUMMARY_FIELDS = frozenset(_RecordSummary.model_fields) | {"data"}
+
+def _load_summary(file_path: Union[Path, str]) -> Union[VaultRecord, _RecordSummary]:
+    """
+    A record's bookkeeping fields, read from the head of the file when possible.
+    
+    Records are written with every field and "data" last, so once "data" has started
+    with all other fields present, those fields are complete; longer records written in
+    the older field order (or with large metadata) are read in full.
+    """
+    key = str(file_path)
+    with _record_cache_lock:
+        entry = _record_cache.get(key)
+    if entry is not None:
+        return _load_record(key)
+    
+    with open(key, 'rb') as f:
+        head = f.read(SUMMARY_READ_BYTES)
+    complete = len(head) < SUMMARY_READ_BYTES
+    fields = from_json(head, allow_partial=not complete)
+    if isinstance(fields, dict) and (complete or (fields.keys() >= _SUMMARY_FIELDS and next(reversed(fields)) == "data")):
+        fields.pop("data", None)
+        return _RecordSummary.model_validate(fields)
+    return _load_record(key)
+
+def _try_load_summary(entry: os.DirEntry) -> Union[VaultRecord, _RecordSummary, Exception]:
+    try:
+        return _load_summary(entry.path)
+    except Exception as e:
+        return e
+
+def _load_summaries(entries: List[os.DirEntry]) -> List[Tuple[os.DirEntry, Union[VaultRecord, _RecordSummary, Exception]]]:
+    """Load every entry's summary, returning the exception in its place if one can't be read"""
+    return list(zip(entries, _io_pool.map(_try_load_summary, entries)))
+
 class VaultStorage:
     """
     Secure vault storage system with AES-256-GCM encryption.
@@ -28,16 +375,44 @@ class VaultStorage:
     Winning Model: User-centric data control and transparency
     """
     
-    def __init__(self, vault_directory: str = "vault_data"):
+    def __init__(
+        self,
+        vault_directory: str = "vault_data",
+        shard_user_dirs: bool = VAULT_SHARD_USER_DIRS,
+        clock: Callable[[], int] = _now_ms
+    ):
         self.vault_dir = Path(vault_directory)
         self.vault_dir.mkdir(exist_ok=True)
         self.encryption_key = VAULT_ENCRYPTION_KEY
+        self._key_bytes = bytes.fromhex(VAULT_ENCRYPTION_KEY)
+        # Current time in epoch milliseconds, for timestamps and expiry; injectable for tests
+        self._now_ms = clock
         
         # Create user subdirectories
         self.users_dir = self.vault_dir / "users"
         self.users_dir.mkdir(exist_ok=True)
+        self.shard_user_dirs = shard_user_dirs
+        self._users_path = str(self.users_dir)
         
-        logger.info(f"🗄️ Vault storage initialized: {self.vault_dir.absolute()}")
+        # Write-back buffer for durable=False stores; flushed when the storage is closed,
+        # collected, or the interpreter exits
+        self._write_back = _WriteBackBuffer()
+        weakref.finalize(self, self._write_back.close)
+        
+        logger.info("🗄️ Vault storage initialized: %s", self.vault_dir.absolute())
+    
+    def _user_dir(self, user_id: UserID) -> Path:
+        """A user's directory: users/<user_id>, or users/ab/cd/<user_id> when sharded"""
+        if not self.shard_user_dirs:
+            return self.users_dir / user_id
+        digest = hashlib.sha256(user_id.encode()).hexdigest()
+        return self.users_dir / digest[:2] / digest[2:4] / user_id
+    
+    def _record_path(self, user_id: UserID, scope: ConsentScope) -> str:
+        """Path of a user's record file for a scope, built as a plain string"""
+        if not self.shard_user_dirs:
+            return os.path.join(self._users_path, user_id, _SCOPE_FILENAMES[scope])
+        return os.path.join(self._user_dir(user_id), _SCOPE_FILENAMES[scope])
     
     def store_user_data(
         self,
@@ -46,11 +421,16 @@ class VaultStorage:
         data: Dict[str, Any],
         agent_id: AgentID,
         expires_in_ms: Optional[int] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        durable: bool = True
     ) -> bool:
         """
         Store encrypted user data in vault.
         
+        With durable=False the encrypted record is buffered and written to disk by a
+        background flusher within WRITE_BACK_INTERVAL_SECONDS, skipping fsync. Meant for
+        short-lived data (test tokens, session state) that may be lost in a crash.
+        
         Args:
             user_id: User identifier
             scope: Data scope (email, finance, etc.)
@@ -58,46 +438,167 @@ class VaultStorage:
             agent_id: Agent storing the data
             expires_in_ms: Optional expiration time
             metadata: Optional metadata
+            durable: Write through to disk before returning
             
         Returns:
             bool: Success status
         """
         try:
             # Create user directory
-            user_dir = self.users_dir / user_id
-            user_dir.mkdir(exist_ok=True)
-            
-            # Encrypt the data
-            encrypted_payload = encrypt_data(
-                plaintext=json.dumps(data, default=str),
-                key_hex=self.encryption_key
-            )
+            user_dir = self._user_dir(user_id)
+            user_dir.mkdir(parents=True, exist_ok=True)
             
             # Create vault record
-            current_time = int(time.time() * 1000)
-            vault_key = VaultKey(user_id=user_id, scope=scope)
-            vault_record = VaultRecord(
-                key=vault_key,
-                data=encrypted_payload,
-                agent_id=agent_id,
-                created_at=current_time,
-                updated_at=current_time,
-                expires_at=current_time + expires_in_ms if expires_in_ms else None,
-                metadata=metadata or {}
-            )
+            current_time = self._now_ms()
+            expires_at = current_time + expires_in_ms if expires_in_ms else None
+            vault_record = self._new_record(user_id, scope, data, agent_id, current_time, expires_at, metadata)
             
             # Store to file
-            file_path = user_dir / f"{scope.value}.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(vault_record.dict(), f, indent=2)
+            file_path = self._record_path(user_id, scope)
+            if durable:
+                self._write_record(file_path, vault_record)
+            else:
+                self._buffer_record(file_path, vault_record)
+            
+            logger.info("🔐 Data stored for %s in scope %s", user_id, scope.value)
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to store vault data: %s", e, exc_info=True)
+            return False
+    
+    async def store_user_data_async(
+        self,
+        user_id: UserID,
+        scope: ConsentScope,
+        data: Dict[str, Any],
+        agent_id: AgentID,
+        expires_in_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        store_user_data for async callers: the data is encrypted on the calling
+        thread and the file written in a worker thread, so gathering several
+        stores overlaps one's encryption with another's write.
+        """
+        try:
+            current_time = self._now_ms()
+            expires_at = current_time + expires_in_ms if expires_in_ms else None
+            vault_record = self._new_record(user_id, scope, data, agent_id, current_time, expires_at, metadata)
+            
+            file_path = self._record_path(user_id, scope)
+            await asyncio.to_thread(self._write_record, file_path, vault_record, True)
             
-            logger.info(f"🔐 Data stored for {user_id} in scope {scope.value}")
+            logger.info("🔐 Data stored for %s in scope %s", user_id, scope.value)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to store vault data: {str(e)}", exc_info=True)
+            logger.error("Failed to store vault data: %s", e, exc_info=True)
             return False
     
+    def _new_record(
+        self,
+        user_id: UserID,
+        scope: ConsentScope,
+        data: Dict[str, Any],
+        agent_id: AgentID,
+        current_time: int,
+        expires_at: Optional[int],
+        metadata: Optional[Dict[str, Any]]
+    ) -> VaultRecord:
+        """Compress (if large) and encrypt the data into a fresh record"""
+        plaintext, compression = _compress_plaintext(data)
+        return VaultRecord(
+            key=VaultKey(user_id=user_id, scope=scope),
+            data=encrypt_data_raw(plaintext, self._key_bytes),
+            agent_id=agent_id,
+            created_at=current_time,
+            updated_at=current_time,
+            expires_at=expires_at,
+            metadata=_tag_compression(dict(metadata or {}), compression)
+        )
+    
+    def _write_record(self, file_path: str, vault_record: VaultRecord, make_dir: bool = False) -> None:
+        """Durably write a record, superseding any buffered write to the same file"""
+        if make_dir:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with self._write_back.path_lock(file_path):
+            self._write_back.discard(file_path)
+            _save_record(file_path, vault_record)
+    
+    def _buffer_record(self, file_path: str, vault_record: VaultRecord) -> None:
+        payload = vault_record.model_dump_json(indent=2 if VAULT_PRETTY_JSON else None).encode()
+        self._write_back.put(file_path, payload, vault_record)
+    
+    def _flush_path(self, file_path: str) -> None:
+        self._write_back.flush_path(file_path)
+    
+    def flush(self) -> None:
+        """Write every buffered non-durable record to disk"""
+        self._write_back.flush()
+    
+    def close(self) -> None:
+        """Stop the background flusher after writing out buffered records"""
+        self._write_back.close()
+    
+    def store_user_data_bulk(
+        self,
+        user_id: UserID,
+        items: List[Tuple[ConsentScope, Dict[str, Any]]],
+        agent_id: AgentID,
+        expires_in_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, bool]:
+        """
+        Store several scopes of encrypted user data in one call.
+        
+        The user directory, timestamp and key's cipher context are set up once
+        and shared by every record; each record still gets its own IV and file.
+        Files are written on the I/O pool while the next record is encrypted.
+        
+        Args:
+            user_id: User identifier
+            items: (scope, data) pairs to encrypt and store
+            agent_id: Agent storing the data
+            expires_in_ms: Optional expiration time, applied to every record
+            metadata: Optional metadata, applied to every record
+            
+        Returns:
+            Dict mapping each scope value to its success status
+        """
+        results = {}
+        try:
+            user_dir = self._user_dir(user_id)
+            user_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error("Failed to store vault data: %s", e, exc_info=True)
+            return {scope.value: False for scope, _ in items}
+        
+        current_time = self._now_ms()
+        expires_at = current_time + expires_in_ms if expires_in_ms else None
+        writes = {}
+        for scope, data in items:
+            try:
+                vault_record = self._new_record(user_id, scope, data, agent_id, current_time, expires_at, metadata)
+                if scope.value in writes:
+                    # A repeated scope's last item wins, as if stored one by one
+                    wait([writes[scope.value]])
+                writes[scope.value] = _submit_write(self._write_record, self._record_path(user_id, scope), vault_record)
+            except Exception as e:
+                logger.error("Failed to store vault data for scope %s: %s", scope.value, e, exc_info=True)
+                results[scope.value] = False
+        
+        for scope_value, write in writes.items():
+            try:
+                write.result()
+                results[scope_value] = True
+            except Exception as e:
+                logger.error("Failed to store vault data for scope %s: %s", scope_value, e, exc_info=True)
+                results[scope_value] = False
+        
+        logger.info("🔐 Bulk stored %d of %d scopes for %s", sum(results.values()), len(items), user_id)
+        return results
+    
     def retrieve_user_data(
         self,
         user_id: UserID,
@@ -116,32 +617,33 @@ class VaultStorage:
             Dict containing decrypted data or None if not found/expired
         """
         try:
-            file_path = self.users_dir / user_id / f"{scope.value}.json"
-            
-            if not file_path.exists():
-                logger.warning(f"No data found for {user_id} in scope {scope.value}")
-                return None
-            
-            # Load vault record
-            with open(file_path, 'r', encoding='utf-8') as f:
-                record_data = json.load(f)
-            
-            vault_record = VaultRecord(**record_data)
+            file_path = self._record_path(user_id, scope)
+            
+            # Buffered writes are newer than anything on disk
+            vault_record = self._write_back.get(file_path)
+            if vault_record is None:
+                if not os.path.exists(file_path):
+                    logger.warning("No data found for %s in scope %s", user_id, scope.value)
+                    return None
+                
+                # Load vault record
+                vault_record = _load_record(file_path)
             
             # Check expiration
-            current_time = int(time.time() * 1000)
+            current_time = self._now_ms()
             if vault_record.expires_at and current_time > vault_record.expires_at:
-                logger.warning(f"Data expired for {user_id} in scope {scope.value}")
+                logger.warning("Data expired for %s in scope %s", user_id, scope.value)
                 return None
             
             # Check if deleted
             if vault_record.deleted:
-                logger.warning(f"Data marked as deleted for {user_id} in scope {scope.value}")
+                logger.warning("Data marked as deleted for %s in scope %s", user_id, scope.value)
                 return None
             
             # Decrypt data
-            decrypted_text = decrypt_data(vault_record.data, self.encryption_key)
-            decrypted_data = json.loads(decrypted_text)
+            decrypted_bytes = decrypt_data_raw(vault_record.data, self._key_bytes)
+            decrypted_bytes = _decompress_plaintext(decrypted_bytes, (vault_record.metadata or {}).get("compression"))
+            decrypted_data = orjson.loads(decrypted_bytes)
             
             # Add metadata for transparency
             result = {
@@ -157,11 +659,11 @@ class VaultStorage:
                 }
             }
             
-            logger.info(f"🔓 Data retrieved for {user_id} in scope {scope.value}")
+            logger.info("🔓 Data retrieved for %s in scope %s", user_id, scope.value)
             return result
             
         except Exception as e:
-            logger.error(f"Failed to retrieve vault data: {str(e)}", exc_info=True)
+            logger.error("Failed to retrieve vault data: %s", e, exc_info=True)
             return None
     
     def update_user_data(
@@ -170,47 +672,76 @@ class VaultStorage:
         scope: ConsentScope,
         data: Dict[str, Any],
         agent_id: AgentID,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        merge_metadata: bool = True
     ) -> bool:
         """
         Update existing user data in vault.
+        
+        With merge_metadata=False the record is replaced outright (see replace_user_data)
+        instead of being read back to keep its timestamps and merge its metadata.
         """
+        if not merge_metadata:
+            return self.replace_user_data(user_id, scope, data, agent_id, metadata=metadata)
+        
         try:
-            file_path = self.users_dir / user_id / f"{scope.value}.json"
+            file_path = self._record_path(user_id, scope)
+            self._flush_path(file_path)
             
-            if not file_path.exists():
-                logger.warning(f"No existing data to update for {user_id} in scope {scope.value}")
+            if not os.path.exists(file_path):
+                logger.warning("No existing data to update for %s in scope %s", user_id, scope.value)
                 return False
             
-            # Load existing record
-            with open(file_path, 'r', encoding='utf-8') as f:
-                record_data = json.load(f)
+            # Only the existing record's bookkeeping fields are kept, so its old
+            # encrypted data is not read back when they fit in the file's head
+            existing = _load_summary(file_path)
             
-            vault_record = VaultRecord(**record_data)
-            
-            # Encrypt new data
-            encrypted_payload = encrypt_data(
-                plaintext=json.dumps(data, default=str),
-                key_hex=self.encryption_key
-            )
+            # Compress (if large) and encrypt new data
+            plaintext, compression = _compress_plaintext(data)
+            encrypted_payload = encrypt_data_raw(plaintext, self._key_bytes)
             
             # Update record
-            vault_record.data = encrypted_payload
-            vault_record.updated_at = int(time.time() * 1000)
-            vault_record.agent_id = agent_id  # Track who updated it
-            if metadata:
-                vault_record.metadata.update(metadata)
+            vault_record = VaultRecord(
+                key=existing.key,
+                data=encrypted_payload,
+                agent_id=agent_id,  # Track who updated it
+                created_at=existing.created_at,
+                updated_at=self._now_ms(),
+                expires_at=existing.expires_at,
+                deleted=existing.deleted,
+                metadata=_tag_compression({**(existing.metadata or {}), **(metadata or {})}, compression)
+            )
             
             # Save updated record
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(vault_record.dict(), f, indent=2)
+            _save_record(file_path, vault_record)
             
-            logger.info(f"📝 Data updated for {user_id} in scope {scope.value}")
+            logger.info("📝 Data updated for %s in scope %s", user_id, scope.value)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update vault data: {str(e)}", exc_info=True)
+            logger.error("Failed to update vault data: %s", e, exc_info=True)
+            return False
+    
+    def replace_user_data(
+        self,
+        user_id: UserID,
+        scope: ConsentScope,
+        data: Dict[str, Any],
+        agent_id: AgentID,
+        expires_in_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Replace existing user data in vault with a fresh record, without reading the old one.
+        
+        Timestamps, expiry and metadata start over as in store_user_data.
+        """
+        file_path = self._record_path(user_id, scope)
+        if file_path not in self._write_back and not os.path.exists(file_path):
+            logger.warning("No existing data to replace for %s in scope %s", user_id, scope.value)
             return False
+        
+        return self.store_user_data(user_id, scope, data, agent_id, expires_in_ms=expires_in_ms, metadata=metadata)
     
     def delete_user_data(
         self,
@@ -232,36 +763,36 @@ class VaultStorage:
             bool: Success status
         """
         try:
-            file_path = self.users_dir / user_id / f"{scope.value}.json"
+            file_path = self._record_path(user_id, scope)
+            self._flush_path(file_path)
             
-            if not file_path.exists():
-                logger.warning(f"No data to delete for {user_id} in scope {scope.value}")
+            if not os.path.exists(file_path):
+                logger.warning("No data to delete for %s in scope %s", user_id, scope.value)
                 return False
             
             if hard_delete:
                 # Physical deletion
-                file_path.unlink()
-                logger.info(f"🗑️ Data hard deleted for {user_id} in scope {scope.value}")
+                _remove_file(file_path)
+                logger.info("🗑️ Data hard deleted for %s in scope %s", user_id, scope.value)
             else:
-                # Soft deletion - mark as deleted
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    record_data = json.load(f)
-                
-                vault_record = VaultRecord(**record_data)
-                vault_record.deleted = True
-                vault_record.updated_at = int(time.time() * 1000)
-                vault_record.metadata["deleted_by"] = agent_id
-                vault_record.metadata["deletion_timestamp"] = vault_record.updated_at
+                # Soft deletion - mark as deleted (edited as plain JSON; cached records are read-only)
+                record_data = _read_record_data(file_path)
+                record_data["deleted"] = True
+                record_data["updated_at"] = self._now_ms()
+                record_data["metadata"] = {
+                    **(record_data.get("metadata") or {}),
+                    "deleted_by": agent_id,
+                    "deletion_timestamp": record_data["updated_at"]
+                }
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(vault_record.dict(), f, indent=2)
+                _write_record_data(file_path, record_data)
                 
-                logger.info(f"🗑️ Data soft deleted for {user_id} in scope {scope.value}")
+                logger.info("🗑️ Data soft deleted for %s in scope %s", user_id, scope.value)
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to delete vault data: {str(e)}", exc_info=True)
+            logger.error("Failed to delete vault data: %s", e, exc_info=True)
             return False
     
     def list_user_data(self, user_id: UserID) -> List[Dict[str, Any]]:
@@ -275,18 +806,17 @@ class VaultStorage:
             List of data summaries (no actual content for security)
         """
         try:
-            user_dir = self.users_dir / user_id
+            self.flush()
+            user_dir = self._user_dir(user_id)
             
             if not user_dir.exists():
                 return []
             
             summaries = []
-            for file_path in user_dir.glob("*.json"):
+            for entry, vault_record in _load_summaries(_record_entries(user_dir)):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                    
-                    vault_record = VaultRecord(**record_data)
+                    if isinstance(vault_record, Exception):
+                        raise vault_record
                     
                     # Don't include actual data for security
                     summary = {
@@ -297,20 +827,31 @@ class VaultStorage:
                         "stored_by_agent": vault_record.agent_id,
                         "deleted": vault_record.deleted,
                         "metadata": vault_record.metadata,
-                        "file_size_bytes": file_path.stat().st_size
+                        "file_size_bytes": entry.stat().st_size
                     }
                     summaries.append(summary)
                     
                 except Exception as e:
-                    logger.warning(f"Failed to read vault file {file_path}: {str(e)}")
+                    logger.warning("Failed to read vault file %s: %s", entry.path, e)
                     continue
             
             return summaries
             
         except Exception as e:
-            logger.error(f"Failed to list user data: {str(e)}", exc_info=True)
+            logger.error("Failed to list user data: %s", e, exc_info=True)
             return []
     
+    def _all_record_entries(self) -> Tuple[int, List[os.DirEntry]]:
+        """Number of user directories and every record file across them, listed concurrently"""
+        self.flush()
+        if self.shard_user_dirs:
+            shard_dirs = _subdirectories(self.users_dir)
+            user_dirs = [user_dir for user_dirs in _io_pool.map(_sharded_user_dirs, shard_dirs) for user_dir in user_dirs]
+        else:
+            user_dirs = _subdirectories(self.users_dir)
+        record_entries = [entry for entries in _io_pool.map(_record_entries, user_dirs) for entry in entries]
+        return len(user_dirs), record_entries
+    
     def cleanup_expired_data(self) -> int:
         """
         Clean up expired data from vault.
@@ -319,34 +860,29 @@ class VaultStorage:
             int: Number of expired records cleaned up
         """
         cleaned_count = 0
-        current_time = int(time.time() * 1000)
+        current_time = self._now_ms()
         
         try:
-            for user_dir in self.users_dir.iterdir():
-                if not user_dir.is_dir():
-                    continue
-                
-                for file_path in user_dir.glob("*.json"):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            record_data = json.load(f)
-                        
-                        vault_record = VaultRecord(**record_data)
+            _, record_entries = self._all_record_entries()
+            for entry, vault_record in _load_summaries(record_entries):
+                try:
+                    if isinstance(vault_record, Exception):
+                        raise vault_record
+                    
+                    if vault_record.expires_at and current_time > vault_record.expires_at:
+                        _remove_file(entry.path)
+                        cleaned_count += 1
+                        logger.info("🧹 Cleaned expired data: %s", entry.path)
                         
-                        if vault_record.expires_at and current_time > vault_record.expires_at:
-                            file_path.unlink()
-                            cleaned_count += 1
-                            logger.info(f"🧹 Cleaned expired data: {file_path}")
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to check expiry for {file_path}: {str(e)}")
-                        continue
-            
-            logger.info(f"🧹 Cleanup completed: {cleaned_count} expired records removed")
+                except Exception as e:
+                    logger.warning("Failed to check expiry for %s: %s", entry.path, e)
+                    continue
+            
+            logger.info("🧹 Cleanup completed: %s expired records removed", cleaned_count)
             return cleaned_count
             
         except Exception as e:
-            logger.error(f"Failed to cleanup expired data: {str(e)}", exc_info=True)
+            logger.error("Failed to cleanup expired data: %s", e, exc_info=True)
             return 0
     
     def get_storage_stats(self) -> Dict[str, Any]:
@@ -367,48 +903,36 @@ class VaultStorage:
                 "deleted_records": 0
             }
             
-            current_time = int(time.time() * 1000)
+            current_time = self._now_ms()
             
-            for user_dir in self.users_dir.iterdir():
-                if not user_dir.is_dir():
-                    continue
-                
-                stats["total_users"] += 1
-                
-                for file_path in user_dir.glob("*.json"):
-                    try:
-                        stats["total_records"] += 1
-                        stats["total_size_bytes"] += file_path.stat().st_size
-                        
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            record_data = json.load(f)
-                        
-                        vault_record = VaultRecord(**record_data)
-                        
-                        # Count by scope
-                        scope = vault_record.key.scope
-                        stats["scopes"][scope] = stats["scopes"].get(scope, 0) + 1
-                        
-                        # Count by agent
-                        agent = vault_record.agent_id
-                        stats["agents"][agent] = stats["agents"].get(agent, 0) + 1
-                        
-                        # Count expired
-                        if vault_record.expires_at and current_time > vault_record.expires_at:
-                            stats["expired_records"] += 1
+            # Records of all users are read in one concurrent pass
+            stats["total_users"], record_entries = self._all_record_entries()
+            records = []
+            for entry, vault_record in _load_summaries(record_entries):
+                try:
+                    stats["total_records"] += 1
+                    stats["total_size_bytes"] += entry.stat().st_size
+                    
+                    if isinstance(vault_record, Exception):
+                        raise vault_record
+                    records.append(vault_record)
                         
-                        # Count deleted
-                        if vault_record.deleted:
-                            stats["deleted_records"] += 1
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to read stats for {file_path}: {str(e)}")
-                        continue
+                except Exception as e:
+                    logger.warning("Failed to read stats for %s: %s", entry.path, e)
+                    continue
+            
+            # Count by scope and agent, then expired and deleted, each in a single pass
+            stats["scopes"] = dict(Counter(record.key.scope for record in records))
+            stats["agents"] = dict(Counter(record.agent_id for record in records))
+            stats["expired_records"] = sum(
+                1 for record in records if record.expires_at and current_time > record.expires_at
+            )
+            stats["deleted_records"] = sum(1 for record in records if record.deleted)
             
             return stats
             
         except Exception as e:
-            logger.error(f"Failed to get storage stats: {str(e)}", exc_info=True)
+            logger.error("Failed to get storage stats: %s", e, exc_info=True)
             return {"error": str(e)}
 
 # Global vault storage instance
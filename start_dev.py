@@ -21,20 +21,20 @@ def main():
     # Set environment variables
     os.environ["SECRET_KEY"] = "dev_secret_key_change_in_production"
     os.environ["VAULT_ENCRYPTION_KEY"] = "dev_encryption_key_32_chars_long_change_in_production_please"
-    os.environ["FLASK_ENV"] = "development"
-    os.environ["FLASK_DEBUG"] = "true"
+    os.environ["HUSHH_ENV"] = "development"
+    os.environ["QUART_DEBUG"] = "true"
     
     print("🔧 Environment configured for development")
     
     # Check if requirements are installed
     try:
-        import flask
-        print("✅ Flask available")
+        import quart
+        print("✅ Quart available")
     except ImportError:
         print("📦 Installing requirements...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
     
-    # Start the Flask app
+    # Start the Quart app
     print("🚀 Starting development server...")
     print("🌐 Web app will be available at: http://localhost:5000")
     print("📊 Try these endpoints:")
@@ -45,7 +45,7 @@ def main():
     print("\nPress Ctrl+C to stop\n")
     
     try:
-        # Import and run the Flask app
+        # Import and run the Quart app
         from app import app
         app.run(debug=True, host='0.0.0.0', port=5000)
     except ImportError:
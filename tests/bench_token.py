@@ -0,0 +1,38 @@
+# tests/bench_token.py
+"""
+Microbenchmarks for consent token issue/validate (pytest-benchmark).
+
+Not collected by a plain `pytest` run; run explicitly with:
+    pytest tests/bench_token.py --benchmark-only
+"""
+
+import pytest
+
+from hushh_mcp.consent.token import _verified_tokens, issue_token, validate_token
+from hushh_mcp.constants import ConsentScope
+
+USER_ID = "user_bench"
+AGENT_ID = "agent_bench"
+SCOPE = ConsentScope.VAULT_READ_EMAIL
+
+@pytest.mark.benchmark(group="token")
+def test_issue_token(benchmark):
+    benchmark(issue_token, USER_ID, AGENT_ID, SCOPE, 3600_000)
+
+@pytest.mark.benchmark(group="token")
+def test_validate_token_cached(benchmark):
+    token = issue_token(USER_ID, AGENT_ID, SCOPE, 3600_000)
+    valid, _, _ = benchmark(validate_token, token.token, SCOPE)
+    assert valid
+
+@pytest.mark.benchmark(group="token")
+def test_validate_token_uncached(benchmark):
+    token = issue_token(USER_ID, AGENT_ID, SCOPE, 3600_000)
+    
+    def setup():
+        # Full decode + HMAC path: forget the earlier verification every round
+        _verified_tokens.pop(token.token, None)
+        return (token.token, SCOPE), {}
+    
+    valid, _, _ = benchmark.pedantic(validate_token, setup=setup, rounds=2000)
+    assert valid
@@ -0,0 +1,35 @@
+# tests/conftest.py
+"""
+Shared pytest fixtures.
+
+Consent tokens and the MCP server are created once per test session; tests
+must not revoke a shared token or mutate the shared server.
+"""
+
+import pytest
+
+from hushh_mcp.consent.token import issue_token
+
+@pytest.fixture(scope="session")
+def consent_token():
+    """Return consent_token(user_id, agent_id, scope): a day-long token issued once per combination"""
+    tokens = {}
+    
+    def get(user_id, agent_id, scope):
+        key = (user_id, agent_id, scope)
+        if key not in tokens:
+            tokens[key] = issue_token(
+                user_id=user_id,
+                agent_id=agent_id,
+                scope=scope,
+                expires_in_ms=24 * 60 * 60 * 1000
+            )
+        return tokens[key]
+    
+    return get
+
+@pytest.fixture(scope="session")
+def mcp_server():
+    # Imported here so suites that don't use the server don't pay for (or depend on) its imports
+    from hushh_mcp.mcp_server import HushhMCPServer
+    return HushhMCPServer()
@@ -0,0 +1,61 @@
+# tests/test_batching.py
+
+import asyncio
+
+from hushh_mcp.agents.batching import RequestBatcher
+
+
+def test_concurrent_requests_share_one_dispatch():
+    batches = []
+
+    async def dispatch(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = RequestBatcher(dispatch, max_batch=16, max_wait_ms=5)
+        return await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+def test_full_batch_dispatches_without_waiting():
+    batches = []
+
+    async def dispatch(items):
+        batches.append(list(items))
+        return items
+
+    async def run():
+        batcher = RequestBatcher(dispatch, max_batch=2, max_wait_ms=10_000)
+        return await asyncio.wait_for(asyncio.gather(*[batcher.submit(i) for i in range(4)]), timeout=1)
+
+    assert asyncio.run(run()) == [0, 1, 2, 3]
+    assert batches == [[0, 1], [2, 3]]
+
+
+def test_dispatch_failure_propagates_to_every_caller():
+    async def dispatch(items):
+        raise RuntimeError("backend down")
+
+    async def run():
+        batcher = RequestBatcher(dispatch, max_wait_ms=1)
+        return await asyncio.gather(*[batcher.submit(i) for i in range(3)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_short_dispatch_result_fails_every_caller():
+    async def dispatch(items):
+        return items[:-1]
+
+    async def run():
+        batcher = RequestBatcher(dispatch, max_wait_ms=1)
+        return await asyncio.wait_for(
+            asyncio.gather(*[batcher.submit(i) for i in range(3)], return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,37 @@
+# tests/test_kv_store.py
+
+from hushh_mcp.vault.kv_store import VaultKVStore
+
+def test_put_and_get_roundtrip():
+    store = VaultKVStore()
+    store.put("user_1", "platform_data", {"orders": 15, "categories": ["books"]}, platform="amazon")
+    assert store.get("user_1", "platform_data", platform="amazon") == {"orders": 15, "categories": ["books"]}
+
+def test_missing_record_returns_none():
+    store = VaultKVStore()
+    store.put("user_1", "platform_data", {"orders": 15}, platform="amazon")
+    assert store.get("user_1", "platform_data", platform="ebay") is None
+    assert store.get("user_2", "platform_data", platform="amazon") is None
+
+def test_put_replaces_existing_record():
+    store = VaultKVStore()
+    store.put("user_1", "email_patterns", {"count": 1})
+    store.put("user_1", "email_patterns", {"count": 2})
+    assert store.get("user_1", "email_patterns") == {"count": 2}
+
+def test_large_payload_is_compressed_and_roundtrips():
+    store = VaultKVStore()
+    data = {"orders": [{"title": "MacBook Air M3", "price": 1099.99}] * 100}
+    store.put("user_1", "purchase_history", data)
+    payload = store._conn.execute("SELECT payload FROM vault").fetchone()[0]
+    assert len(payload) < len(str(data))
+    assert store.get("user_1", "purchase_history") == data
+
+def test_put_many_writes_all_records():
+    store = VaultKVStore()
+    store.put_many([
+        ("user_1", "platform_data", "amazon", {"orders": 15}),
+        ("user_1", "platform_data", "ebay", {"orders": 3}),
+    ])
+    assert store.get("user_1", "platform_data", platform="amazon") == {"orders": 15}
+    assert store.get("user_1", "platform_data", platform="ebay") == {"orders": 3}
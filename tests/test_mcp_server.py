@@ -6,29 +6,42 @@ Comprehensive tests for MCP Server following hackathon requirements.
 import pytest
 import asyncio
 import json
-from unittest.mock import patch, MagicMock
+import orjson
 
 from hushh_mcp.mcp_server import HushhMCPServer, MCPMethod
-from hushh_mcp.consent.token import issue_token
 from hushh_mcp.constants import ConsentScope
 
+# Raw frames, serialized once at import, for tests that go through the wire-format entry point
+FRAMES = {
+    "initialize": orjson.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}),
+    "tools_list": orjson.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}),
+    "batch": orjson.dumps([
+        {"jsonrpc": "2.0", "id": 3, "method": "resources/list"},
+        {"jsonrpc": "2.0", "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": 4, "method": "unknown/method"}
+    ]),
+    "notification": orjson.dumps({"jsonrpc": "2.0", "method": "tools/list"}),
+    "malformed": b'{"jsonrpc": "2.0", "id": 5,'
+}
+
+# Every test runs on one session-wide event loop, shared with the session-scoped server
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
 class TestMCPServer:
     """Test suite for HushhMCP Server"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        self.server = HushhMCPServer()
+    @pytest.fixture(autouse=True)
+    def setup(self, mcp_server, consent_token):
+        """Setup test fixtures; the server and token are shared across the session"""
+        self.server = mcp_server
         self.user_id = "test_user_mcp"
         
-        # Create valid consent token
-        self.valid_token = issue_token(
-            user_id=self.user_id,
-            agent_id="test_agent",
-            scope=ConsentScope.AGENT_SHOPPING_PURCHASE,
-            expires_in_ms=24 * 60 * 60 * 1000
-        )
+        # Valid consent token
+        self.valid_token = consent_token(self.user_id, "test_agent", ConsentScope.AGENT_SHOPPING_PURCHASE)
+        yield
+        # Consent results cached by one test must not decide the next one
+        self.server.reset()
     
-    @pytest.mark.asyncio
     async def test_initialize_method(self):
         """Test MCP initialization"""
         message = {
@@ -50,7 +63,6 @@ class TestMCPServer:
         assert "capabilities" in response["result"]
         assert "serverInfo" in response["result"]
     
-    @pytest.mark.asyncio
     async def test_list_resources(self):
         """Test listing available resources"""
         message = {
@@ -66,7 +78,6 @@ class TestMCPServer:
         assert "resources" in response["result"]
         assert len(response["result"]["resources"]) > 0
     
-    @pytest.mark.asyncio
     async def test_read_resource_with_consent(self):
         """Test reading resource with valid consent"""
         message = {
@@ -85,7 +96,6 @@ class TestMCPServer:
         assert "result" in response
         assert "contents" in response["result"]
     
-    @pytest.mark.asyncio
     async def test_read_resource_without_consent(self):
         """Test reading resource without consent"""
         message = {
@@ -103,7 +113,6 @@ class TestMCPServer:
         assert "error" in response
         assert "consent" in response["error"]["message"].lower()
     
-    @pytest.mark.asyncio
     async def test_list_tools(self):
         """Test listing available tools"""
         message = {
@@ -119,7 +128,6 @@ class TestMCPServer:
         assert "tools" in response["result"]
         assert len(response["result"]["tools"]) > 0
     
-    @pytest.mark.asyncio
     async def test_call_tool_verify_email(self):
         """Test calling email verification tool"""
         message = {
@@ -140,7 +148,6 @@ class TestMCPServer:
         assert "result" in response
         assert "content" in response["result"]
     
-    @pytest.mark.asyncio
     async def test_call_tool_with_consent(self):
         """Test calling tool that requires consent"""
         message = {
@@ -163,7 +170,6 @@ class TestMCPServer:
         # Should succeed or fail gracefully
         assert "result" in response or "error" in response
     
-    @pytest.mark.asyncio
     async def test_request_consent_extension(self):
         """Test HushhMCP consent request extension"""
         message = {
@@ -183,7 +189,6 @@ class TestMCPServer:
         assert "result" in response
         assert "success" in response["result"]
     
-    @pytest.mark.asyncio
     async def test_verify_consent_extension(self):
         """Test HushhMCP consent verification extension"""
         message = {
@@ -202,7 +207,6 @@ class TestMCPServer:
         assert "result" in response
         assert "valid" in response["result"]
     
-    @pytest.mark.asyncio
     async def test_execute_agent_extension(self):
         """Test HushhMCP agent execution extension"""
         message = {
@@ -225,7 +229,62 @@ class TestMCPServer:
         # Should succeed or fail gracefully
         assert "result" in response or "error" in response
     
-    @pytest.mark.asyncio
+    async def test_methods_handled_concurrently(self):
+        """Test one message per method, all in flight at once, each answered under its own id"""
+        methods = [
+            ("initialize", {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "Test Client", "version": "1.0.0"}}),
+            ("resources/list", None),
+            ("resources/read", {"uri": "hushh://agents/shopping/recommendations", "consent_token": self.valid_token.token}),
+            ("resources/read", {"uri": "hushh://vault/user/test/email"}),
+            ("tools/list", None),
+            ("tools/call", {"name": "verify_email", "arguments": {"email": "test@example.com"}}),
+            ("hushh/consent/verify", {"token": self.valid_token.token, "expected_scope": "agent.shopping.purchase"}),
+            ("hushh/agent/execute", {"agent_name": "shopping", "user_id": self.user_id, "consent_token": self.valid_token.token, "arguments": {"category": "electronics"}}),
+            ("unknown/method", None)
+        ]
+        messages = [
+            {"jsonrpc": "2.0", "id": msg_id, "method": method, **({"params": params} if params is not None else {})}
+            for msg_id, (method, params) in enumerate(methods, start=100)
+        ]
+        
+        responses = await asyncio.gather(*[self.server.handle_message(message) for message in messages])
+        
+        assert [response["id"] for response in responses] == [message["id"] for message in messages]
+        for response in responses:
+            assert response["jsonrpc"] == "2.0"
+            assert "result" in response or "error" in response
+        assert responses[-1]["error"]["code"] == -32601
+    
+    async def test_handle_message_bytes(self):
+        """Test raw frames: a single message, a batch (notifications get no response) and a parse error"""
+        response = orjson.loads(await self.server.handle_message_bytes(FRAMES["initialize"]))
+        assert response["id"] == 1
+        assert "capabilities" in response["result"]
+        
+        response = orjson.loads(await self.server.handle_message_bytes(FRAMES["tools_list"]))
+        assert len(response["result"]["tools"]) > 0
+        
+        responses = orjson.loads(await self.server.handle_message_bytes(FRAMES["batch"]))
+        assert [response["id"] for response in responses] == [3, 4]
+        assert "resources" in responses[0]["result"]
+        assert responses[1]["error"]["code"] == -32601
+        
+        assert await self.server.handle_message_bytes(FRAMES["notification"]) is None
+        
+        response = orjson.loads(await self.server.handle_message_bytes(FRAMES["malformed"]))
+        assert response["error"]["code"] == -32700
+        assert response["id"] is None
+    
+    async def test_mistyped_params(self):
+        """Test mistyped params are rejected as invalid params, not internal errors"""
+        for method, params in (
+            ("hushh/consent/verify", {"token": 123}),
+            ("resources/read", {"uri": ["x"]}),
+            ("tools/call", {"name": {"x": 1}}),
+        ):
+            response = await self.server.handle_message({"jsonrpc": "2.0", "id": 12, "method": method, "params": params})
+            assert response["error"]["code"] == -32602
+    
     async def test_unknown_method(self):
         """Test handling of unknown methods"""
         message = {
@@ -240,7 +299,6 @@ class TestMCPServer:
         assert "error" in response
         assert response["error"]["code"] == -32601  # Method not found
     
-    @pytest.mark.asyncio
     async def test_malformed_message(self):
         """Test handling of malformed messages"""
         message = {
@@ -0,0 +1,49 @@
+# tests/test_semantic_cache.py
+
+from hushh_mcp.agents.semantic_cache import SemanticCache, _hashed_embedding
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    return SemanticCache(embedder=_hashed_embedding, **kwargs)
+
+
+def test_similar_prompt_hits_cache():
+    cache = make_cache()
+    cache.store("user_alice", "please summarize my emails", {"text": "summary"})
+
+    assert cache.lookup("user_alice", "summarize my emails please") == {"text": "summary"}
+
+
+def test_unrelated_prompt_misses_cache():
+    cache = make_cache()
+    cache.store("user_alice", "please summarize my emails", {"text": "summary"})
+
+    assert cache.lookup("user_alice", "schedule a meeting tomorrow") is None
+
+
+def test_cache_is_partitioned_by_namespace():
+    cache = make_cache()
+    cache.store("user_alice", "please summarize my emails", {"text": "summary"})
+
+    assert cache.lookup("user_bob", "please summarize my emails") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.store("user_alice", "first prompt", {"text": "first"})
+    cache.store("user_alice", "second prompt", {"text": "second"})
+    cache.lookup("user_alice", "first prompt")
+    cache.store("user_alice", "third prompt", {"text": "third"})
+
+    assert len(cache) == 2
+    assert cache.lookup("user_alice", "first prompt") == {"text": "first"}
+    assert cache.lookup("user_alice", "second prompt") is None
+
+
+def test_cache_is_disabled_without_embedder(monkeypatch):
+    monkeypatch.setattr("hushh_mcp.agents.semantic_cache.get_default_embedder", lambda: None)
+    cache = SemanticCache()
+    cache.store("user_alice", "please summarize my emails", {"text": "summary"})
+
+    assert len(cache) == 0
+    assert cache.lookup("user_alice", "please summarize my emails") is None
@@ -4,56 +4,71 @@ Comprehensive tests for HushhShoppingAgent following hackathon requirements.
 Tests all functionality including consent validation, ML recommendations, and error handling.
 """
 
+import concurrent.futures
+import numpy as np
 import pytest
 import time
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
-from hushh_mcp.agents.shopping import HushhShoppingAgent
+from hushh_mcp.agents.shopping import (
+    HushhShoppingAgent,
+    _rank_items, _rank_items_numpy, _score_deals, _score_deals_numpy
+)
 from hushh_mcp.consent.token import issue_token, validate_token
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import UserID, AgentID, HushhConsentToken
 from hushh_mcp.vault.storage import store_data, retrieve_data
 
+@pytest.fixture(scope="module")
+def executor():
+    """One worker pool for the module's concurrency tests, so they measure the agent rather than thread start-up"""
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="test")
+    yield pool
+    pool.shutdown(wait=True)
+
+USER_ID = "test_user_shopping"
+AGENT_ID = "agent_shopper"
+
+@pytest.fixture(scope="module")
+def shopping_user_data():
+    """Store test user data in vault once for the module"""
+    test_user_data = {
+        "email_patterns": {
+            "brands": ["apple", "nike", "uniqlo"],
+            "categories": ["electronics", "fashion"],
+            "price_range": "medium"
+        },
+        "purchase_history": [
+            {"item": "iPhone 15", "price": 999, "category": "electronics"},
+            {"item": "Nike Shoes", "price": 120, "category": "fashion"}
+        ],
+        "preferences": {
+            "sustainability": True,
+            "brand_loyalty": "medium",
+            "deal_threshold": 0.2
+        }
+    }
+    store_data(
+        user_id=USER_ID,
+        scope=ConsentScope.VAULT_READ_EMAIL,
+        data=test_user_data,
+        agent_id=AGENT_ID
+    )
+    return test_user_data
+
 class TestShoppingAgent:
     """Test suite for HushhShoppingAgent"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
+    @pytest.fixture(autouse=True)
+    def setup(self, consent_token, shopping_user_data):
+        """Setup test fixtures; a fresh agent per test, since it caches per-user results"""
         self.agent = HushhShoppingAgent()
-        self.user_id = "test_user_shopping"
-        self.agent_id = "agent_shopper"
-        
-        # Create valid consent token
-        self.valid_token = issue_token(
-            user_id=self.user_id,
-            agent_id=self.agent_id,
-            scope=ConsentScope.AGENT_SHOPPING_PURCHASE,
-            expires_in_ms=24 * 60 * 60 * 1000  # 24 hours
-        )
+        self.consent_token = consent_token
+        self.user_id = USER_ID
+        self.agent_id = AGENT_ID
         
-        # Store test user data in vault
-        test_user_data = {
-            "email_patterns": {
-                "brands": ["apple", "nike", "uniqlo"],
-                "categories": ["electronics", "fashion"],
-                "price_range": "medium"
-            },
-            "purchase_history": [
-                {"item": "iPhone 15", "price": 999, "category": "electronics"},
-                {"item": "Nike Shoes", "price": 120, "category": "fashion"}
-            ],
-            "preferences": {
-                "sustainability": True,
-                "brand_loyalty": "medium",
-                "deal_threshold": 0.2
-            }
-        }
-        store_data(
-            user_id=self.user_id,
-            scope=ConsentScope.VAULT_READ_EMAIL,
-            data=test_user_data,
-            agent_id=self.agent_id
-        )
+        # Valid consent token, shared across the session
+        self.valid_token = consent_token(self.user_id, self.agent_id, ConsentScope.AGENT_SHOPPING_PURCHASE)
     
     def test_agent_initialization(self):
         """Test agent initialization with correct parameters"""
@@ -91,7 +106,7 @@ class TestShoppingAgent:
     
     def test_expired_consent_token(self):
         """Test agent execution with expired consent token"""
-        # Create expired token
+        # Create expired token (issued per test; an expired token can't be shared)
         expired_token = issue_token(
             user_id=self.user_id,
             agent_id=self.agent_id,
@@ -109,12 +124,7 @@ class TestShoppingAgent:
     
     def test_wrong_scope_consent(self):
         """Test agent execution with wrong scope consent"""
-        wrong_scope_token = issue_token(
-            user_id=self.user_id,
-            agent_id=self.agent_id,
-            scope=ConsentScope.VAULT_READ_FINANCE,  # Wrong scope
-            expires_in_ms=24 * 60 * 60 * 1000
-        )
+        wrong_scope_token = self.consent_token(self.user_id, self.agent_id, ConsentScope.VAULT_READ_FINANCE)  # Wrong scope
         
         result = self.agent.execute(
             user_id=self.user_id,
@@ -147,12 +157,7 @@ class TestShoppingAgent:
         """Test fallback recommendations when user data unavailable"""
         # Test with user that has no stored data
         new_user_id = "user_no_data"
-        new_token = issue_token(
-            user_id=new_user_id,
-            agent_id=self.agent_id,
-            scope=ConsentScope.AGENT_SHOPPING_PURCHASE,
-            expires_in_ms=24 * 60 * 60 * 1000
-        )
+        new_token = self.consent_token(new_user_id, self.agent_id, ConsentScope.AGENT_SHOPPING_PURCHASE)
         
         result = self.agent.execute(
             user_id=new_user_id,
@@ -217,21 +222,40 @@ class TestShoppingAgent:
         assert result.success is True
         deals = result.data["deals"]
         
-        # Check if deals are sorted by score (descending)
-        scores = [deal.get("final_score", 0) for deal in deals]
-        assert scores == sorted(scores, reverse=True)
+        # Check if deals are sorted by score (descending): no score rises over the previous one
+        scores = np.fromiter((deal.get("final_score", 0) for deal in deals), dtype=np.float64, count=len(deals))
+        assert np.all(np.diff(scores) <= 0)
+    
+    def test_scoring_kernels_match_numpy_reference(self):
+        """Test the (JIT-compiled, when numba is installed) scoring kernels against the NumPy versions"""
+        prices = np.array([49.0, 199.0, 999.0, 1299.0, 199.0])
+        has_apple = np.array([0.0, 1.0, 1.0, 0.0, 1.0])
+        user_factors = np.array([0.0, 0.1, 0.05, 0.2, 0.1])
+        for apple_affinity in (0.2, 0.8):
+            order, scores = _rank_items(prices, has_apple, user_factors, apple_affinity, 500.0, 1000.0)
+            expected_order, expected_scores = _rank_items_numpy(prices, has_apple, user_factors, apple_affinity, 500.0, 1000.0)
+            assert order.tolist() == expected_order.tolist()
+            np.testing.assert_allclose(scores[order], expected_scores[expected_order])
+            assert np.all(np.diff(scores[order]) <= 0)
+        
+        discounts = np.array([5.0, 20.0, 40.0])
+        category_match = np.array([1.0, 0.0, 1.0])
+        for budget_conscious in (False, True):
+            relevance = _score_deals(discounts, category_match, budget_conscious)
+            np.testing.assert_allclose(relevance, _score_deals_numpy(discounts, category_match, budget_conscious))
+            assert ((relevance >= 0) & (relevance <= 1)).all()
     
-    def test_error_handling_with_vault_failure(self):
+    def test_error_handling_with_vault_failure(self, monkeypatch):
         """Test error handling when vault access fails"""
-        with patch('hushh_mcp.vault.storage.retrieve_data', side_effect=Exception("Vault error")):
-            result = self.agent.execute(
-                user_id=self.user_id,
-                token_str=self.valid_token.token
-            )
-            
-            # Should still work with fallback
-            assert result.success is True
-            assert result.data["personalization_level"] == "basic"
+        monkeypatch.setattr("hushh_mcp.vault.storage.retrieve_data", MagicMock(side_effect=Exception("Vault error")))
+        result = self.agent.execute(
+            user_id=self.user_id,
+            token_str=self.valid_token.token
+        )
+        
+        # Should still work with fallback
+        assert result.success is True
+        assert result.data["personalization_level"] == "basic"
     
     def test_performance_timing(self):
         """Test that execution time is recorded"""
@@ -280,11 +304,8 @@ class TestShoppingAgent:
         calculated_savings = sum(deal.get("savings", 0) for deal in deals)
         assert estimated_savings == calculated_savings
     
-    def test_multiple_concurrent_executions(self):
-        """Test thread safety with multiple concurrent executions"""
-        import threading
-        import concurrent.futures
-        
+    def test_multiple_concurrent_executions(self, executor):
+        """Test thread safety with multiple concurrent executions on one shared agent"""
         def execute_agent():
             return self.agent.execute(
                 user_id=self.user_id,
@@ -292,9 +313,8 @@ class TestShoppingAgent:
             )
         
         # Run multiple executions concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(execute_agent) for _ in range(5)]
-            results = [future.result() for future in futures]
+        futures = [executor.submit(execute_agent) for _ in range(5)]
+        results = [future.result() for future in futures]
         
         # All executions should succeed
         for result in results:
@@ -312,12 +332,7 @@ class TestShoppingAgent:
         assert result.user_id == self.user_id
         
         # Test with different user ID (should fail)
-        different_user_token = issue_token(
-            user_id="different_user",
-            agent_id=self.agent_id,
-            scope=ConsentScope.AGENT_SHOPPING_PURCHASE,
-            expires_in_ms=24 * 60 * 60 * 1000
-        )
+        different_user_token = self.consent_token("different_user", self.agent_id, ConsentScope.AGENT_SHOPPING_PURCHASE)
         
         result = self.agent.execute(
             user_id=self.user_id,  # Different from token
@@ -6,7 +6,8 @@ from hushh_mcp.consent.token import (
     issue_token,
     validate_token,
     revoke_token,
-    is_token_revoked
+    is_token_revoked,
+    token_expires_at
 )
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import HushhConsentToken
@@ -43,6 +44,12 @@ def test_token_expiry():
     assert reason == "Token expired"
 
 
+def test_token_expires_at():
+    token_obj = issue_token(USER_ID, AGENT_ID, VALID_SCOPE)
+    assert token_expires_at(token_obj.token) == token_obj.expires_at
+    assert token_expires_at("not-a-token") is None
+
+
 def test_token_revocation():
     token_obj = issue_token(USER_ID, AGENT_ID, VALID_SCOPE)
     revoke_token(token_obj.token)
@@ -59,3 +66,19 @@ def test_signature_tampering():
     valid, reason, _ = validate_token(tampered, VALID_SCOPE)
     assert valid is False
     assert "Malformed token" in reason or "Invalid token prefix" in reason
+
+
+def test_cached_token_rechecks_scope_and_revocation():
+    # Own user id: tokens issued in the same millisecond are identical, and another test revokes USER_ID's
+    token_obj = issue_token("user_cache_test", AGENT_ID, VALID_SCOPE)
+    assert validate_token(token_obj.token, VALID_SCOPE)[0] is True
+    assert validate_token(token_obj.token, VALID_SCOPE)[0] is True
+
+    valid, reason, _ = validate_token(token_obj.token, ConsentScope.VAULT_READ_PHONE)
+    assert valid is False
+    assert reason == "Scope mismatch"
+
+    revoke_token(token_obj.token)
+    valid, reason, _ = validate_token(token_obj.token, VALID_SCOPE)
+    assert valid is False
+    assert reason == "Token has been revoked"
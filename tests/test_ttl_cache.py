@@ -0,0 +1,40 @@
+# tests/test_ttl_cache.py
+
+import time
+
+from hushh_mcp.agents.ttl_cache import TTLCache
+
+
+def test_get_returns_value_until_expiry():
+    cache = TTLCache(maxsize=4, ttl_seconds=0.05)
+    cache.set("user_1", "profile")
+    assert cache.get("user_1") == "profile"
+    time.sleep(0.06)
+    assert cache.get("user_1") is None
+
+
+def test_invalidate_drops_entry():
+    cache = TTLCache(maxsize=4, ttl_seconds=60)
+    cache.set("user_1", "profile")
+    cache.invalidate("user_1")
+    cache.invalidate("missing")
+    assert cache.get("user_1") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_per_entry_ttl_overrides_default():
+    cache = TTLCache(maxsize=4, ttl_seconds=60)
+    cache.set("short", 1, ttl_seconds=0.05)
+    cache.set("long", 2)
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
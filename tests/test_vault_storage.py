@@ -3,21 +3,23 @@
 Comprehensive tests for Vault Storage System following hackathon requirements.
 """
 
+import asyncio
+import gc
+import weakref
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 
-from hushh_mcp.vault.storage import VaultStorage, store_data, retrieve_data
+from hushh_mcp.vault.storage import VaultStorage, VaultTransaction, store_data, retrieve_data
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import UserID, AgentID
 
 class TestVaultStorage:
     """Test suite for VaultStorage"""
     
-    def setup_method(self):
-        """Setup test fixtures with temporary directory"""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup test fixtures in pytest's per-test temporary directory"""
+        self.temp_dir = str(tmp_path)
         self.vault = VaultStorage(self.temp_dir)
         self.user_id = "test_user_vault"
         self.agent_id = "test_agent"
@@ -178,14 +180,18 @@ class TestVaultStorage:
     
     def test_expired_data_handling(self):
         """Test handling of expired data"""
+        fake_time = [1_000]
+        self.vault = VaultStorage(self.temp_dir, clock=lambda: fake_time[0])
+        
         # Store data with short expiry
         self.vault.store_user_data(
             user_id=self.user_id,
             scope=ConsentScope.VAULT_READ_EMAIL,
             data=self.test_data,
             agent_id=self.agent_id,
-            expires_in_ms=1  # 1ms - will be expired immediately
+            expires_in_ms=1  # 1ms
         )
+        fake_time[0] += 10_000
         
         # Try to retrieve expired data
         retrieved = self.vault.retrieve_user_data(
@@ -197,21 +203,30 @@ class TestVaultStorage:
     
     def test_cleanup_expired_data(self):
         """Test cleanup of expired data"""
+        fake_time = [1_000]
+        self.vault = VaultStorage(self.temp_dir, clock=lambda: fake_time[0])
+        
         # Store expired data
         self.vault.store_user_data(
             user_id=self.user_id,
             scope=ConsentScope.VAULT_READ_EMAIL,
             data=self.test_data,
             agent_id=self.agent_id,
-            expires_in_ms=1  # Already expired
+            expires_in_ms=1
+        )
+        self.vault.store_user_data(
+            user_id=self.user_id,
+            scope=ConsentScope.VAULT_READ_FINANCE,
+            data=self.test_data,
+            agent_id=self.agent_id
         )
         
-        # Run cleanup
-        import time
-        time.sleep(0.01)  # Ensure expiry
+        # Run cleanup once the first record has expired
+        fake_time[0] += 10_000
         cleaned_count = self.vault.cleanup_expired_data()
         
-        assert cleaned_count >= 0  # Should clean up expired data
+        assert cleaned_count == 1  # Only the expired record is cleaned up
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_FINANCE) is not None
     
     def test_storage_stats(self):
         """Test storage statistics"""
@@ -250,16 +265,131 @@ class TestVaultStorage:
         user_dir = Path(self.temp_dir) / "users" / self.user_id
         file_path = user_dir / f"{ConsentScope.VAULT_READ_EMAIL.value}.json"
         
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
+        # Raw bytes, searched as stored without decoding
+        content = file_path.read_bytes()
+        
         # Should not contain plaintext email
-        assert self.test_data["email"] not in content
+        assert self.test_data["email"].encode() not in content
         # Should contain encryption metadata
-        assert "aes-256-gcm" in content
-        assert "ciphertext" in content
-        assert "iv" in content
-        assert "tag" in content
+        assert b"aes-256-gcm" in content
+        assert b"ciphertext" in content
+        assert b"iv" in content
+        assert b"tag" in content
+    
+    def test_store_user_data_bulk(self):
+        """Test storing several scopes in one call"""
+        finance_data = {"balance": 1200, "currency": "USD"}
+        results = self.vault.store_user_data_bulk(
+            user_id=self.user_id,
+            items=[
+                (ConsentScope.VAULT_READ_EMAIL, self.test_data),
+                (ConsentScope.VAULT_READ_FINANCE, finance_data)
+            ],
+            agent_id=self.agent_id
+        )
+        
+        assert results == {
+            ConsentScope.VAULT_READ_EMAIL.value: True,
+            ConsentScope.VAULT_READ_FINANCE.value: True
+        }
+        
+        email = self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)
+        finance = self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_FINANCE)
+        assert email["data"] == self.test_data
+        assert finance["data"] == finance_data
+    
+    def test_store_user_data_async(self):
+        """Test concurrent async stores"""
+        scopes = [ConsentScope.VAULT_READ_EMAIL, ConsentScope.VAULT_READ_FINANCE]
+        
+        async def store_all():
+            return await asyncio.gather(*[
+                self.vault.store_user_data_async(self.user_id, scope, {"scope": scope.value}, self.agent_id)
+                for scope in scopes
+            ])
+        
+        assert asyncio.run(store_all()) == [True, True]
+        for scope in scopes:
+            assert self.vault.retrieve_user_data(self.user_id, scope)["data"] == {"scope": scope.value}
+    
+    def test_large_data_is_compressed(self):
+        """Test large payloads are compressed before encryption and restored on retrieval"""
+        large_data = {"history": [{"item": "wireless headphones", "category": "electronics"}] * 200}
+        self.vault.store_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, large_data, self.agent_id)
+        
+        summaries = self.vault.list_user_data(self.user_id)
+        assert summaries[0]["metadata"]["compression"] in ("zstd", "zlib")
+        assert summaries[0]["file_size_bytes"] < 2000
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)["data"] == large_data
+        
+        # Updating with small data drops the tag
+        self.vault.update_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, self.test_data, self.agent_id)
+        assert "compression" not in self.vault.list_user_data(self.user_id)[0]["metadata"]
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)["data"] == self.test_data
+    
+    def test_transaction_commits_on_exit(self):
+        """Test writes in a transaction land together when it exits, and not at all if it raises"""
+        with VaultTransaction():
+            self.vault.store_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, self.test_data, self.agent_id)
+            self.vault.store_user_data(self.user_id, ConsentScope.VAULT_READ_FINANCE, {"balance": 1}, self.agent_id)
+            assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL) is None
+        
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)["data"] == self.test_data
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_FINANCE)["data"] == {"balance": 1}
+        
+        with pytest.raises(ValueError):
+            with VaultTransaction():
+                self.vault.delete_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, self.agent_id, hard_delete=True)
+                raise ValueError("abort")
+        
+        assert self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)["data"] == self.test_data
+    
+    def test_non_durable_store(self):
+        """Test buffered writes are readable before and after they are flushed"""
+        success = self.vault.store_user_data(
+            user_id=self.user_id,
+            scope=ConsentScope.VAULT_READ_EMAIL,
+            data=self.test_data,
+            agent_id=self.agent_id,
+            durable=False
+        )
+        assert success
+        
+        retrieved = self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)
+        assert retrieved["data"] == self.test_data
+        
+        self.vault.flush()
+        file_path = self.vault.users_dir / self.user_id / f"{ConsentScope.VAULT_READ_EMAIL.value}.json"
+        assert file_path.exists()
+        retrieved = self.vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)
+        assert retrieved["data"] == self.test_data
+    
+    def test_non_durable_store_flushed_on_collection(self):
+        """Test dropping a storage writes out its buffered records and lets it be collected"""
+        vault = VaultStorage(self.temp_dir)
+        vault.store_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, self.test_data, self.agent_id, durable=False)
+        vault_ref = weakref.ref(vault)
+        
+        del vault
+        gc.collect()
+        
+        assert vault_ref() is None
+        assert (Path(self.temp_dir) / "users" / self.user_id / f"{ConsentScope.VAULT_READ_EMAIL.value}.json").exists()
+    
+    def test_sharded_user_dirs(self):
+        """Test sharded user directories are written, read and scanned"""
+        vault = VaultStorage(self.temp_dir, shard_user_dirs=True)
+        vault.store_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL, self.test_data, self.agent_id)
+        
+        user_dir = vault._user_dir(self.user_id)
+        assert user_dir.parent.parent.parent == vault.users_dir
+        assert (user_dir / f"{ConsentScope.VAULT_READ_EMAIL.value}.json").exists()
+        
+        assert vault.retrieve_user_data(self.user_id, ConsentScope.VAULT_READ_EMAIL)["data"] == self.test_data
+        assert len(vault.list_user_data(self.user_id)) == 1
+        stats = vault.get_storage_stats()
+        assert stats["total_users"] == 1
+        assert stats["total_records"] == 1
     
     def test_convenience_functions(self):
         """Test convenience functions"""
@@ -281,9 +411,5 @@ class TestVaultStorage:
         assert retrieved is not None
         assert retrieved["data"]["email"] == self.test_data["email"]
     
-    def teardown_method(self):
-        """Cleanup after tests"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])